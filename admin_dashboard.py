@@ -22,6 +22,9 @@ logger = logging.getLogger(__name__)
 # ===== App modules =====
 from config import config
 from database import db
+from sku_catalog import sku_catalog
+from name_normalizer import display_name
+from store_registry import store_registry
 from sms_alerts import SMSAlertService
 
 # ------------------------------------------------------------------------------
@@ -174,7 +177,7 @@ def load_foodpanda_stores():
                         store_id, store_name = row[0], row[1]
                     else:
                         store_name = extract_store_name_from_url(url)
-                        store_id = db.get_or_create_store(store_name, url)
+                        store_id = store_registry.get_store_id(store_name, url)
                     stores.append({"id": store_id, "name": store_name, "url": url})
             except Exception as e:
                 logger.error(f"Error ensuring store in DB for {url}: {e}")
@@ -223,7 +226,7 @@ def load_all_stores():
                         store_id, store_name, store_platform = row[0], row[1], row[2]
                     else:
                         store_name = extract_store_name_from_url_extended(url)
-                        store_id = db.get_or_create_store(store_name, url)
+                        store_id = store_registry.get_store_id(store_name, url)
                         store_platform = platform
                     stores.append({
                         "id": store_id,
@@ -571,16 +574,10 @@ def save_va_checkin_enhanced(offline_store_ids: List[int], admin_email: str, hou
 # SKU Compliance Functions
 # ------------------------------------------------------------------------------
 def clean_product_name(name: str) -> str:
-    if not name:
-        return ""
-    cleaned = name.replace("GRAB ", "").replace("FOODPANDA ", "")
-    return cleaned
+    return display_name(name)
 
 def search_skus(platform: str, search_term: str) -> List[Dict]:
-    if search_term and len(search_term.strip()) > 0:
-        return db.search_master_skus(platform, search_term.strip())
-    else:
-        return db.get_master_skus_by_platform(platform)
+    return sku_catalog.search(platform, search_term)
 
 # ------------------------------------------------------------------------------
 # SKU Compliance Tab UI
@@ -644,7 +641,7 @@ def sku_compliance_tab():
             else:
                 st.session_state[session_key] = set()
 
-        all_skus = db.get_master_skus_by_platform(platform)
+        all_skus = sku_catalog.skus(platform)
         if not all_skus:
             st.warning(f"No products found for {platform}. Please run the SKU population script first.")
             return
@@ -794,6 +791,60 @@ def sku_compliance_tab():
                 st.error(f"❌ Error saving compliance check: {e}")
                 logger.error(f"SKU compliance save error: {e}")
 
+    sku_match_overrides_section(platform)
+
+def sku_match_overrides_section(platform: str):
+    """Review the scraped-name → SKU memo the scrapers share, and pin or clear bad matches"""
+    with st.expander("🧠 Scraped Name Matches (scraper memo)", expanded=False):
+        matches = db.get_sku_name_matches(platform)
+        if not matches:
+            st.info(f"No scraped names memoized for {platform} yet - they appear after the first SKU run.")
+            return
+
+        sku_names = {s['sku_code']: s['product_name'] for s in sku_catalog.skus(platform)}
+        pinned_count = sum(1 for m in matches if m['pinned'])
+        st.caption(f"{len(matches)} scraped names • {pinned_count} pinned by admins. "
+                   "Pinned matches always win; clearing a match makes the next run score it again.")
+
+        table = pd.DataFrame([{
+            'Scraped name': m['normalized_name'],
+            'SKU': m['sku_code'] or '—',
+            'Product': sku_names.get(m['sku_code'], '') if m['sku_code'] else 'No match',
+            'Method': m['method'],
+            'Score': round(float(m['confidence'] or 0), 2),
+            'Pinned by': m['pinned_by'] or '',
+        } for m in matches])
+        st.dataframe(table, use_container_width=True, hide_index=True)
+
+        selected_name = st.selectbox(
+            "Scraped name to correct:",
+            options=[m['normalized_name'] for m in matches],
+            key=f"sku_match_name_{platform}",
+        )
+        current = next(m for m in matches if m['normalized_name'] == selected_name)
+        sku_options = [None] + sorted(sku_names)
+        selected_sku = st.selectbox(
+            "Always map it to:",
+            options=sku_options,
+            index=sku_options.index(current['sku_code']) if current['sku_code'] in sku_names else 0,
+            format_func=lambda code: "🚫 Not a catalog product" if code is None else f"{code} - {sku_names[code]}",
+            key=f"sku_match_target_{platform}",
+        )
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("📌 Pin Match", key=f"sku_match_pin_{platform}", use_container_width=True):
+                if db.pin_sku_name_match(platform, selected_name, selected_sku, st.session_state.admin_email):
+                    st.success(f"📌 '{selected_name}' now maps to {selected_sku or 'no product'}")
+                else:
+                    st.error("❌ Failed to pin match. Please try again.")
+        with col2:
+            if st.button("🗑️ Clear Match", key=f"sku_match_clear_{platform}", use_container_width=True):
+                if db.delete_sku_name_match(platform, selected_name):
+                    st.success(f"🗑️ '{selected_name}' will be matched again on the next run")
+                else:
+                    st.error("❌ Failed to clear match. Please try again.")
+
 # ------------------------------------------------------------------------------
 # Manual Ratings Tab
 # ------------------------------------------------------------------------------
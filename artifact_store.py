@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+CocoPan Artifact Store - compressed, deduplicated page snapshots for debugging
+- Replaces the debug_<store>.html / debug_snapshots/* dumps in wow, ratings and rating_scraper
+- Content-addressed: blobs live at ARTIFACT_DIR/blobs/<sha[:2]>/<sha256>.<codec>, so
+  the same page body seen by a hundred probes is stored once
+- gzip by default, zstd when ARTIFACT_CODEC=zstd and `zstandard` is installed
+- save() only queues; hashing, compression and disk I/O run on a background thread,
+  so a scrape never waits on the disk (a full queue drops the snapshot, not the scrape)
+- Indexed by (store_id, run_id, outcome) in ARTIFACT_DIR/index.db (SQLite):
+  find(outcome='offline') → rows; load(sha256) → the exact page text
+- Sampling: routine outcomes (success / online, and SKU pages with a few sold-out
+  items - 'unavailable', the normal daily state) are kept at ARTIFACT_SAMPLE_RATE,
+  everything else (offline, blocked, norating, ...) always
+- Retention: index rows older than ARTIFACT_RETENTION_DAYS are pruned with their
+  unreferenced blobs, at startup and then at most hourly
+"""
+import os
+import gzip
+import json
+import time
+import uuid
+import queue
+import random
+import hashlib
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from config import config
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+logger = logging.getLogger(__name__)
+
+ROUTINE_OUTCOMES = ('success', 'online', 'ok', 'unavailable')
+PRUNE_INTERVAL = 3600  # seconds
+
+
+def _is_routine(outcome: str) -> bool:
+    return outcome.lower().rsplit('_', 1)[-1] in ROUTINE_OUTCOMES
+
+
+class ArtifactStore:
+    """Background writer + SQLite index for page snapshots"""
+
+    def __init__(self, root: Optional[str] = None, codec: Optional[str] = None,
+                 sample_rate: Optional[float] = None, retention_days: Optional[float] = None,
+                 max_queue: int = 200):
+        self.root = root or config.ARTIFACT_DIR
+        codec = (codec or config.ARTIFACT_CODEC).lower()
+        if codec == 'zstd' and not HAS_ZSTD:
+            logger.warning("⚠️ ARTIFACT_CODEC=zstd but zstandard is not installed - using gzip")
+            codec = 'gzip'
+        self.codec = codec
+        self.sample_rate = config.ARTIFACT_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.retention_days = config.ARTIFACT_RETENTION_DAYS if retention_days is None else retention_days
+        self.enabled = config.ARTIFACTS_ENABLED
+        self.run_id = uuid.uuid4().hex  # default run for callers without their own
+
+        self.saved = 0
+        self.deduped = 0
+        self.dropped = 0
+
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._last_prune = 0.0
+
+    # ---------- producer side ----------
+
+    def wants(self, outcome: str) -> bool:
+        """Sampling decision on its own, for callers that must pay to fetch the body"""
+        return self.enabled and (not _is_routine(outcome) or random.random() < self.sample_rate)
+
+    def save(self, job: str, url: str, body: Optional[str], outcome: str,
+             store_id: Optional[int] = None, run_id: Optional[Any] = None,
+             meta: Optional[Dict[str, Any]] = None, sampled: bool = False) -> bool:
+        """
+        Queue a page snapshot. Returns False when it was sampled out, disabled or dropped.
+        outcome is free-form ('offline', 'blocked', 'grab_norating', ...); routine ones are
+        sampled unless sampled=True says wants() already made that call.
+        """
+        if not body or not (self.enabled if sampled else self.wants(outcome)):
+            return False
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait({
+                'job': job, 'url': url, 'body': body, 'outcome': outcome.lower(),
+                'store_id': store_id, 'run_id': str(run_id or self.run_id),
+                'meta': meta, 'created_at': datetime.now().isoformat(timespec='seconds'),
+            })
+            return True
+        except queue.Full:
+            self.dropped += 1
+            logger.debug(f"Artifact queue full - dropped {job} snapshot for {url}")
+            return False
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+                self._thread.start()
+
+    def flush(self, timeout: float = 30.0):
+        """Wait until everything queued so far is on disk"""
+        thread = self._thread
+        deadline = time.monotonic() + timeout
+        while (thread is not None and thread.is_alive() and self._queue.unfinished_tasks
+               and time.monotonic() < deadline):
+            time.sleep(0.05)
+
+    def close(self):
+        """Drain the queue and stop the writer thread"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=30)
+        self._thread = None
+
+    # ---------- writer thread ----------
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(self.root, exist_ok=True)
+        conn = sqlite3.connect(os.path.join(self.root, 'index.db'))
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS artifacts (
+                id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at  TEXT NOT NULL,
+                job         TEXT NOT NULL,
+                store_id    INTEGER,
+                url         TEXT NOT NULL,
+                run_id      TEXT NOT NULL,
+                outcome     TEXT NOT NULL,
+                sha256      TEXT NOT NULL,
+                codec       TEXT NOT NULL,
+                raw_bytes   INTEGER NOT NULL,
+                meta        TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_lookup ON artifacts (store_id, run_id, outcome)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_created ON artifacts (created_at)")
+        conn.commit()
+        return conn
+
+    def _blob_path(self, sha: str, codec: str) -> str:
+        ext = 'zst' if codec == 'zstd' else 'gz'
+        return os.path.join(self.root, 'blobs', sha[:2], f"{sha}.{ext}")
+
+    def _compress(self, raw: bytes) -> bytes:
+        if self.codec == 'zstd':
+            return zstandard.ZstdCompressor(level=10).compress(raw)
+        return gzip.compress(raw, compresslevel=6)
+
+    def _write(self, conn: sqlite3.Connection, item: Dict[str, Any]):
+        raw = item['body'].encode('utf-8', errors='replace')
+        sha = hashlib.sha256(raw).hexdigest()
+
+        # Reuse an existing blob whichever codec wrote it
+        codec = next((c for c in (self.codec, 'gzip', 'zstd') if os.path.exists(self._blob_path(sha, c))), None)
+        if codec is not None:
+            self.deduped += 1
+        else:
+            codec = self.codec
+            path = self._blob_path(sha, codec)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(self._compress(raw))
+            os.replace(tmp, path)
+
+        conn.execute("""
+            INSERT INTO artifacts (created_at, job, store_id, url, run_id, outcome, sha256, codec, raw_bytes, meta)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (item['created_at'], item['job'], item['store_id'], item['url'], item['run_id'],
+              item['outcome'], sha, codec, len(raw), json.dumps(item['meta'], default=str) if item['meta'] else None))
+        conn.commit()
+        self.saved += 1
+
+    def _run(self):
+        try:
+            conn = self._connect()
+        except Exception as e:
+            logger.error(f"❌ Artifact store unavailable at {self.root}: {e}")
+            self.enabled = False
+            self._drain()
+            return
+
+        self._prune(conn)
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    break
+                self._write(conn, item)
+                if time.monotonic() - self._last_prune > PRUNE_INTERVAL:
+                    self._prune(conn)
+            except Exception as e:
+                logger.debug(f"Artifact write failed for {item and item.get('url')}: {e}")
+            finally:
+                self._queue.task_done()
+        conn.close()
+
+    def _drain(self):
+        while True:
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+            except queue.Empty:
+                return
+
+    def _prune(self, conn: sqlite3.Connection):
+        """Drop index rows past retention, then blobs nothing references any more"""
+        self._last_prune = time.monotonic()
+        if not self.retention_days:
+            return
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).isoformat(timespec='seconds')
+        expired = conn.execute("SELECT DISTINCT sha256, codec FROM artifacts WHERE created_at < ?", (cutoff,)).fetchall()
+        if not expired:
+            return
+        conn.execute("DELETE FROM artifacts WHERE created_at < ?", (cutoff,))
+        conn.commit()
+
+        removed = 0
+        for sha, codec in expired:
+            if conn.execute("SELECT 1 FROM artifacts WHERE sha256 = ? LIMIT 1", (sha,)).fetchone():
+                continue
+            try:
+                os.unlink(self._blob_path(sha, codec))
+                removed += 1
+            except OSError:
+                pass
+        logger.info(f"🧹 Artifact retention: removed {removed} blobs older than {self.retention_days:g} days")
+
+    # ---------- reading ----------
+
+    def find(self, store_id: Optional[int] = None, run_id: Optional[Any] = None,
+             outcome: Optional[str] = None, url: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Newest-first index rows matching every given filter"""
+        clauses, params = [], []
+        for column, value in (('store_id', store_id), ('run_id', run_id and str(run_id)),
+                              ('outcome', outcome and outcome.lower()), ('url', url)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        path = os.path.join(self.root, 'index.db')
+        if not os.path.exists(path):
+            return []
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        try:
+            rows = conn.execute(f"SELECT * FROM artifacts {where} ORDER BY id DESC LIMIT ?", params + [limit]).fetchall()
+        finally:
+            conn.close()
+        return [dict(r) for r in rows]
+
+    def load(self, sha256: str, codec: Optional[str] = None) -> Optional[str]:
+        """Page text for a blob hash (codec from the index row, or whichever file exists)"""
+        for c in ([codec] if codec else ['gzip', 'zstd']):
+            path = self._blob_path(sha256, c)
+            if not os.path.exists(path):
+                continue
+            with open(path, 'rb') as f:
+                data = f.read()
+            if c == 'zstd':
+                if not HAS_ZSTD:
+                    raise RuntimeError("zstandard is required to read .zst artifacts")
+                raw = zstandard.ZstdDecompressor().decompress(data)
+            else:
+                raw = gzip.decompress(data)
+            return raw.decode('utf-8', errors='replace')
+        return None
+
+    def summary(self) -> Dict[str, int]:
+        return {'saved': self.saved, 'deduped': self.deduped, 'dropped': self.dropped}
+
+    def log_summary(self):
+        s = self.summary()
+        if s['saved'] or s['dropped']:
+            logger.info(f"   🗃️ Artifacts: {s['saved']} snapshots saved ({s['deduped']} deduplicated, "
+                        f"{s['dropped']} dropped) in {self.root}")
+
+
+# Global artifact store instance
+artifact_store = ArtifactStore()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+CocoPan Async Probe Runner - bounded-concurrency HTTP fan-out
+- One shared aiohttp.ClientSession (keep-alive connection reuse)
+- Per-host token-bucket throttling (polite to food.grab.com / portal.grab.com / foodpanda.ph)
+- Per-request deadlines (a slow host never stalls the batch); time spent queued
+  for a host token does not count against them
+- Semaphore-bounded fan-out instead of a thread per request
+- Blocking callers use run_probes(); async callers use AsyncProbeRunner.fetch_all()
+"""
+import ssl
+import json
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import urlparse
+
+import aiohttp
+
+from config import config
+
+# uvloop (optional, Linux only)
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProbeRequest:
+    """One logical probe; fallback_urls are tried in order until one returns HTTP 200"""
+    url: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    fallback_urls: Sequence[str] = ()
+    timeout: Optional[float] = None
+    key: Any = None  # caller's own identifier (store URL, merchant ID, ...)
+
+
+@dataclass
+class ProbeResponse:
+    """Result of a probe; status is None when no HTTP response was received"""
+    request: ProbeRequest
+    url: str
+    status: Optional[int] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    text: str = ""
+    elapsed_ms: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200
+
+    def json(self) -> Optional[Any]:
+        """Parsed JSON body, or None when the body is not JSON"""
+        try:
+            return json.loads(self.text) if self.text else None
+        except (ValueError, TypeError):
+            return None
+
+
+class TokenBucket:
+    """Async token bucket: `rate` requests/second with bursts of up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = max(0.01, float(rate))
+        self.capacity = max(1.0, float(capacity))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+
+class AsyncProbeRunner:
+    """Fan out HTTP probes with bounded concurrency and per-host rate limits"""
+
+    def __init__(self,
+                 concurrency: Optional[int] = None,
+                 per_host_rate: Optional[float] = None,
+                 per_host_burst: Optional[float] = None,
+                 timeout: Optional[float] = None,
+                 headers: Optional[Dict[str, str]] = None):
+        self.concurrency = max(1, int(concurrency or config.ASYNC_PROBE_CONCURRENCY))
+        self.per_host_rate = float(per_host_rate or config.HOST_RATE_PER_SEC)
+        self.per_host_burst = float(per_host_burst or config.HOST_BURST)
+        self.timeout = float(timeout or config.REQUEST_TIMEOUT)
+        self.headers = dict(headers or {'User-Agent': config.USER_AGENT})
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc or url
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(self.per_host_rate, self.per_host_burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    async def _get(self, session: aiohttp.ClientSession, url: str, headers: Dict[str, str],
+                   timeout: float) -> ProbeResponse:
+        """Single GET; retries once without certificate verification on SSL errors"""
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        for verify in (True, False):
+            try:
+                async with session.get(url, headers=headers, timeout=client_timeout,
+                                       ssl=None if verify else False, allow_redirects=True) as resp:
+                    text = await resp.text(errors='replace')
+                    return ProbeResponse(request=None, url=str(resp.url), status=resp.status,
+                                         headers=dict(resp.headers), text=text)
+            except (aiohttp.ClientSSLError, ssl.SSLError) as e:
+                if not verify:
+                    return ProbeResponse(request=None, url=url, error=f"SSL error: {e}")
+                logger.debug(f"SSL error for {url}, retrying without verification")
+            except asyncio.TimeoutError:
+                return ProbeResponse(request=None, url=url, error=f"Timeout after {timeout:.0f}s")
+            except aiohttp.ClientError as e:
+                return ProbeResponse(request=None, url=url, error=f"{type(e).__name__}: {e}")
+        return ProbeResponse(request=None, url=url, error="Request failed")
+
+    async def fetch(self, session: aiohttp.ClientSession, request: ProbeRequest) -> ProbeResponse:
+        """
+        Run one probe (primary URL, then fallbacks) under a hard deadline.
+        The deadline only counts time on the wire: each URL waits for its host
+        token first, so a throttled batch never times out requests it has not sent.
+        """
+        timeout = request.timeout or self.timeout
+        headers = {**self.headers, **(request.headers or {})}
+        urls = [request.url, *request.fallback_urls]
+        deadline = timeout * len(urls)
+        budget = deadline
+        start = time.monotonic()
+
+        response = None
+        for url in urls:
+            await self._bucket(url).acquire()
+            sent = time.monotonic()
+            try:
+                response = await asyncio.wait_for(self._get(session, url, headers, timeout), timeout=budget)
+            except asyncio.TimeoutError:
+                response = ProbeResponse(request=None, url=request.url,
+                                         error=f"Deadline exceeded ({deadline:.0f}s)")
+                break
+            budget -= time.monotonic() - sent
+            if response.ok or budget <= 0:
+                break
+        response.request = request
+        response.elapsed_ms = int((time.monotonic() - start) * 1000)
+        return response
+
+    async def fetch_all(self, requests: Sequence[ProbeRequest]) -> List[ProbeResponse]:
+        """Probe everything concurrently; results are returned in request order"""
+        # Buckets hold asyncio locks, which are bound to the running loop
+        self._buckets = {}
+        semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+
+        async with aiohttp.ClientSession(connector=connector) as session:
+            async def bounded(request: ProbeRequest) -> ProbeResponse:
+                async with semaphore:
+                    return await self.fetch(session, request)
+
+            return await asyncio.gather(*(bounded(r) for r in requests))
+
+    def run(self, requests: Sequence[ProbeRequest]) -> List[ProbeResponse]:
+        """Blocking entry point for synchronous callers"""
+        if not requests:
+            return []
+        loop = uvloop.new_event_loop() if HAS_UVLOOP else asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.fetch_all(requests))
+        finally:
+            loop.close()
+
+
+def run_probes(requests: Sequence[ProbeRequest], **runner_kwargs) -> List[ProbeResponse]:
+    """Convenience wrapper: build a runner and execute a batch of probes"""
+    return AsyncProbeRunner(**runner_kwargs).run(requests)
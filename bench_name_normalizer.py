@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Name Normalization Benchmark
+- Compares the old per-call re.sub helpers (SKUMapper._normalize_name and
+  wow._clean_product_name) with name_normalizer.sku_key / clean_scraped_name
+- Names come from all_skus_export.json and master_skus_dump_*.csv, plus the noisy
+  variants scrapers see (promo tails, platform prefixes, prices, descriptions)
+- Reports cold (no cache) and warm (memoized) cost per name and checks that every
+  result is identical to the old helper
+- Usage: python bench_name_normalizer.py [all_skus_export.json] [master_skus_dump_*.csv ...]
+"""
+import re
+import csv
+import sys
+import glob
+import json
+import time
+import random
+import statistics
+from typing import Callable, List
+
+import name_normalizer
+from name_normalizer import clean_scraped_name, sku_key
+
+ROUNDS = 7
+REPEATS = 30  # how often each name recurs in a day's worth of menus
+
+
+def legacy_normalize_name(name: str) -> str:
+    """SKUMapper._normalize_name before name_normalizer"""
+    if not name:
+        return ""
+    name = name.upper()
+    name = name.replace('Ñ', 'N').replace('ñ', 'N')
+    name = name.replace('É', 'E').replace('é', 'E')
+    name = re.sub(r'^(GRAB\s+|FOODPANDA\s+|FOOD PANDA\s+)', '', name)
+    promo_patterns = [
+        r'\s*FREE\s+MANGO\s+SUNRISE.*$',
+        r'\s*\+\s*\d+\s*PHP.*$',
+        r'\s*\(FREE\s+MANGO\s+SUNRISE\).*$',
+        r'\s*\(\+\s*\d+\s*PHP.*\).*$',
+        r'\s*WITH\s+FREE.*$',
+        r'\s*FREE.*$',
+    ]
+    for pattern in promo_patterns:
+        name = re.sub(pattern, '', name, flags=re.IGNORECASE)
+    name = re.sub(r'\s*\(([^)]+)\)\s*', r' \1 ', name)
+    name = re.sub(r'\s*\[([^\]]+)\]\s*', r' \1 ', name)
+    name = re.sub(r'\s*-\s*', ' ', name)
+    name = re.sub(r'\s+', ' ', name).strip()
+    return name
+
+
+def legacy_clean_product_name(name: str) -> str:
+    """wow._clean_product_name before name_normalizer"""
+    if not name:
+        return name
+    name = re.sub(r'\s*P?\s*\d+[\d,.]*\s*$', '', name)
+    if '.' in name:
+        parts = name.split('.')
+        name = parts[0].strip()
+    match = re.match(r'^([^.]+?[a-z])([A-Z][a-z].{10,})$', name)
+    if match:
+        name = match.group(1).strip()
+    desc_markers = [
+        'A soft', 'A golden', 'A delicious', 'A crispy', 'A fluffy',
+        'Made with', 'Served with', 'Topped with', 'Filled with',
+        'Perfect for', 'Great for', 'Ideal for'
+    ]
+    for marker in desc_markers:
+        if marker in name:
+            name = name.split(marker)[0].strip()
+    return name.strip()
+
+
+def load_names(paths: List[str]) -> List[str]:
+    names = []
+    for path in paths:
+        if path.endswith('.json'):
+            with open(path, encoding='utf-8') as f:
+                names += [s['product_name'] for skus in json.load(f).values() for s in skus]
+        else:
+            with open(path, encoding='utf-8', newline='') as f:
+                names += [row['product_name'] for row in csv.DictReader(f)]
+    return names
+
+
+def variants(name: str, rng: random.Random) -> List[str]:
+    title = name.title()
+    return [
+        name, title, f"GRAB {name}", f"FOODPANDA {title}", f"{name} FREE MANGO SUNRISE",
+        f"{name} WITH FREE MANGO SUNRISE", f"{name} (+20 PHP)", f"{name} + 15 PHP", f"{title} - Regular",
+        f"{title} [Best Seller]", f"{title}P{rng.randint(45, 420)}.00",
+        f"{title}A soft, buttery bun filled with cream", f"{title}. Baked fresh every morning",
+        f"{title}Perfect for sharing with the family",
+    ]
+
+
+def measure(fn: Callable[[str], str], names: List[str]) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for n in names:
+            fn(n)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    paths = sys.argv[1:] or ['all_skus_export.json'] + sorted(glob.glob('master_skus_dump_*.csv'))
+    rng = random.Random(7)
+    distinct = sorted({v for n in load_names(paths) for v in variants(n, rng)})
+    stream = distinct * REPEATS
+    rng.shuffle(stream)
+
+    mismatches = [(n, legacy_normalize_name(n), sku_key(n)) for n in distinct
+                  if legacy_normalize_name(n) != sku_key(n)]
+    mismatches += [(n, legacy_clean_product_name(n), clean_scraped_name(n)) for n in distinct
+                   if legacy_clean_product_name(n) != clean_scraped_name(n)]
+
+    rows = []
+    for label, legacy, new in (('sku_key', legacy_normalize_name, sku_key),
+                               ('clean_scraped_name', legacy_clean_product_name, clean_scraped_name)):
+        before = measure(legacy, stream)
+        cold = measure(new.__wrapped__, stream)  # precompiled patterns, cache bypassed
+        new.cache_clear()
+        warm = measure(new, stream)
+        rows.append((label, before, cold, warm))
+
+    total = len(stream)
+    print("=" * 78)
+    print(f"🔤 NAME NORMALIZATION BENCHMARK ({len(distinct)} distinct names from {len(paths)} files, "
+          f"{total} calls, median of {ROUNDS})")
+    print("=" * 78)
+    print(f"{'':<20}{'legacy':>12}{'compiled':>12}{'memoized':>12}{'speedup':>10}")
+    for label, before, cold, warm in rows:
+        print(f"{label:<20}{before / total * 1e6:>10.2f}µs{cold / total * 1e6:>10.2f}µs"
+              f"{warm / total * 1e6:>10.2f}µs{before / warm if warm else float('inf'):>9.1f}x")
+    stats = name_normalizer.cache_stats()
+    print("cache: " + ", ".join(f"{k} {v['hits']} hits / {v['misses']} misses" for k, v in stats.items()))
+    print(f"{len(mismatches)} names differ from the legacy helpers")
+    for name, old, new in mismatches[:10]:
+        print(f"   ⚠️ {name!r}: legacy {old!r} vs {new!r}")
+    print("=" * 78)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
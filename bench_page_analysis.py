@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Page Analysis Benchmark
+- Compares the old two-BeautifulSoup-tree probe parse with page_analysis.analyze_html
+- Reports parse time and peak Python-heap memory (tracemalloc) per page;
+  lxml's C-level tree is outside tracemalloc, so "after" memory is a lower bound
+- Usage: python bench_page_analysis.py [page.html ...]   (defaults to debug_*.html)
+"""
+import gc
+import sys
+import glob
+import time
+import statistics
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from bs4 import BeautifulSoup
+
+from page_analysis import analyze_html
+
+ROUNDS = 20
+
+
+def legacy_parse(html: str):
+    """What check_grabfood_store did before: two html.parser trees, one decomposed for text"""
+    soup = BeautifulSoup(html, 'html.parser')
+    soup_copy = BeautifulSoup(html, 'html.parser')
+    for tag in soup_copy(["script", "style", "meta", "link"]):
+        tag.decompose()
+    visible_text = soup_copy.get_text(separator='\n', strip=True)
+    return soup, visible_text[:1000]
+
+
+def single_pass_parse(html: str):
+    return analyze_html(html)
+
+
+def measure(fn: Callable[[str], object], html: str, rounds: int) -> Tuple[float, float]:
+    """Returns (median ms, peak MiB)"""
+    timings: List[float] = []
+    for _ in range(rounds):
+        gc.collect()
+        start = time.perf_counter()
+        fn(html)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    gc.collect()
+    tracemalloc.start()
+    fn(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak / (1024 * 1024)
+
+
+def main():
+    paths = sys.argv[1:] or sorted(glob.glob('debug_*.html'))
+    if not paths:
+        print("❌ No pages to benchmark (pass paths or keep debug_*.html in the working dir)")
+        return 1
+
+    print("=" * 78)
+    print(f"📄 PAGE ANALYSIS BENCHMARK ({ROUNDS} rounds, median time / peak memory)")
+    print("=" * 78)
+    print(f"{'page':<28}{'size':>9}  {'before':>18}  {'after':>18}  {'speedup':>7}")
+
+    for path in paths:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            html = f.read()
+
+        before_ms, before_mb = measure(legacy_parse, html, ROUNDS)
+        after_ms, after_mb = measure(single_pass_parse, html, ROUNDS)
+        speedup = before_ms / after_ms if after_ms else float('inf')
+
+        print(f"{path[-28:]:<28}{len(html) / 1024:>7.0f}KB  "
+              f"{before_ms:>7.1f}ms {before_mb:>6.1f}MiB  "
+              f"{after_ms:>7.1f}ms {after_mb:>6.1f}MiB  {speedup:>6.1f}x")
+
+    print("=" * 78)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+SKU Matching Benchmark
+- Compares the per-name SKUMapper.find_sku_for_name loop with the batch SKUMapper.map_names
+  (one rapidfuzz cdist matrix per menu) on the real catalog from all_skus_export.json
+- Query menus are catalog names with the noise scrapers actually see: promo suffixes,
+  platform prefixes, parentheses, dropped words, typos, plus items that are not in the catalog
+- Also checks that both paths return the same SKU for every name, and times a warm
+  match memo (in-process LRU only; nothing is written to sku_name_matches)
+- Usage: python bench_sku_matching.py [all_skus_export.json] [--platform grabfood] [--menu 120]
+"""
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+from typing import Dict, List
+
+from monitor_service import HAS_FUZZY, HAS_RAPIDFUZZ, SKUMapper
+
+ROUNDS = 5
+STORES = 20  # menus per round, roughly one SKU run's worth of distinct pages
+
+
+def offline_mapper(skus: List[Dict], platform: str, memo_size: int = 0) -> SKUMapper:
+    """SKUMapper over an exported catalog, without touching the database (memo off by default)"""
+    mapper = SKUMapper.__new__(SKUMapper)
+    mapper.platform = platform
+    mapper.master_skus = skus
+    mapper.name_to_sku_map = mapper._build_name_mapping()
+    mapper.all_sku_codes = set(s['sku_code'] for s in skus)
+    mapper._prepare_catalog()
+    mapper._init_match_memo(size=memo_size, persist=False)
+    return mapper
+
+
+def noisy(name: str, rng: random.Random) -> str:
+    roll = rng.random()
+    if roll < 0.25:
+        return name
+    if roll < 0.40:
+        return f"{name} FREE MANGO SUNRISE"
+    if roll < 0.50:
+        return f"GRAB {name.title()}"
+    if roll < 0.60:
+        words = name.split()
+        return " ".join(words[:-1]) if len(words) > 2 else name.lower()
+    if roll < 0.75 and len(name) > 6:
+        i = rng.randrange(1, len(name) - 1)
+        return name[:i] + name[i + 1:]
+    if roll < 0.85:
+        words = name.split()
+        return f"{words[0]} ({' '.join(words[1:])})" if len(words) > 1 else name
+    return rng.choice(["Iced Americano Venti", "Chicken Adobo Rice Bowl", "Spicy Tuna Pandesal",
+                       "Ube Halaya Jar", "Bottled Water 500ml", "Mystery Box Bundle"])
+
+
+def menus(skus: List[Dict], size: int, rng: random.Random) -> List[List[str]]:
+    names = [s['product_name'] for s in skus]
+    return [[noisy(rng.choice(names), rng) for _ in range(size)] for _ in range(STORES)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('export', nargs='?', default='all_skus_export.json')
+    parser.add_argument('--platform', default='grabfood')
+    parser.add_argument('--menu', type=int, default=120, help='scraped items per store')
+    args = parser.parse_args()
+
+    with open(args.export, encoding='utf-8') as f:
+        skus = json.load(f)[args.platform]
+    mapper = offline_mapper(skus, args.platform)
+    rng = random.Random(42)
+    batches = menus(skus, args.menu, rng)
+    total = sum(len(m) for m in batches)
+
+    per_name, batch = [], []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        before = [[mapper.find_sku_for_name(n) for n in menu] for menu in batches]
+        per_name.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        after = [[m.sku_code if m else None for m in mapper.map_names(menu)] for menu in batches]
+        batch.append(time.perf_counter() - start)
+
+    memo_mapper = offline_mapper(skus, args.platform, memo_size=4096)
+    warm = [memo_mapper.map_names(menu) for menu in batches]  # first day: everything is scored
+    memoized = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for menu in batches:
+            memo_mapper.map_names(menu)
+        memoized.append(time.perf_counter() - start)
+    memo_mismatches = sum(1 for wm, am in zip(warm, after) for w, a in zip(wm, am) if (w and w.sku_code) != a)
+
+    mismatches = [(n, b, a) for menu, bm, am in zip(batches, before, after)
+                  for n, b, a in zip(menu, bm, am) if b != a]
+    matched = sum(1 for menu in after for code in menu if code)
+
+    print("=" * 78)
+    print(f"🔎 SKU MATCHING BENCHMARK ({args.platform}, {len(mapper.name_to_sku_map)} catalog names, "
+          f"{STORES} menus x {args.menu} items, median of {ROUNDS})")
+    print(f"   fuzzywuzzy: {'yes' if HAS_FUZZY else 'no'}   rapidfuzz: {'yes' if HAS_RAPIDFUZZ else 'no'}")
+    print("=" * 78)
+    before_s, after_s = statistics.median(per_name), statistics.median(batch)
+    print(f"{'per-name find_sku_for_name':<32}{before_s * 1000:>9.1f}ms  {before_s / total * 1e6:>8.1f}µs/name")
+    print(f"{'batch map_names':<32}{after_s * 1000:>9.1f}ms  {after_s / total * 1e6:>8.1f}µs/name")
+    print(f"{'speedup':<32}{before_s / after_s if after_s else float('inf'):>9.1f}x")
+    memo_s = statistics.median(memoized)
+    print(f"{'warm memo map_names':<32}{memo_s * 1000:>9.1f}ms  {memo_s / total * 1e6:>8.1f}µs/name  "
+          f"({memo_mapper.memo_hits}/{memo_mapper.memo_hits + memo_mapper.memo_misses} memo hits)")
+    print(f"matched {matched}/{total} names; {len(mismatches)} differ from the per-name path")
+    for name, b, a in mismatches[:10]:
+        print(f"   ⚠️ '{name}': per-name {b} vs batch {a}")
+    if memo_mismatches:
+        print(f"   ⚠️ {memo_mismatches} memoized results differ from the batch path")
+    print("=" * 78)
+    return 1 if mismatches or memo_mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+CocoPan Browser Profiles - opt-in persistent --user-data-dir per worker slot
+- Enabled per job via PERSISTENT_PROFILE_JOBS (monitor, sku, ratings); off by default
+- Slots live under BROWSER_PROFILE_DIR/<job>-<n>; GrabFood's JS/CSS bundles stay in
+  the slot's disk cache across probes, driver recycles and service restarts
+- Sharing rules: Chrome cannot share a user-data-dir, so a slot has exactly one
+  live owner. In-process, a slot is busy while its owning chromedriver runs;
+  across processes (and across restarts that leave Chrome behind), the slot's
+  .owner file holds the owning Chrome's PID and keeps others out while it lives.
+  When every slot is busy the driver starts with a throwaway profile instead.
+- Size caps: --disk-cache-size=BROWSER_CACHE_MB, and caches are wiped when the
+  slot grows past BROWSER_PROFILE_MAX_MB
+- Corruption: unreadable Preferences / Local State, or a failed launch, wipes the slot
+"""
+import os
+import json
+import shutil
+import logging
+import threading
+from typing import Dict, Optional
+
+from config import config
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+logger = logging.getLogger(__name__)
+
+OWNER_FILE = '.owner'
+SINGLETON_FILES = ('SingletonLock', 'SingletonSocket', 'SingletonCookie')
+CACHE_DIRS = ('Default/Cache', 'Default/Code Cache', 'Default/GPUCache',
+              'Default/Service Worker/CacheStorage', 'GrShaderCache', 'ShaderCache')
+JSON_FILES = ('Local State', 'Default/Preferences')
+
+
+def _dir_size_mb(path: str) -> float:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total / (1024 * 1024)
+
+
+def _pid_alive(pid: int) -> bool:
+    if HAS_PSUTIL:
+        return psutil.pid_exists(pid)
+    try:
+        os.kill(pid, 0)
+        return True
+    except OSError:
+        return False
+
+
+def _driver_alive(driver) -> bool:
+    process = getattr(getattr(driver, 'service', None), 'process', None)
+    if process is not None:
+        return process.poll() is None
+    browser_pid = getattr(driver, 'browser_pid', None)
+    return bool(browser_pid) and _pid_alive(browser_pid)
+
+
+def _owner_pid(driver, path: str) -> int:
+    """PID of the Chrome running on `path`, else its chromedriver's; 0 when unknown"""
+    process = getattr(getattr(driver, 'service', None), 'process', None)
+    if HAS_PSUTIL and process is not None:
+        try:
+            for child in psutil.Process(process.pid).children():
+                if f'--user-data-dir={path}' in child.cmdline():
+                    return child.pid
+        except psutil.Error:
+            pass
+    return getattr(process, 'pid', None) or getattr(driver, 'browser_pid', None) or 0
+
+
+def _write_owner(path: str, pid: int):
+    with open(os.path.join(path, OWNER_FILE), 'w') as f:
+        f.write(str(pid))
+
+
+class ProfileStore:
+    """Hands out persistent profile slots for one job"""
+
+    def __init__(self, job: str, root: Optional[str] = None, slots: Optional[int] = None):
+        self.job = job
+        self.root = root or config.BROWSER_PROFILE_DIR
+        self.slots = config.BROWSER_PROFILE_SLOTS if slots is None else slots
+        self.enabled = job in config.PERSISTENT_PROFILE_JOBS
+        self._owners: Dict[str, object] = {}   # slot path -> driver (None while launching)
+        self._lock = threading.Lock()
+
+    # ---------- slot selection ----------
+
+    def _busy(self, path: str) -> bool:
+        if path in self._owners:
+            owner = self._owners[path]
+            if owner is None or _driver_alive(owner):
+                return True
+            del self._owners[path]  # chromedriver exited (quit, recycled or killed)
+
+        try:
+            with open(os.path.join(path, OWNER_FILE)) as f:
+                pid = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return False
+        if pid == os.getpid():
+            return False  # our own launch placeholder, and that launch is no longer tracked
+        return pid > 0 and _pid_alive(pid)
+
+    def _claim(self) -> Optional[str]:
+        with self._lock:
+            for n in range(1, self.slots + 1):
+                path = os.path.abspath(os.path.join(self.root, f"{self.job}-{n}"))
+                if self._busy(path):
+                    continue
+                self._owners[path] = None
+                return path
+        return None
+
+    # ---------- health ----------
+
+    def _wipe(self, path: str, reason: str):
+        logger.warning(f"🧹 Resetting browser profile {os.path.basename(path)}: {reason}")
+        shutil.rmtree(path, ignore_errors=True)
+
+    def _check(self, path: str):
+        """Make a claimed slot launchable: drop stale locks, wipe corrupt or oversized state"""
+        os.makedirs(path, exist_ok=True)
+
+        for name in JSON_FILES:
+            file = os.path.join(path, name)
+            if not os.path.exists(file):
+                continue
+            try:
+                with open(file, encoding='utf-8') as f:
+                    json.load(f)
+            except (OSError, ValueError):
+                self._wipe(path, f"unreadable {name}")
+                os.makedirs(path, exist_ok=True)
+                break
+
+        # Left behind when the watchdog kills Chrome; we own the slot, so they are stale
+        for name in SINGLETON_FILES:
+            try:
+                os.unlink(os.path.join(path, name))
+            except OSError:
+                pass
+
+        size = _dir_size_mb(path)
+        if size > config.BROWSER_PROFILE_MAX_MB:
+            logger.info(f"🧹 Profile {os.path.basename(path)} at {size:.0f} MB - clearing caches")
+            for sub in CACHE_DIRS:
+                shutil.rmtree(os.path.join(path, sub), ignore_errors=True)
+
+        # Placeholder while Chrome launches; bind() swaps in the Chrome PID
+        _write_owner(path, os.getpid())
+
+    # ---------- driver factory hooks ----------
+
+    def prepare(self, options) -> Optional[str]:
+        """
+        Claim a slot and point Chrome options at it. Returns the slot path
+        (pass it to bind() / failed()), or None for a throwaway profile.
+        """
+        if not self.enabled:
+            return None
+        path = self._claim()
+        if path is None:
+            logger.info(f"📁 All {self.slots} {self.job} profile slots busy - using a fresh profile")
+            return None
+        try:
+            self._check(path)
+        except OSError as e:
+            logger.warning(f"⚠️ Profile slot {path} unusable: {e}")
+            self.failed(path, wipe=False)
+            return None
+
+        options.add_argument(f'--user-data-dir={path}')
+        options.add_argument(f'--disk-cache-size={config.BROWSER_CACHE_MB * 1024 * 1024}')
+        return path
+
+    def bind(self, path: Optional[str], driver):
+        """Record the driver that now owns the slot, in memory and in the slot's .owner file"""
+        if path is None:
+            return
+        with self._lock:
+            self._owners[path] = driver
+        try:
+            _write_owner(path, _owner_pid(driver, path) or os.getpid())
+        except OSError as e:
+            logger.debug(f"Could not record owner of {path}: {e}")
+
+    def failed(self, path: Optional[str], wipe: bool = True):
+        """Chrome did not start on this slot - treat its state as corrupt and free it"""
+        if path is None:
+            return
+        if wipe:
+            self._wipe(path, "Chrome failed to start with it")
+        else:
+            try:
+                os.unlink(os.path.join(path, OWNER_FILE))
+            except OSError:
+                pass
+        with self._lock:
+            self._owners.pop(path, None)
+
+
+_stores: Dict[str, ProfileStore] = {}
+_stores_lock = threading.Lock()
+
+
+def profile_store_for(job: str) -> ProfileStore:
+    """Shared ProfileStore per job, so every factory for that job draws from the same slots"""
+    with _stores_lock:
+        if job not in _stores:
+            _stores[job] = ProfileStore(job)
+        return _stores[job]
@@ -36,9 +36,88 @@ class Config:
     REQUEST_TIMEOUT   = int(os.getenv('REQUEST_TIMEOUT', '10'))
     PLAYWRIGHT_TIMEOUT = int(os.getenv('PLAYWRIGHT_TIMEOUT', '60000'))
 
+    # ---- Concurrency ----
+    MONITOR_WORKERS = int(os.getenv('MONITOR_WORKERS', '3'))                          # parallel Chrome drivers
+    HOST_MIN_INTERVAL = float(os.getenv('HOST_MIN_INTERVAL', '1.5'))                  # seconds between hits to one host
+    HOST_INTERVAL_JITTER = float(os.getenv('HOST_INTERVAL_JITTER', '1.0'))            # extra random spacing
+    ASYNC_PROBE_CONCURRENCY = int(os.getenv('ASYNC_PROBE_CONCURRENCY', '50'))         # in-flight HTTP probes
+    HOST_RATE_PER_SEC = float(os.getenv('HOST_RATE_PER_SEC', '2.0'))                  # token-bucket refill per host
+    HOST_BURST = float(os.getenv('HOST_BURST', '4'))                                  # token-bucket capacity per host
+
+    # ---- Probe tiers ----
+    PROBE_API_FIRST = os.getenv('PROBE_API_FIRST', 'true').lower() == 'true'          # try merchant JSON API before Selenium
+    GRAB_API_LATLNG = os.getenv('GRAB_API_LATLNG', '14.5995,120.9842')                # Manila
+
+    # ---- Driver profile ----
+    # Jobs whose Chrome blocks images/fonts/media/trackers and loads eagerly
+    LEAN_PROFILE_JOBS = [j.strip() for j in os.getenv('LEAN_PROFILE_JOBS', 'monitor,sku,ratings').split(',') if j.strip()]
+
+    # ---- Persistent browser profiles (opt-in) ----
+    # One --user-data-dir per worker slot under BROWSER_PROFILE_DIR, so JS/CSS come from disk cache
+    PERSISTENT_PROFILE_JOBS = [j.strip() for j in os.getenv('PERSISTENT_PROFILE_JOBS', '').split(',') if j.strip()]
+    BROWSER_PROFILE_DIR = os.getenv('BROWSER_PROFILE_DIR', 'chrome_profiles')
+    BROWSER_CACHE_MB = int(os.getenv('BROWSER_CACHE_MB', '200'))                     # Chrome --disk-cache-size
+    BROWSER_PROFILE_MAX_MB = int(os.getenv('BROWSER_PROFILE_MAX_MB', '400'))         # cache is wiped above this
+    BROWSER_PROFILE_SLOTS = int(os.getenv('BROWSER_PROFILE_SLOTS', '8'))             # per job (workers + recycle spares)
+
+    # ---- Page readiness ----
+    PAGE_READY_TIMEOUT = float(os.getenv('PAGE_READY_TIMEOUT', '12'))                # ceiling for SKU/rating page loads
+    MONITOR_READY_TIMEOUT = float(os.getenv('MONITOR_READY_TIMEOUT', '3'))            # ceiling for status probes
+    MENU_STABLE_FRAMES = int(os.getenv('MENU_STABLE_FRAMES', '10'))                   # frames with unchanged item count
+
+    # ---- Driver lifecycle ----
+    DRIVER_MAX_PAGES = int(os.getenv('DRIVER_MAX_PAGES', '150'))                      # recycle Chrome after this many pages
+    DRIVER_MAX_RSS_MB = float(os.getenv('DRIVER_MAX_RSS_MB', '1200'))                 # ...or once its process tree uses this much
+    DRIVER_KEEP_SPARE = os.getenv('DRIVER_KEEP_SPARE', 'true').lower() == 'true'      # pre-warm a replacement near the threshold
+
+    # ---- Page classifier ----
+    CLASSIFIER_MIN_CONFIDENCE = float(os.getenv('CLASSIFIER_MIN_CONFIDENCE', '0.9'))  # stop at the first stage this sure
+
+    # ---- Probe deadlines ----
+    PAGE_LOAD_TIMEOUT = float(os.getenv('PAGE_LOAD_TIMEOUT', '20'))                   # driver.set_page_load_timeout
+    SCRIPT_TIMEOUT = float(os.getenv('SCRIPT_TIMEOUT', '10'))                         # driver.set_script_timeout
+    PROBE_DEADLINE = float(os.getenv('PROBE_DEADLINE', '45'))                         # wall clock per browser probe (watchdog)
+
+    # ---- Store registry ----
+    STORE_REGISTRY_TTL = float(os.getenv('STORE_REGISTRY_TTL', '300'))               # seconds between stores-table change checks
+
+    # ---- Cycle planner ----
+    MONITOR_MAX_WORKERS = int(os.getenv('MONITOR_MAX_WORKERS', '6'))                 # ceiling when the plan needs more drivers
+    PLANNER_HISTORY_HOURS = int(os.getenv('PLANNER_HISTORY_HOURS', '24'))            # store_status_hourly window for cost estimates
+    PLANNER_DEFAULT_PROBE_MS = int(os.getenv('PLANNER_DEFAULT_PROBE_MS', '8000'))    # cost of a store with no history
+    PLANNER_DEADLINE_MARGIN = float(os.getenv('PLANNER_DEADLINE_MARGIN', '300'))     # finish this many seconds before the hour
+    PLANNER_TARGET_LOAD = float(os.getenv('PLANNER_TARGET_LOAD', '0.8'))             # plan to use this share of the budget
+
     # ---- Error handling ----
     MAX_RETRIES = int(os.getenv('MAX_RETRIES', '3'))
     RETRY_DELAY = int(os.getenv('RETRY_DELAY', '5'))  # seconds
+    BLOCKED_RETRY_BASE_DELAY = float(os.getenv('BLOCKED_RETRY_BASE_DELAY', '60'))    # first backoff for a blocked store
+    BLOCKED_RETRY_MAX_DELAY = float(os.getenv('BLOCKED_RETRY_MAX_DELAY', '180'))     # backoff cap
+    BLOCKED_RETRY_MAX_ATTEMPTS = int(os.getenv('BLOCKED_RETRY_MAX_ATTEMPTS', '5'))
+
+    # ---- Evidence logging ----
+    # One JSON evidence line per probe; full page text only for these cases
+    EVIDENCE_SAMPLE_RATE = float(os.getenv('EVIDENCE_SAMPLE_RATE', '0.02'))           # share of ONLINE probes also dumped
+    EVIDENCE_MIN_CONFIDENCE = float(os.getenv('EVIDENCE_MIN_CONFIDENCE', '0.8'))     # below this, always dump
+    EVIDENCE_DEBUG = os.getenv('EVIDENCE_DEBUG', 'false').lower() == 'true'           # dump every probe this run
+
+    # ---- Page artifacts ----
+    # Compressed, deduplicated page snapshots (replaces debug_*.html dumps)
+    ARTIFACTS_ENABLED = os.getenv('ARTIFACTS_ENABLED', 'true').lower() == 'true'
+    ARTIFACT_DIR = os.getenv('ARTIFACT_DIR', 'artifacts')
+    ARTIFACT_CODEC = os.getenv('ARTIFACT_CODEC', 'gzip')                              # gzip | zstd (needs zstandard)
+    ARTIFACT_SAMPLE_RATE = float(os.getenv('ARTIFACT_SAMPLE_RATE', '0.05'))           # share of routine pages kept
+    ARTIFACT_RETENTION_DAYS = float(os.getenv('ARTIFACT_RETENTION_DAYS', '7'))        # 0 keeps everything
+
+    # ---- SKU matching ----
+    # Scraped-name → SKU memo: in-process LRU in front of the sku_name_matches table
+    SKU_MATCH_LRU_SIZE = int(os.getenv('SKU_MATCH_LRU_SIZE', '4096'))                 # 0 disables the memo
+    SKU_MATCH_PERSIST = os.getenv('SKU_MATCH_PERSIST', 'true').lower() == 'true'      # share matches via the DB
+    NAME_CACHE_SIZE = int(os.getenv('NAME_CACHE_SIZE', '8192'))                       # memoized name normalizations
+    SKU_CATALOG_CHECK_INTERVAL = float(os.getenv('SKU_CATALOG_CHECK_INTERVAL', '30'))  # seconds between version checks
+
+    # ---- Metrics ----
+    METRICS_PORT = int(os.getenv('METRICS_PORT', '9108'))  # monitor_service /metrics; 0 disables
 
     # ---- Dashboard ----
     DASHBOARD_AUTO_REFRESH = int(os.getenv('DASHBOARD_AUTO_REFRESH', '300'))  # seconds
@@ -155,6 +234,9 @@ class Config:
         if cls.CHECK_INTERVAL_MINUTES < 1:
             errors.append("CHECK_INTERVAL_MINUTES must be at least 1")
 
+        if cls.MONITOR_WORKERS < 1:
+            errors.append("MONITOR_WORKERS must be at least 1")
+
         if not os.path.exists(cls.STORE_URLS_FILE):
             errors.append(f"Store URLs file not found: {cls.STORE_URLS_FILE}")
 
@@ -174,6 +256,10 @@ def print_config() -> bool:
     print(f"   🔄 Check Interval: {config.CHECK_INTERVAL_MINUTES} minutes")
     print(f"   🏪 Store URLs: {config.STORE_URLS_FILE}")
     print(f"   🔁 Max Retries: {config.MAX_RETRIES}")
+    print(f"   🧵 Monitor Workers: {config.MONITOR_WORKERS} (host spacing {config.HOST_MIN_INTERVAL}s)")
+    print(f"   🗓️ Planner: up to {config.MONITOR_MAX_WORKERS} workers, finish {config.PLANNER_DEADLINE_MARGIN:.0f}s before the hour")
+    print(f"   📈 Metrics: {f':{config.METRICS_PORT}/metrics' if config.METRICS_PORT else 'disabled'}")
+    print(f"   🚫 Lean Driver Jobs: {', '.join(config.LEAN_PROFILE_JOBS) or 'none'}")
     print(f"   📊 Dashboard Port: {config.DASHBOARD_PORT}")
     print(f"   📧 Email Alerts: {'Enabled' if config.ALERTS_ENABLED else 'Disabled'}")
     if config.ALERTS_ENABLED:
@@ -0,0 +1,15 @@
+"""
+Pytest setup for the module tests: point the database at a throwaway SQLite file
+before config/database are imported, so tests never touch store_status.db or Postgres
+"""
+import os
+import tempfile
+
+os.environ.setdefault('USE_SQLITE', 'true')
+os.environ.setdefault('SQLITE_PATH', os.path.join(tempfile.mkdtemp(prefix='cocopan-tests-'), 'test.db'))
+os.environ.setdefault('METRICS_PORT', '0')
+os.environ.setdefault('ARTIFACTS_ENABLED', 'false')
+
+# The root also holds manual test_*.py utilities (SMTP, live scrapes); only collect the module tests
+collect_ignore = ['test.py', 'test_admin_alerts.py', 'test_alerts.py', 'test_foodpanda_closed.py',
+                  'test_scrape.py', 'testsku.py', 'testy.py', 'api.testy.py']
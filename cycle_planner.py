@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+CocoPan Cycle Planner - fit the hourly monitor cycle inside its window
+- Estimates each store's probe cost from recent store_status_hourly.response_ms
+- Picks the worker count needed to finish PLANNER_DEADLINE_MARGIN before the hour
+- Orders work so stores most likely to have changed state go first
+  (last seen offline/blocked/error, or never probed), slowest first within a rank
+- Degrades gracefully: when the plan does not fit, or the cycle falls behind,
+  blocked-store re-probes and in-check retries are skipped
+- Logs a plan-vs-actual report after every cycle
+"""
+import math
+import time
+import logging
+import statistics
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from config import config
+from database import db as default_db
+
+logger = logging.getLogger(__name__)
+
+# Lower rank = probed earlier
+_RANK_CHANGED = 0     # offline last cycle, or last hourly row not ONLINE
+_RANK_UNKNOWN = 1     # no history
+_RANK_STEADY = 2      # last seen ONLINE
+
+
+@dataclass
+class CyclePlan:
+    """What the planner decided for one cycle"""
+    order: List[Tuple[int, str]]
+    workers: int
+    budget_s: float
+    estimated_s: float
+    host_floor_s: float
+    est_ms: Dict[str, float]
+    allow_retries: bool
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def deadline(self) -> float:
+        """Monotonic time by which the cycle must be done"""
+        return self.started + self.budget_s
+
+    @property
+    def fits(self) -> bool:
+        return self.estimated_s <= self.budget_s
+
+    def remaining_s(self, now: Optional[float] = None) -> float:
+        return self.deadline - (time.monotonic() if now is None else now)
+
+    def can_afford(self, pending_ms: float, now: Optional[float] = None) -> bool:
+        """True when `pending_ms` of extra probing still finishes before the deadline"""
+        return self.allow_retries and pending_ms / 1000.0 / self.workers < self.remaining_s(now)
+
+
+class CyclePlanner:
+    """Builds a CyclePlan from probe history and the time left before the hour"""
+
+    def __init__(self, database=None, platform: str = "grabfood"):
+        self.db = database or default_db
+        self.platform = platform
+
+    def _estimates(self, urls: Iterable[str], now: datetime) -> Tuple[Dict[str, float], Dict[str, str]]:
+        """({url: estimated ms}, {url: last hourly status})"""
+        since = now - timedelta(hours=config.PLANNER_HISTORY_HOURS)
+        history = self.db.get_probe_history(self.platform, since)
+
+        est_ms: Dict[str, float] = {}
+        last_status: Dict[str, str] = {}
+        for url in urls:
+            rows = history.get(url, [])
+            samples = [r['response_ms'] for r in rows if r['response_ms']]
+            est_ms[url] = statistics.median(samples) if samples else float(config.PLANNER_DEFAULT_PROBE_MS)
+            if rows:
+                last_status[url] = (rows[0]['status'] or '').upper()
+        return est_ms, last_status
+
+    def plan(self, work: List[Tuple[int, str]], now: datetime, max_workers: int,
+             hot_urls: Optional[Set[str]] = None, host_interval: float = 0.0) -> CyclePlan:
+        """
+        Args:
+            work: (index, url) pairs in store-file order
+            now: cycle start (timezone-aware, same zone as effective_at)
+            max_workers: most drivers the plan may use
+            hot_urls: stores that were offline last cycle
+            host_interval: average per-host spacing enforced by HostRateLimiter;
+                every probe hits the same host, so n * interval is a floor no
+                number of workers can beat
+        """
+        hot_urls = hot_urls or set()
+        next_boundary = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        budget_s = max(0.0, (next_boundary - now).total_seconds() - config.PLANNER_DEADLINE_MARGIN)
+
+        est_ms, last_status = self._estimates((url for _, url in work), now)
+
+        def rank(url: str) -> int:
+            if url in hot_urls:
+                return _RANK_CHANGED
+            status = last_status.get(url)
+            if status is None:
+                return _RANK_UNKNOWN
+            return _RANK_STEADY if status == 'ONLINE' else _RANK_CHANGED
+
+        order = sorted(work, key=lambda item: (rank(item[1]), -est_ms[item[1]], item[0]))
+
+        total_s = sum(est_ms.values()) / 1000.0
+        host_floor_s = len(work) * host_interval
+        target_s = budget_s * config.PLANNER_TARGET_LOAD
+        if target_s > 0:
+            workers = math.ceil(total_s / target_s)
+        else:
+            workers = max_workers
+        workers = max(1, min(max_workers, workers, len(work) or 1))
+        estimated_s = max(total_s / workers, host_floor_s)
+
+        return CyclePlan(
+            order=order,
+            workers=workers,
+            budget_s=budget_s,
+            estimated_s=estimated_s,
+            host_floor_s=host_floor_s,
+            est_ms=est_ms,
+            allow_retries=estimated_s <= target_s,
+        )
+
+    @staticmethod
+    def log_plan(plan: CyclePlan):
+        logger.info(f"🗓️ Cycle plan: {len(plan.order)} stores on {plan.workers} workers, "
+                    f"est {plan.estimated_s:.0f}s of {plan.budget_s:.0f}s budget "
+                    f"(host floor {plan.host_floor_s:.0f}s)")
+        if not plan.fits:
+            logger.warning("⚠️ Plan does not fit the window - re-probes disabled, most likely changes first")
+        elif not plan.allow_retries:
+            logger.info("   ✂️ Tight window - blocked-store re-probes disabled")
+
+    @staticmethod
+    def log_report(plan: CyclePlan, actual_ms: Dict[str, int], retries: int, skipped_retries: int):
+        """Plan-vs-actual: duration, deadline slack and per-store estimate error"""
+        elapsed = time.monotonic() - plan.started
+        slack = plan.budget_s - elapsed
+        errors = [abs(actual_ms[url] - plan.est_ms[url]) for url in actual_ms if url in plan.est_ms]
+        mean_error = statistics.mean(errors) / 1000.0 if errors else 0.0
+
+        logger.info("🗓️ Plan vs actual:")
+        logger.info(f"   ⏱️ Duration: planned {plan.estimated_s:.0f}s, actual {elapsed:.0f}s "
+                    f"({plan.workers} workers)")
+        logger.info(f"   🏁 Deadline slack: {slack:.0f}s of {plan.budget_s:.0f}s budget"
+                    f"{' - OVERRAN' if slack < 0 else ''}")
+        logger.info(f"   🎯 Per-store estimate error: {mean_error:.1f}s mean over {len(errors)} stores")
+        logger.info(f"   🔁 Re-probes: {retries} run, {skipped_retries} skipped for time")
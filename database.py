@@ -20,6 +20,7 @@ import uuid
 import sqlite3
 import psycopg2
 from psycopg2 import pool as pg_pool
+from psycopg2.extras import execute_values
 import pandas as pd
 
 from sqlalchemy import create_engine, text
@@ -221,6 +222,37 @@ class DatabaseManager:
                         PRIMARY KEY (platform, store_id, effective_at)
                     )
                 """)
+                # Per-stage probe timings, one row per store_status_hourly row
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS store_status_timings (
+                        effective_at  timestamptz NOT NULL,
+                        platform      text        NOT NULL,
+                        store_id      integer     NOT NULL REFERENCES stores(id),
+                        run_id        uuid        NOT NULL,
+                        acquire_ms    integer, navigate_ms integer, wait_ms     integer,
+                        extract_ms    integer, parse_ms    integer, classify_ms integer,
+                        persist_ms    integer,
+                        PRIMARY KEY (platform, store_id, effective_at)
+                    )
+                """)
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS cycle_metrics (
+                        run_id            uuid        PRIMARY KEY,
+                        effective_at      timestamptz NOT NULL,
+                        platform          text        NOT NULL,
+                        started_at        timestamptz NOT NULL,
+                        duration_ms       integer     NOT NULL,
+                        stores_checked    integer     NOT NULL,
+                        workers           integer,
+                        retries           integer     NOT NULL DEFAULT 0,
+                        timeouts          integer     NOT NULL DEFAULT 0,
+                        pages             integer     NOT NULL DEFAULT 0,
+                        bytes_transferred bigint      NOT NULL DEFAULT 0,
+                        persist_ms        integer,
+                        stage_stats       jsonb       NOT NULL,
+                        created_at        timestamptz NOT NULL DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
                 cur.execute("""
                     CREATE TABLE IF NOT EXISTS status_summary_hourly (
                         effective_at  timestamptz PRIMARY KEY,
@@ -250,6 +282,54 @@ class DatabaseManager:
                         UNIQUE(sku_code, platform)
                     )
                 """)
+
+                # Scraped-name → SKU match memo shared by every SKUMapper (pinned rows are admin overrides)
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS sku_name_matches (
+                        platform        VARCHAR(50)  NOT NULL,
+                        normalized_name VARCHAR(255) NOT NULL,
+                        sku_code        VARCHAR(50),
+                        confidence      REAL         NOT NULL DEFAULT 0,
+                        method          VARCHAR(20)  NOT NULL,
+                        catalog_version VARCHAR(40)  NOT NULL,
+                        pinned          BOOLEAN      NOT NULL DEFAULT FALSE,
+                        pinned_by       VARCHAR(255),
+                        updated_at      TIMESTAMP    DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (platform, normalized_name)
+                    )
+                """)
+
+                # Catalog version counter: bumped by a trigger on every master_skus write,
+                # so SkuCatalog caches reload whoever did the write (populate, migrate, admin)
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS catalog_versions (
+                        name       VARCHAR(50) PRIMARY KEY,
+                        version    BIGINT      NOT NULL DEFAULT 1,
+                        updated_at TIMESTAMP   DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                cur.execute("INSERT INTO catalog_versions (name) VALUES ('master_skus') ON CONFLICT (name) DO NOTHING")
+                cur.execute("""
+                    CREATE OR REPLACE FUNCTION bump_master_skus_version() RETURNS trigger AS $$
+                    BEGIN
+                        UPDATE catalog_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+                        WHERE name = 'master_skus';
+                        RETURN NULL;
+                    END;
+                    $$ LANGUAGE plpgsql
+                """)
+                # Create the trigger once; dropping and re-creating it on every start would
+                # take an exclusive lock on master_skus each time a service boots
+                cur.execute("""
+                    SELECT 1 FROM pg_trigger
+                    WHERE tgname = 'trg_master_skus_version' AND tgrelid = 'master_skus'::regclass
+                """)
+                if not cur.fetchone():
+                    cur.execute("""
+                        CREATE TRIGGER trg_master_skus_version
+                        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON master_skus
+                        FOR EACH STATEMENT EXECUTE PROCEDURE bump_master_skus_version()
+                    """)
                 
                 cur.execute("""
                     CREATE TABLE IF NOT EXISTS store_sku_checks (
@@ -399,6 +479,36 @@ class DatabaseManager:
                         PRIMARY KEY (platform, store_id, effective_at)
                     )
                 """)
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS store_status_timings (
+                        effective_at  TEXT NOT NULL,
+                        platform      TEXT NOT NULL,
+                        store_id      INTEGER NOT NULL,
+                        run_id        TEXT NOT NULL,
+                        acquire_ms    INTEGER, navigate_ms INTEGER, wait_ms     INTEGER,
+                        extract_ms    INTEGER, parse_ms    INTEGER, classify_ms INTEGER,
+                        persist_ms    INTEGER,
+                        PRIMARY KEY (platform, store_id, effective_at)
+                    )
+                """)
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS cycle_metrics (
+                        run_id            TEXT PRIMARY KEY,
+                        effective_at      TEXT NOT NULL,
+                        platform          TEXT NOT NULL,
+                        started_at        TEXT NOT NULL,
+                        duration_ms       INTEGER NOT NULL,
+                        stores_checked    INTEGER NOT NULL,
+                        workers           INTEGER,
+                        retries           INTEGER NOT NULL DEFAULT 0,
+                        timeouts          INTEGER NOT NULL DEFAULT 0,
+                        pages             INTEGER NOT NULL DEFAULT 0,
+                        bytes_transferred INTEGER NOT NULL DEFAULT 0,
+                        persist_ms        INTEGER,
+                        stage_stats       TEXT NOT NULL,
+                        created_at        TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
                 cur.execute("""
                     CREATE TABLE IF NOT EXISTS status_summary_hourly (
                         effective_at  TEXT PRIMARY KEY,
@@ -428,6 +538,39 @@ class DatabaseManager:
                         UNIQUE(sku_code, platform)
                     )
                 """)
+
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS sku_name_matches (
+                        platform        TEXT NOT NULL,
+                        normalized_name TEXT NOT NULL,
+                        sku_code        TEXT,
+                        confidence      REAL NOT NULL DEFAULT 0,
+                        method          TEXT NOT NULL,
+                        catalog_version TEXT NOT NULL,
+                        pinned          BOOLEAN NOT NULL DEFAULT 0,
+                        pinned_by       TEXT,
+                        updated_at      TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (platform, normalized_name)
+                    )
+                """)
+
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS catalog_versions (
+                        name       TEXT PRIMARY KEY,
+                        version    INTEGER NOT NULL DEFAULT 1,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                cur.execute("INSERT OR IGNORE INTO catalog_versions (name) VALUES ('master_skus')")
+                for event in ("INSERT", "UPDATE", "DELETE"):
+                    cur.execute(f"""
+                        CREATE TRIGGER IF NOT EXISTS trg_master_skus_version_{event.lower()}
+                        AFTER {event} ON master_skus
+                        BEGIN
+                            UPDATE catalog_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+                            WHERE name = 'master_skus';
+                        END
+                    """)
                 
                 cur.execute("""
                     CREATE TABLE IF NOT EXISTS store_sku_checks (
@@ -599,6 +742,78 @@ class DatabaseManager:
                 else:
                     raise
 
+    def get_store_index_rows(self) -> List[Dict[str, Any]]:
+        """All stores as {id, name, url, platform} - used to build the in-memory StoreRegistry"""
+        with self.get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT id, name, url, platform FROM stores")
+            rows = cur.fetchall()
+        if self.db_type == "postgresql":
+            return [{'id': r[0], 'name': r[1], 'url': r[2], 'platform': r[3]} for r in rows]
+        return [{'id': r['id'], 'name': r['name'], 'url': r['url'], 'platform': r['platform']} for r in rows]
+
+    def get_stores_signature(self) -> tuple:
+        """Cheap change marker for the stores table: (row count, max id)"""
+        with self.get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT COUNT(*), COALESCE(MAX(id), 0) FROM stores")
+            row = cur.fetchone()
+        return (int(row[0]), int(row[1]))
+
+    def bulk_upsert_stores(self, url_updates: List[tuple], new_stores: List[tuple]) -> Dict[str, int]:
+        """
+        Apply registry misses in one transaction.
+        url_updates: [(store_id, new_url)]  - store found by name, URL changed
+        new_stores:  [(name, url, platform)] - not known at all
+        Returns {url: id} for every new store (including ones another process inserted first).
+        """
+        if not url_updates and not new_stores:
+            return {}
+
+        for attempt in range(self.max_retries):
+            try:
+                with self.get_connection() as conn:
+                    cur = conn.cursor()
+                    try:
+                        created: Dict[str, int] = {}
+                        if self.db_type == "postgresql":
+                            if url_updates:
+                                cur.executemany("UPDATE stores SET url = %s WHERE id = %s",
+                                                [(url, store_id) for store_id, url in url_updates])
+                            if new_stores:
+                                execute_values(cur, """
+                                    INSERT INTO stores (name, url, platform) VALUES %s
+                                    ON CONFLICT (url) DO NOTHING
+                                """, new_stores)
+                                cur.execute("SELECT id, url FROM stores WHERE url = ANY(%s)",
+                                            ([url for _, url, _ in new_stores],))
+                                created = {row[1]: row[0] for row in cur.fetchall()}
+                        else:
+                            if url_updates:
+                                cur.executemany("UPDATE stores SET url = ? WHERE id = ?",
+                                                [(url, store_id) for store_id, url in url_updates])
+                            if new_stores:
+                                cur.executemany(
+                                    "INSERT OR IGNORE INTO stores (name, url, platform) VALUES (?, ?, ?)",
+                                    new_stores)
+                                urls = [url for _, url, _ in new_stores]
+                                placeholders = ",".join("?" for _ in urls)
+                                cur.execute(f"SELECT id, url FROM stores WHERE url IN ({placeholders})", urls)
+                                created = {row["url"]: row["id"] for row in cur.fetchall()}
+                        conn.commit()
+                    except Exception:
+                        conn.rollback()
+                        raise
+                for name, url, platform in new_stores:
+                    logger.info(f"✨ Created new store: {name} ({platform})")
+                return created
+            except Exception as e:
+                logger.error(f"❌ bulk_upsert_stores failed (attempt {attempt+1}): {e}")
+                if attempt < self.max_retries - 1:
+                    time.sleep(self.retry_delay)
+                else:
+                    raise
+
     def save_status_check(self, store_id: int, is_online: bool,
                           response_time_ms: Optional[int] = None,
                           error_message: Optional[str] = None) -> bool:
@@ -757,6 +972,134 @@ class DatabaseManager:
             logger.error(f"❌ search_master_skus failed: {e}")
             return []
 
+    def get_sku_catalog_version(self) -> Optional[int]:
+        """Current master_skus version counter (bumped on every write), or None if unavailable"""
+        try:
+            with self.get_connection() as conn:
+                cur = conn.cursor()
+                cur.execute("SELECT version FROM catalog_versions WHERE name = 'master_skus'")
+                row = cur.fetchone()
+                return int(row[0]) if row else None
+        except Exception as e:
+            logger.error(f"❌ get_sku_catalog_version failed: {e}")
+            return None
+
+    def get_master_sku_catalog(self) -> List[Dict]:
+        """Every master_skus row, all platforms, active or not (menu_type included once migrated)"""
+        try:
+            with self.get_connection() as conn:
+                cur = conn.cursor()
+                cur.execute("SELECT * FROM master_skus ORDER BY platform, product_name")
+                columns = [d[0] for d in cur.description]
+                skus = []
+                for row in cur.fetchall():
+                    sku = dict(zip(columns, tuple(row)))
+                    sku['gmv_q3'] = float(sku['gmv_q3']) if sku.get('gmv_q3') else 0.0
+                    sku['is_active'] = bool(sku.get('is_active'))
+                    skus.append(sku)
+                return skus
+        except Exception as e:
+            logger.error(f"❌ get_master_sku_catalog failed: {e}")
+            return []
+
+    # ========== SKU NAME MATCH MEMO ==========
+
+    def get_sku_name_matches(self, platform: str) -> List[Dict]:
+        """Every memoized scraped-name match for a platform (pinned overrides included)"""
+        try:
+            with self.get_connection() as conn:
+                cur = conn.cursor()
+                ph = "%s" if self.db_type == "postgresql" else "?"
+                cur.execute(f"""
+                    SELECT normalized_name, sku_code, confidence, method, catalog_version, pinned, pinned_by, updated_at
+                    FROM sku_name_matches
+                    WHERE platform = {ph}
+                    ORDER BY normalized_name
+                """, (platform,))
+                columns = ('normalized_name', 'sku_code', 'confidence', 'method',
+                           'catalog_version', 'pinned', 'pinned_by', 'updated_at')
+                return [dict(zip(columns, tuple(row))) for row in cur.fetchall()]
+        except Exception as e:
+            logger.error(f"❌ get_sku_name_matches failed: {e}")
+            return []
+
+    def save_sku_name_matches(self, platform: str, matches: List[Dict]) -> bool:
+        """
+        Upsert computed matches (normalized_name, sku_code, confidence, method, catalog_version).
+        Pinned rows are never overwritten by the matcher.
+        """
+        if not matches:
+            return True
+        rows = [(platform, m['normalized_name'], m.get('sku_code'), float(m.get('confidence') or 0),
+                 m['method'], m['catalog_version']) for m in matches]
+        try:
+            with self.get_connection() as conn:
+                cur = conn.cursor()
+                if self.db_type == "postgresql":
+                    execute_values(cur, """
+                        INSERT INTO sku_name_matches
+                          (platform, normalized_name, sku_code, confidence, method, catalog_version)
+                        VALUES %s
+                        ON CONFLICT (platform, normalized_name) DO UPDATE SET
+                          sku_code = EXCLUDED.sku_code, confidence = EXCLUDED.confidence,
+                          method = EXCLUDED.method, catalog_version = EXCLUDED.catalog_version,
+                          updated_at = CURRENT_TIMESTAMP
+                        WHERE sku_name_matches.pinned = FALSE
+                    """, rows)
+                else:
+                    cur.executemany("""
+                        INSERT INTO sku_name_matches
+                          (platform, normalized_name, sku_code, confidence, method, catalog_version)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(platform, normalized_name) DO UPDATE SET
+                          sku_code = EXCLUDED.sku_code, confidence = EXCLUDED.confidence,
+                          method = EXCLUDED.method, catalog_version = EXCLUDED.catalog_version,
+                          updated_at = CURRENT_TIMESTAMP
+                        WHERE sku_name_matches.pinned = 0
+                    """, rows)
+                conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"❌ save_sku_name_matches failed: {e}")
+            return False
+
+    def pin_sku_name_match(self, platform: str, normalized_name: str, sku_code: Optional[str],
+                           pinned_by: str, catalog_version: str = "") -> bool:
+        """Admin override: always map normalized_name to sku_code (None = never match)"""
+        try:
+            with self.get_connection() as conn:
+                cur = conn.cursor()
+                ph = "%s" if self.db_type == "postgresql" else "?"
+                cur.execute(f"""
+                    INSERT INTO sku_name_matches
+                      (platform, normalized_name, sku_code, confidence, method, catalog_version, pinned, pinned_by)
+                    VALUES ({ph}, {ph}, {ph}, 100, 'pinned', {ph}, {ph}, {ph})
+                    ON CONFLICT (platform, normalized_name) DO UPDATE SET
+                      sku_code = EXCLUDED.sku_code, confidence = 100, method = 'pinned',
+                      pinned = EXCLUDED.pinned, pinned_by = EXCLUDED.pinned_by,
+                      updated_at = CURRENT_TIMESTAMP
+                """, (platform, normalized_name, sku_code, catalog_version, True, pinned_by))
+                conn.commit()
+                logger.info(f"📌 Pinned {platform} '{normalized_name}' → {sku_code or 'no match'} by {pinned_by}")
+                return True
+        except Exception as e:
+            logger.error(f"❌ pin_sku_name_match failed: {e}")
+            return False
+
+    def delete_sku_name_match(self, platform: str, normalized_name: str) -> bool:
+        """Forget a memoized or pinned match; the next run scores the name again"""
+        try:
+            with self.get_connection() as conn:
+                cur = conn.cursor()
+                ph = "%s" if self.db_type == "postgresql" else "?"
+                cur.execute(f"DELETE FROM sku_name_matches WHERE platform = {ph} AND normalized_name = {ph}",
+                            (platform, normalized_name))
+                conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"❌ delete_sku_name_match failed: {e}")
+            return False
+
     def get_store_sku_status_today(self, store_id: int, platform: str) -> Optional[Dict]:
         """Get current day's SKU check status for a store"""
         try:
@@ -818,34 +1161,22 @@ class DatabaseManager:
                     f"⚠️ Store {store_id}: Removed {original_count - len(out_of_stock_ids)} duplicate SKU codes"
                 )
             
-            with self.get_connection() as validation_conn:
-                cur = validation_conn.cursor()
-                if self.db_type == "postgresql":
-                    cur.execute("""
-                        SELECT sku_code FROM master_skus 
-                        WHERE sku_code = ANY(%s) AND platform = %s
-                    """, (out_of_stock_ids, platform))
-                else:
-                    placeholders = ','.join(['?'] * len(out_of_stock_ids))
-                    cur.execute(f"""
-                        SELECT sku_code FROM master_skus 
-                        WHERE sku_code IN ({placeholders}) AND platform = ?
-                    """, (*out_of_stock_ids, platform))
-                
-                valid_rows = cur.fetchall()
-                if self.db_type == "postgresql":
-                    valid_sku_codes = [row[0] for row in valid_rows]
-                else:
-                    valid_sku_codes = [row['sku_code'] for row in valid_rows]
-                
-                invalid_skus = set(out_of_stock_ids) - set(valid_sku_codes)
-                if invalid_skus:
-                    logger.warning(
-                        f"⚠️ Store {store_id}: {len(invalid_skus)} SKU codes not found in master_skus: "
-                        f"{list(invalid_skus)}"
-                    )
+            # Validate and count against the shared in-memory catalog (active SKUs only)
+            from sku_catalog import sku_catalog
+            catalog = sku_catalog.platform(platform)
+            valid_sku_codes = [code for code in out_of_stock_ids if code in catalog.by_code
+                               and catalog.by_code[code]['is_active']]
+            
+            invalid_skus = set(out_of_stock_ids) - set(valid_sku_codes)
+            if invalid_skus:
+                inactive = sorted(code for code in invalid_skus if code in catalog.by_code)
+                unknown = sorted(invalid_skus - set(inactive))
+                logger.warning(
+                    f"⚠️ Store {store_id}: ignoring {len(invalid_skus)} SKU codes "
+                    f"(unknown for {platform}: {unknown}, inactive: {inactive})"
+                )
             
-            total_skus = len(self.get_master_skus_by_platform(platform))
+            total_skus = len(catalog.skus)
             out_of_stock_count = len(valid_sku_codes)
             compliance_pct = ((total_skus - out_of_stock_count) / max(total_skus, 1)) * 100.0
             
@@ -1464,6 +1795,51 @@ class DatabaseManager:
             logger.error(f"❌ set_store_name_override failed: {e}")
             return False
 
+    def get_store_name_overrides(self) -> Dict[str, str]:
+        """{url: name_override} for every store with a manual name set"""
+        try:
+            with self.get_connection() as conn:
+                cur = conn.cursor()
+                cur.execute("""
+                    SELECT url, name_override FROM stores
+                    WHERE name_override IS NOT NULL AND TRIM(name_override) <> ''
+                """)
+                return {row[0]: row[1] for row in cur.fetchall()}
+        except Exception as e:
+            logger.error(f"❌ get_store_name_overrides failed: {e}")
+            return {}
+
+    def get_probe_history(self, platform: str, since) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Recent hourly probes per store URL, newest first:
+        {url: [{'status': 'ONLINE', 'response_ms': 812}, ...]} - used by the cycle planner
+        """
+        history: Dict[str, List[Dict[str, Any]]] = {}
+        try:
+            with self.get_connection() as conn:
+                cur = conn.cursor()
+                if self.db_type == "postgresql":
+                    cur.execute("""
+                        SELECT s.url, h.status, h.response_ms
+                        FROM store_status_hourly h
+                        JOIN stores s ON s.id = h.store_id
+                        WHERE h.platform = %s AND h.effective_at >= %s
+                        ORDER BY h.effective_at DESC
+                    """, (platform, since))
+                else:
+                    cur.execute("""
+                        SELECT s.url, h.status, h.response_ms
+                        FROM store_status_hourly h
+                        JOIN stores s ON s.id = h.store_id
+                        WHERE h.platform = ? AND h.effective_at >= ?
+                        ORDER BY h.effective_at DESC
+                    """, (platform, str(since)))
+                for row in cur.fetchall():
+                    history.setdefault(row[0], []).append({'status': row[1], 'response_ms': row[2]})
+        except Exception as e:
+            logger.error(f"❌ get_probe_history failed: {e}")
+        return history
+
     # ---------- ALL YOUR EXISTING HOURLY UPSERTS (COMPLETELY UNCHANGED) ----------
         
     def ensure_schema(self) -> None:
@@ -1548,6 +1924,190 @@ class DatabaseManager:
                 else:
                     raise
 
+    def save_cycle_results(self, rows: List[Dict[str, Any]], effective_at, run_id) -> bool:
+        """
+        Persist a whole monitor cycle in ONE transaction:
+        hourly upserts + legacy status_checks rows + one summary_reports row.
+
+        Each row: store_id, platform, status (UPPER), confidence, response_ms,
+        evidence, probe_time, is_online, message (legacy status_checks text),
+        and optionally timings ({stage: ms}) for store_status_timings.
+        """
+        if not rows:
+            return True
+
+        # One hourly row per (platform, store_id); ON CONFLICT can't touch a row twice per statement
+        latest: Dict[tuple, Dict[str, Any]] = {}
+        for row in rows:
+            key = (row['platform'], row['store_id'])
+            if key not in latest or str(latest[key]['probe_time']) <= str(row['probe_time']):
+                latest[key] = row
+        hourly_rows = list(latest.values())
+
+        total = len(rows)
+        online = sum(1 for r in rows if r['is_online'])
+        offline = sum(1 for r in rows if r['status'] == 'OFFLINE')
+        online_pct = float((online / total * 100) if total > 0 else 0.0)
+
+        def _legacy_msg(msg):
+            if msg and len(msg) > 500:
+                return msg[:500] + "..."
+            return msg
+
+        timing_stages = ('acquire', 'navigate', 'wait', 'extract', 'parse', 'classify')
+        timing_rows = [(r['platform'], r['store_id'], str(run_id))
+                       + tuple((r.get('timings') or {}).get(stage) for stage in timing_stages)
+                       for r in hourly_rows if r.get('timings')]
+
+        for attempt in range(self.max_retries):
+            try:
+                with self.get_connection() as conn:
+                    cur = conn.cursor()
+                    try:
+                        if self.db_type == "postgresql":
+                            execute_values(cur, """
+                                INSERT INTO store_status_hourly
+                                  (effective_at, platform, store_id, status, confidence, response_ms, evidence, probe_time, run_id)
+                                VALUES %s
+                                ON CONFLICT (platform, store_id, effective_at)
+                                DO UPDATE SET
+                                  status      = EXCLUDED.status,
+                                  confidence  = EXCLUDED.confidence,
+                                  response_ms = EXCLUDED.response_ms,
+                                  evidence    = EXCLUDED.evidence,
+                                  probe_time  = EXCLUDED.probe_time,
+                                  run_id      = EXCLUDED.run_id
+                                WHERE store_status_hourly.probe_time <= EXCLUDED.probe_time
+                            """, [(effective_at, r['platform'], r['store_id'], r['status'], r['confidence'],
+                                   r['response_ms'], r['evidence'], r['probe_time'], str(run_id))
+                                  for r in hourly_rows], page_size=500)
+                            if timing_rows:
+                                execute_values(cur, """
+                                    INSERT INTO store_status_timings
+                                      (effective_at, platform, store_id, run_id, acquire_ms, navigate_ms,
+                                       wait_ms, extract_ms, parse_ms, classify_ms)
+                                    VALUES %s
+                                    ON CONFLICT (platform, store_id, effective_at)
+                                    DO UPDATE SET
+                                      run_id = EXCLUDED.run_id, acquire_ms = EXCLUDED.acquire_ms,
+                                      navigate_ms = EXCLUDED.navigate_ms, wait_ms = EXCLUDED.wait_ms,
+                                      extract_ms = EXCLUDED.extract_ms, parse_ms = EXCLUDED.parse_ms,
+                                      classify_ms = EXCLUDED.classify_ms, persist_ms = NULL
+                                """, [(effective_at,) + t for t in timing_rows], page_size=500)
+                            execute_values(cur, """
+                                INSERT INTO status_checks (store_id, is_online, response_time_ms, error_message)
+                                VALUES %s
+                            """, [(r['store_id'], bool(r['is_online']),
+                                   int(r['response_ms']) if r['response_ms'] is not None else None,
+                                   _legacy_msg(r['message'])) for r in rows], page_size=500)
+                            cur.execute("""
+                                INSERT INTO summary_reports (total_stores, online_stores, offline_stores, online_percentage)
+                                VALUES (%s, %s, %s, %s)
+                            """, (total, online, offline, online_pct))
+                        else:
+                            cur.executemany("""
+                                INSERT INTO store_status_hourly
+                                  (effective_at, platform, store_id, status, confidence, response_ms, evidence, probe_time, run_id)
+                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                ON CONFLICT(platform, store_id, effective_at) DO UPDATE SET
+                                  status      = EXCLUDED.status,
+                                  confidence  = EXCLUDED.confidence,
+                                  response_ms = EXCLUDED.response_ms,
+                                  evidence    = EXCLUDED.evidence,
+                                  probe_time  = EXCLUDED.probe_time,
+                                  run_id      = EXCLUDED.run_id
+                                WHERE store_status_hourly.probe_time <= EXCLUDED.probe_time
+                            """, [(str(effective_at), r['platform'], r['store_id'], r['status'], float(r['confidence']),
+                                   r['response_ms'], r['evidence'], str(r['probe_time']), str(run_id))
+                                  for r in hourly_rows])
+                            if timing_rows:
+                                cur.executemany("""
+                                    INSERT INTO store_status_timings
+                                      (effective_at, platform, store_id, run_id, acquire_ms, navigate_ms,
+                                       wait_ms, extract_ms, parse_ms, classify_ms)
+                                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                    ON CONFLICT(platform, store_id, effective_at) DO UPDATE SET
+                                      run_id = EXCLUDED.run_id, acquire_ms = EXCLUDED.acquire_ms,
+                                      navigate_ms = EXCLUDED.navigate_ms, wait_ms = EXCLUDED.wait_ms,
+                                      extract_ms = EXCLUDED.extract_ms, parse_ms = EXCLUDED.parse_ms,
+                                      classify_ms = EXCLUDED.classify_ms, persist_ms = NULL
+                                """, [(str(effective_at),) + t for t in timing_rows])
+                            cur.executemany("""
+                                INSERT INTO status_checks (store_id, is_online, response_time_ms, error_message)
+                                VALUES (?, ?, ?, ?)
+                            """, [(r['store_id'], bool(r['is_online']),
+                                   int(r['response_ms']) if r['response_ms'] is not None else None,
+                                   _legacy_msg(r['message'])) for r in rows])
+                            cur.execute("""
+                                INSERT INTO summary_reports (total_stores, online_stores, offline_stores, online_percentage)
+                                VALUES (?, ?, ?, ?)
+                            """, (total, online, offline, online_pct))
+                        conn.commit()
+                    except Exception:
+                        conn.rollback()
+                        raise
+                    logger.info(f"💾 Cycle saved in one transaction: {len(hourly_rows)} hourly, {len(rows)} checks, 1 summary")
+                    return True
+            except Exception as e:
+                logger.error(f"❌ save_cycle_results failed (attempt {attempt+1}): {e}")
+                if attempt < self.max_retries - 1:
+                    time.sleep(self.retry_delay)
+                else:
+                    return False
+
+    def save_cycle_metrics(self, *, run_id, effective_at, platform: str, started_at, duration_ms: int,
+                           stores_checked: int, workers: int, retries: int, timeouts: int,
+                           pages: int, bytes_transferred: int, persist_ms: Optional[int],
+                           stage_stats: Dict[str, Any]) -> bool:
+        """
+        One cycle_metrics row per run, and the cycle's persist time (amortized
+        per store) back-filled into that run's store_status_timings rows.
+        """
+        import json
+        stats_json = json.dumps(stage_stats)
+        per_store_persist = int(round(persist_ms / stores_checked)) if persist_ms and stores_checked else None
+
+        for attempt in range(self.max_retries):
+            try:
+                with self.get_connection() as conn:
+                    cur = conn.cursor()
+                    try:
+                        if self.db_type == "postgresql":
+                            cur.execute("""
+                                INSERT INTO cycle_metrics
+                                  (run_id, effective_at, platform, started_at, duration_ms, stores_checked, workers,
+                                   retries, timeouts, pages, bytes_transferred, persist_ms, stage_stats)
+                                VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s::jsonb)
+                                ON CONFLICT (run_id) DO NOTHING
+                            """, (str(run_id), effective_at, platform, started_at, duration_ms, stores_checked,
+                                  workers, retries, timeouts, pages, bytes_transferred, persist_ms, stats_json))
+                            if per_store_persist is not None:
+                                cur.execute("UPDATE store_status_timings SET persist_ms = %s WHERE run_id = %s",
+                                            (per_store_persist, str(run_id)))
+                        else:
+                            cur.execute("""
+                                INSERT OR IGNORE INTO cycle_metrics
+                                  (run_id, effective_at, platform, started_at, duration_ms, stores_checked, workers,
+                                   retries, timeouts, pages, bytes_transferred, persist_ms, stage_stats)
+                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                            """, (str(run_id), str(effective_at), platform, str(started_at), duration_ms,
+                                  stores_checked, workers, retries, timeouts, pages, bytes_transferred,
+                                  persist_ms, stats_json))
+                            if per_store_persist is not None:
+                                cur.execute("UPDATE store_status_timings SET persist_ms = ? WHERE run_id = ?",
+                                            (per_store_persist, str(run_id)))
+                        conn.commit()
+                    except Exception:
+                        conn.rollback()
+                        raise
+                    return True
+            except Exception as e:
+                logger.error(f"❌ save_cycle_metrics failed (attempt {attempt+1}): {e}")
+                if attempt < self.max_retries - 1:
+                    time.sleep(self.retry_delay)
+                else:
+                    return False
+
     # ========== NEW: RATING SYSTEM METHODS (ADDED AT END) ==========
 
     def save_store_rating(self, store_id: int, platform: str, rating: float,
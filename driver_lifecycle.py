@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+CocoPan Driver Lifecycle - keep long-running Chrome sessions from bloating
+- Tracks pages served and Chrome process-tree RSS (psutil) per driver
+- after_page(): between probes, swaps a driver out once it crosses
+  DRIVER_MAX_PAGES or DRIVER_MAX_RSS_MB; the old one is quit in the background
+- A spare driver is pre-warmed in the background as a driver nears a threshold,
+  so a recycle hands over a ready Chrome instead of stalling on startup
+- Recycle counts per reason for logs / metrics
+- Used by DriverPool (monitor), GrabFoodScraper (wow / skurun) and RatingScraper (ratings)
+"""
+import time
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+from config import config
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+logger = logging.getLogger(__name__)
+
+# Start warming a spare when a driver reaches this share of either threshold
+SPARE_WARM_AT = 0.8
+
+
+def driver_rss_mb(driver) -> float:
+    """Resident memory of chromedriver + Chrome (all children), in MB; 0 when unknown"""
+    if not HAS_PSUTIL:
+        return 0.0
+    roots = []
+    process = getattr(getattr(driver, 'service', None), 'process', None)
+    if process is not None:
+        roots.append(process.pid)
+    browser_pid = getattr(driver, 'browser_pid', None)  # undetected_chromedriver with use_subprocess
+    if browser_pid:
+        roots.append(browser_pid)
+
+    seen = set()
+    total = 0
+    for pid in roots:
+        try:
+            root = psutil.Process(pid)
+            for proc in [root] + root.children(recursive=True):
+                if proc.pid in seen:
+                    continue
+                seen.add(proc.pid)
+                total += proc.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024)
+
+
+class DriverLifecycle:
+    """Creates, measures and recycles drivers for one job"""
+
+    def __init__(self, factory: Callable[[], object], job: str,
+                 max_pages: Optional[int] = None, max_rss_mb: Optional[float] = None,
+                 keep_spare: Optional[bool] = None):
+        self.factory = factory
+        self.job = job
+        self.max_pages = config.DRIVER_MAX_PAGES if max_pages is None else max_pages
+        self.max_rss_mb = config.DRIVER_MAX_RSS_MB if max_rss_mb is None else max_rss_mb
+        self.keep_spare = config.DRIVER_KEEP_SPARE if keep_spare is None else keep_spare
+
+        self.recycles: Dict[str, int] = {'pages': 0, 'rss': 0}
+        self.spares_used = 0
+        self.cold_starts = 0
+
+        self._pages: Dict[int, int] = {}
+        self._spare = None
+        self._warming: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    # ---------- creation ----------
+
+    def new_driver(self):
+        """A ready driver: the pre-warmed spare when there is one, else a fresh start"""
+        with self._lock:
+            spare, self._spare = self._spare, None
+            if spare is not None:
+                self.spares_used += 1
+            else:
+                self.cold_starts += 1
+        driver = spare if spare is not None else self.factory()
+        with self._lock:
+            self._pages[id(driver)] = 0
+        return driver
+
+    def _warm_spare(self):
+        with self._lock:
+            if not self.keep_spare or self._spare is not None or (self._warming and self._warming.is_alive()):
+                return
+            self._warming = threading.Thread(target=self._build_spare, name=f"{self.job}-spare", daemon=True)
+            self._warming.start()
+
+    def _build_spare(self):
+        start = time.monotonic()
+        try:
+            spare = self.factory()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not pre-warm spare {self.job} driver: {e}")
+            return
+        with self._lock:
+            if self._spare is None:
+                self._spare = spare
+                spare = None
+        if spare is not None:
+            _quit_quietly(spare)
+        else:
+            logger.info(f"🔥 Spare {self.job} driver warmed in {time.monotonic() - start:.1f}s")
+
+    # ---------- recycling ----------
+
+    def after_page(self, driver):
+        """
+        Count one page for driver and recycle it if it crossed a threshold.
+        Call between probes only. Returns the driver to use next (maybe a new one).
+        """
+        with self._lock:
+            pages = self._pages.get(id(driver), 0) + 1
+            self._pages[id(driver)] = pages
+
+        rss = driver_rss_mb(driver) if self.max_rss_mb else 0.0
+        reason = None
+        if self.max_pages and pages >= self.max_pages:
+            reason = 'pages'
+        elif self.max_rss_mb and rss >= self.max_rss_mb:
+            reason = 'rss'
+
+        if reason is None:
+            if ((self.max_pages and pages >= self.max_pages * SPARE_WARM_AT) or
+                    (self.max_rss_mb and rss >= self.max_rss_mb * SPARE_WARM_AT)):
+                self._warm_spare()
+            return driver
+
+        try:
+            replacement = self.new_driver()
+        except Exception as e:
+            logger.error(f"❌ Could not start replacement {self.job} driver, keeping the old one: {e}")
+            return driver
+
+        with self._lock:
+            self.recycles[reason] += 1
+        logger.info(f"♻️ Recycled {self.job} driver after {pages} pages ({rss:.0f} MB RSS, reason: {reason})")
+        self.forget(driver)
+        threading.Thread(target=_quit_quietly, args=(driver,), name=f"{self.job}-quit", daemon=True).start()
+        return replacement
+
+    def forget(self, driver):
+        """Stop tracking a driver that is being discarded"""
+        with self._lock:
+            self._pages.pop(id(driver), None)
+
+    # ---------- reporting ----------
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            'recycles_pages': self.recycles['pages'],
+            'recycles_rss': self.recycles['rss'],
+            'spares_used': self.spares_used,
+            'cold_starts': self.cold_starts,
+        }
+
+    def log_summary(self):
+        s = self.summary()
+        logger.info(f"   ♻️ Driver recycles ({self.job}): {s['recycles_pages']} by pages, {s['recycles_rss']} by RSS "
+                    f"({s['spares_used']} from warm spare, {s['cold_starts']} cold starts)")
+
+    def close(self):
+        """Quit the spare, if one is waiting (lets an in-progress warm-up finish first)"""
+        warming = self._warming
+        if warming is not None and warming.is_alive():
+            warming.join()
+        with self._lock:
+            spare, self._spare = self._spare, None
+        if spare is not None:
+            _quit_quietly(spare)
+
+
+def _quit_quietly(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+CocoPan Driver Pool - shared Selenium drivers for concurrent probing
+- DriverPool: N pre-built Chrome drivers handed out one-per-worker
+- HostRateLimiter: per-host politeness (minimum spacing between requests to the same host)
+- Optional DriverLifecycle: drivers are recycled between probes by page count / RSS
+- A pool that lost every driver restarts one on demand (with backoff) or raises;
+  acquire() never blocks forever on an empty pool
+- Used by GrabFoodMonitor so the hourly cycle can run MONITOR_WORKERS probes in parallel
+"""
+import time
+import queue
+import random
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+RESTORE_BACKOFF_MIN = 5.0    # seconds before retrying Chrome after the pool emptied
+RESTORE_BACKOFF_MAX = 120.0
+ACQUIRE_POLL = 1.0           # how often a waiting acquire() re-checks for an emptied pool
+
+
+class HostRateLimiter:
+    """Spaces out requests to the same host across all worker threads"""
+
+    def __init__(self, min_interval: float = 1.5, jitter: float = 0.5):
+        self.min_interval = max(0.0, float(min_interval))
+        self.jitter = max(0.0, float(jitter))
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> float:
+        """
+        Block until this worker may hit the URL's host.
+        Slots are reserved under the lock, so concurrent callers queue up
+        one interval apart instead of all waking at the same moment.
+
+        Returns:
+            Seconds spent waiting
+        """
+        host = urlparse(url).netloc or url
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.min_interval + random.uniform(0, self.jitter)
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+class DriverPool:
+    """Fixed-size pool of WebDrivers built by a factory callable"""
+
+    def __init__(self, factory: Callable[[], object], size: int = 1, lifecycle=None):
+        # With a lifecycle, every start goes through it so pages/RSS are tracked and spares reused
+        self.lifecycle = lifecycle
+        self.factory = lifecycle.new_driver if lifecycle else factory
+        self.size = max(1, int(size))
+        self._idle: "queue.Queue[object]" = queue.Queue()
+        self._all: List[object] = []
+        self._retired: set = set()
+        self._lock = threading.Lock()
+        self._restore_lock = threading.Lock()
+        self._restore_backoff = RESTORE_BACKOFF_MIN
+        self._next_restore = 0.0
+        self.respawns = 0
+
+        for slot in range(self.size):
+            try:
+                self._add(self.factory())
+            except Exception as e:
+                logger.error(f"❌ Failed to start driver {slot + 1}/{self.size}: {e}")
+                if not self._all:
+                    raise
+
+        if len(self._all) < self.size:
+            logger.warning(f"⚠️ Driver pool running with {len(self._all)}/{self.size} drivers")
+            self.size = len(self._all)
+
+        logger.info(f"✓ Driver pool ready ({self.size} drivers)")
+
+    def _add(self, driver):
+        with self._lock:
+            self._all.append(driver)
+        self._idle.put(driver)
+
+    def grow(self, size: int) -> int:
+        """Start extra drivers until the pool holds `size`; returns the resulting size"""
+        while self.size < size:
+            try:
+                self._add(self.factory())
+            except Exception as e:
+                logger.error(f"❌ Failed to grow driver pool past {self.size}: {e}")
+                break
+            self.size += 1
+            logger.info(f"➕ Driver pool grown to {self.size} drivers")
+        return self.size
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Borrow a driver for the duration of the with-block.
+        Raises queue.Empty after `timeout`, and RuntimeError when the pool has no
+        drivers left and Chrome cannot be restarted.
+        """
+        driver = self._take(timeout)
+        try:
+            yield driver
+        finally:
+            if id(driver) in self._retired:
+                self._respawn(driver)
+            elif self.lifecycle:
+                self._idle.put(self._swap(driver, self.lifecycle.after_page(driver)))
+            else:
+                self._idle.put(driver)
+
+    def _take(self, timeout: Optional[float]):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if not self.size:
+                self._restore()
+            wait = ACQUIRE_POLL if deadline is None else min(ACQUIRE_POLL, deadline - time.monotonic())
+            if wait <= 0:
+                raise queue.Empty
+            try:
+                return self._idle.get(timeout=wait)
+            except queue.Empty:
+                continue
+
+    def _restore(self):
+        """Start one driver in an emptied pool, at most once per backoff period"""
+        with self._restore_lock:
+            if self.size:
+                return
+            now = time.monotonic()
+            if now < self._next_restore:
+                raise RuntimeError(f"Driver pool is empty (next Chrome restart in {self._next_restore - now:.0f}s)")
+            try:
+                self._add(self.factory())
+            except Exception as e:
+                self._next_restore = now + self._restore_backoff
+                self._restore_backoff = min(RESTORE_BACKOFF_MAX, self._restore_backoff * 2)
+                raise RuntimeError(f"Driver pool is empty and Chrome could not be restarted: {e}") from e
+            with self._lock:
+                self.size = len(self._all)
+            self._restore_backoff = RESTORE_BACKOFF_MIN
+            self.respawns += 1
+            logger.info("♻️ Restarted a Chrome driver in the emptied pool")
+
+    def _swap(self, old, new):
+        if new is not old:
+            with self._lock:
+                self._all = [new if d is old else d for d in self._all]
+        return new
+
+    def retire(self, driver):
+        """Mark a borrowed driver as dead; it is replaced by a fresh one when released"""
+        with self._lock:
+            self._retired.add(id(driver))
+
+    def _respawn(self, driver):
+        with self._lock:
+            self._retired.discard(id(driver))
+            self._all = [d for d in self._all if d is not driver]
+        if self.lifecycle:
+            self.lifecycle.forget(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        try:
+            self._add(self.factory())
+            self.respawns += 1
+            logger.info("♻️ Respawned a Chrome driver")
+        except Exception as e:
+            # Run at reduced size; an emptied pool is restarted (or fails fast) in acquire()
+            with self._lock:
+                self.size = len(self._all)
+            logger.error(f"❌ Failed to respawn driver ({self.size} left): {e}")
+
+    def close(self):
+        """Quit every driver in the pool (and a waiting spare)"""
+        if self.lifecycle:
+            self.lifecycle.close()
+        with self._lock:
+            drivers, self._all = self._all, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        while not self._idle.empty():
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+CocoPan Driver Profile - lean Chrome settings for scraping jobs
+- pageLoadStrategy=eager: driver.get() returns at DOMContentLoaded, not after every image
+- CDP Network.setBlockedURLs: drop images, media, fonts and third-party trackers
+  (stylesheets are kept - innerText and the menu's "unavailable" styling depend on them)
+- Switchable per job via LEAN_PROFILE_JOBS (monitor, sku, ratings)
+- ResourceMeter: bytes transferred / requests blocked / bytes saved per cycle
+"""
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+BLOCKED_URL_PATTERNS = [
+    # Images
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    # Fonts
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    # Media
+    '*.mp4', '*.webm', '*.mp3', '*.m4a', '*.ogg',
+    # Third-party analytics / trackers
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*facebook.net*', '*connect.facebook.com*', '*hotjar.com*', '*segment.io*',
+    '*sentry.io*', '*nr-data.net*', '*newrelic.com*', '*appsflyer.com*',
+    '*branch.io*', '*clarity.ms*', '*tiktok.com*',
+]
+
+# Rough transfer size of a blocked request, by CDP resource type. Used to
+# estimate bytes saved - a blocked request never reports its real size.
+TYPICAL_BYTES_BY_TYPE = {
+    'Image': 45_000,
+    'Font': 35_000,
+    'Media': 250_000,
+    'Script': 60_000,
+    'XHR': 2_000,
+    'Fetch': 2_000,
+    'Ping': 500,
+    'Other': 5_000,
+}
+
+_TRANSFER_SIZE_JS = """
+var total = 0;
+performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'))
+    .forEach(function (e) { total += e.transferSize || 0; });
+return total;
+"""
+
+
+@dataclass
+class DriverProfile:
+    """How a job's Chrome should be configured"""
+    job: str
+    block_resources: bool = False
+    eager: bool = False
+
+    @property
+    def lean(self) -> bool:
+        return self.block_resources or self.eager
+
+
+def profile_for(job: str) -> DriverProfile:
+    """Profile for a job name ('monitor', 'sku', 'ratings'); lean when listed in LEAN_PROFILE_JOBS"""
+    enabled = job in config.LEAN_PROFILE_JOBS
+    return DriverProfile(job=job, block_resources=enabled, eager=enabled)
+
+
+def apply_to_options(options, profile: DriverProfile):
+    """Set pre-launch options (works for selenium Options and undetected_chromedriver ChromeOptions)"""
+    if profile.eager:
+        options.page_load_strategy = 'eager'
+    if profile.block_resources:
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        # Performance log carries Network.loadingFailed events used by ResourceMeter
+        options.set_capability('goog:loggingPrefs', {'performance': 'INFO'})
+    return options
+
+
+def apply_to_driver(driver, profile: DriverProfile) -> bool:
+    """Install CDP URL blocking on a started driver; returns True when blocking is active"""
+    if not profile.block_resources:
+        return False
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+        logger.info(f"🚫 Resource blocking on for '{profile.job}' ({len(BLOCKED_URL_PATTERNS)} patterns)")
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️ Could not enable resource blocking for '{profile.job}': {e}")
+        return False
+
+
+class ResourceMeter:
+    """Per-cycle bandwidth accounting, shared by all drivers of a job"""
+
+    def __init__(self, job: str):
+        self.job = job
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.pages = 0
+            self.bytes_transferred = 0
+            self.blocked_requests = 0
+            self.bytes_saved = 0
+
+    def record_page(self, driver):
+        """Account for the page currently loaded in driver (call once per page, after reading it)"""
+        transferred = 0
+        blocked = 0
+        saved = 0
+        try:
+            transferred = int(driver.execute_script(_TRANSFER_SIZE_JS) or 0)
+        except Exception:
+            pass
+        try:
+            for entry in driver.get_log('performance'):
+                message = json.loads(entry.get('message', '{}')).get('message', {})
+                if message.get('method') != 'Network.loadingFailed':
+                    continue
+                params = message.get('params', {})
+                if params.get('blockedReason'):
+                    blocked += 1
+                    saved += TYPICAL_BYTES_BY_TYPE.get(params.get('type'), TYPICAL_BYTES_BY_TYPE['Other'])
+        except Exception:
+            pass  # performance log not enabled on this driver
+
+        with self._lock:
+            self.pages += 1
+            self.bytes_transferred += transferred
+            self.blocked_requests += blocked
+            self.bytes_saved += saved
+
+    def summary(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'pages': self.pages,
+                'bytes_transferred': self.bytes_transferred,
+                'blocked_requests': self.blocked_requests,
+                'bytes_saved': self.bytes_saved,
+            }
+
+    def log_summary(self):
+        s = self.summary()
+        if not s['pages']:
+            return
+        logger.info(f"   📦 Bandwidth ({self.job}): {s['bytes_transferred'] / 1e6:.1f} MB over {s['pages']} pages, "
+                    f"{s['blocked_requests']} requests blocked (~{s['bytes_saved'] / 1e6:.1f} MB saved)")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+CocoPan Grab API - shared helpers for the portal.grab.com foodweb/v2 merchant API
+- extract_grabfood_merchant_id(): '2-C6K2GPUYKYT3LE' from a food.grab.com store URL
+- grabfood_api_urls(): merchant endpoints, most specific first
+- extract_status_from_api_json(): (status, rating, vote_count) from either endpoint's payload
+- find_api_merchant(): the merchant object inside either endpoint's payload
+- merchant_closed_signals() / merchant_open_now(): what a merchant object (API payload or
+  __NEXT_DATA__) says about being closed or open right now; status=ACTIVE alone means
+  the merchant is listed, not that it is taking orders
+- Used by monitor_service (ApiProbeTier), rating_scraper and juanlo_grab
+"""
+import re
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+GRAB_API_HOST = "https://portal.grab.com"
+PH_LATLNG = "14.5995,120.9842"  # Manila coordinates
+
+CLOSED_STATUSES = ('INACTIVE', 'CLOSED', 'UNAVAILABLE')
+
+_MERCHANT_ID = re.compile(r'/([0-9]-[A-Z0-9]+)/?$', re.IGNORECASE)
+
+
+def extract_grabfood_merchant_id(url: str) -> Optional[str]:
+    """Extract merchant ID from GrabFood URL (e.g., '2-C6K2GPUYKYT3LE')"""
+    try:
+        # Pattern: /restaurant/store-name/2-MERCHANTID
+        match = _MERCHANT_ID.search(urlparse(url).path)
+        return match.group(1) if match else None
+    except Exception as e:
+        logger.debug(f"Error extracting merchant ID: {e}")
+        return None
+
+
+def grabfood_api_urls(merchant_id: str, ph_latlng: str = PH_LATLNG) -> List[str]:
+    """Merchant endpoints on the foodweb v2 API, most specific first"""
+    return [
+        f"{GRAB_API_HOST}/foodweb/v2/restaurant?merchantCode={merchant_id}&latlng={ph_latlng}",
+        f"{GRAB_API_HOST}/foodweb/v2/merchants/{merchant_id}?latlng={ph_latlng}",
+    ]
+
+
+def find_api_merchant(json_data: Any) -> Optional[Dict[str, Any]]:
+    """The object carrying the merchant status: the payload itself, or its data / merchant / restaurant"""
+    # Try multiple possible paths in the JSON structure
+    roots = [json_data]
+    if isinstance(json_data, dict):
+        for key in ('data', 'merchant', 'restaurant'):
+            if key in json_data:
+                roots.append(json_data[key])
+
+    for root in roots:
+        if isinstance(root, dict) and root.get('status'):
+            return root
+    return None
+
+
+def extract_status_from_api_json(json_data: Dict[str, Any]) -> Tuple[Optional[str], Optional[float], Optional[int]]:
+    """
+    Extract status, rating, and vote_count from GrabFood API JSON
+    Returns: (status, rating, vote_count)
+
+    Known status values:
+    - ACTIVE = Merchant is listed (it can still be closed - see merchant_closed_signals)
+    - INACTIVE = Store is offline/closed
+    """
+    try:
+        merchant = find_api_merchant(json_data)
+        if merchant is None:
+            return None, None, None
+
+        rating = merchant.get('rating')
+        try:
+            rating = float(rating) if rating is not None else None
+        except (ValueError, TypeError):
+            rating = None
+        return merchant['status'], rating, merchant.get('voteCount')
+
+    except Exception as e:
+        logger.debug(f"Error parsing API JSON: {e}")
+        return None, None, None
+
+
+def _hours_open(merchant: Dict[str, Any]) -> Optional[bool]:
+    hours = merchant.get('openingHours')
+    return hours.get('open') if isinstance(hours, dict) else None
+
+
+def merchant_closed_signals(merchant: Dict[str, Any]) -> List[str]:
+    """
+    Every closed flag on a merchant object, e.g. ['isClosed=True', 'closedReason=...'];
+    empty when nothing says closed
+    """
+    signals = []
+    status = str(merchant.get('status') or '').upper()
+    if status in CLOSED_STATUSES:
+        signals.append(f"status={status}")
+    if merchant.get('isClosed') is True:
+        signals.append("isClosed=True")
+    if merchant.get('available') is False:
+        signals.append("available=False")
+    if _hours_open(merchant) is False:
+        signals.append("open=False")
+    if merchant.get('closedReason'):
+        signals.append(f"closedReason={merchant['closedReason']}")
+    return signals
+
+
+def merchant_open_now(merchant: Dict[str, Any]) -> bool:
+    """True only when the opening hours explicitly say the store is open right now"""
+    return _hours_open(merchant) is True
@@ -10,7 +10,6 @@ import logging
 import signal
 import sys
 import asyncio
-import concurrent.futures
 from datetime import datetime
 from typing import List, Tuple, Dict, Any
 import pytz
@@ -26,6 +25,8 @@ except ImportError:
     
 from config import config
 from database import db
+from store_registry import store_registry
+from async_probe import AsyncProbeRunner, ProbeRequest, ProbeResponse
 
 logging.basicConfig(
     level=getattr(logging, config.LOG_LEVEL),
@@ -90,6 +91,7 @@ class StoreMonitor:
         self.timezone = config.get_timezone()
         self.circuit_breaker = CircuitBreaker()
         self.store_cache = {}  # Cache store names
+        self.probe_runner = AsyncProbeRunner(headers=self.headers, timeout=config.REQUEST_TIMEOUT)
         logger.info(f"🏪 StoreMonitor initialized with {len(self.store_urls)} stores")
         logger.info(f"🌏 Timezone: {self.timezone} (Current: {config.get_current_time().strftime('%Y-%m-%d %H:%M:%S %Z')})")
     
@@ -110,15 +112,18 @@ class StoreMonitor:
             logger.error(f"❌ Failed to load store URLs: {e}")
             return []
     
-    def _get_store_name(self, url: str) -> str:
-        """Extract store name from URL with caching"""
+    def _get_store_name(self, url: str, html: str = None) -> str:
+        """Extract store name with caching; reuses already-fetched HTML when given"""
         if url in self.store_cache:
             return self.store_cache[url]
         
+        name = None
         try:
-            r = requests.get(url, headers=self.headers, timeout=config.REQUEST_TIMEOUT)
-            r.raise_for_status()
-            soup = BeautifulSoup(r.text, 'html.parser')
+            if html is None:
+                r = requests.get(url, headers=self.headers, timeout=config.REQUEST_TIMEOUT)
+                r.raise_for_status()
+                html = r.text
+            soup = BeautifulSoup(html, 'html.parser')
             
             # Try multiple selectors for store name
             name_selectors = ['h1', '.restaurant-name', '[data-testid="restaurant-name"]', 'title']
@@ -184,75 +189,106 @@ class StoreMonitor:
             resp = requests.get(url, headers=self.headers, timeout=config.REQUEST_TIMEOUT)
             resp.raise_for_status()
             
-            soup = BeautifulSoup(resp.text, 'html.parser')
-            
-            # Check for closed indicators in HTML
-            closed_indicators = [
-                "temporarily unavailable",
-                "closed for now", 
-                "out of delivery area",
-                "restaurant is closed",
-                "currently closed"
-            ]
-            
-            page_text = soup.get_text().lower()
-            for indicator in closed_indicators:
-                if indicator in page_text:
-                    response_time = int((time.time() - start_time) * 1000)
-                    return False, response_time, f"Store shows as: {indicator}"
-            
-            # Look for specific closed elements
-            closed_elements = soup.find_all(['div', 'span', 'p'], 
-                                          class_=lambda x: x and any(word in x.lower() for word in ['closed', 'unavailable']))
-            
-            if closed_elements:
-                response_time = int((time.time() - start_time) * 1000)
-                return False, response_time, "Store shows as closed"
-            
+            is_online, message = self._evaluate_foodpanda_html(resp.text)
             response_time = int((time.time() - start_time) * 1000)
-            return True, response_time, None
+            return is_online, response_time, message
             
         except Exception as e:
             response_time = int((time.time() - start_time) * 1000)
             return False, response_time, f"Foodpanda check error: {str(e)}"
     
+    def _evaluate_foodpanda_html(self, html: str) -> Tuple[bool, str]:
+        """Classify a fetched Foodpanda page as (is_online, error_msg)"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Check for closed indicators in HTML
+        closed_indicators = [
+            "temporarily unavailable",
+            "closed for now", 
+            "out of delivery area",
+            "restaurant is closed",
+            "currently closed"
+        ]
+        
+        page_text = soup.get_text().lower()
+        for indicator in closed_indicators:
+            if indicator in page_text:
+                return False, f"Store shows as: {indicator}"
+        
+        # Look for specific closed elements
+        closed_elements = soup.find_all(['div', 'span', 'p'], 
+                                      class_=lambda x: x and any(word in x.lower() for word in ['closed', 'unavailable']))
+        
+        if closed_elements:
+            return False, "Store shows as closed"
+        
+        return True, None
+    
     def _check_grabfood_store_sync(self, url: str, start_time: float):
         """FIXED: Synchronous GrabFood store check"""
         try:
             resp = requests.get(url, headers=self.headers, timeout=config.REQUEST_TIMEOUT)
             resp.raise_for_status()
             
-            soup = BeautifulSoup(resp.text, 'html.parser')
-            
-            # Check multiple indicators for closed status
-            closed_indicators = [
-                '.status-banner',
-                '.closed-banner', 
-                '.restaurant-closed',
-                '[data-testid="closed-banner"]'
-            ]
-            
-            for selector in closed_indicators:
-                banner = soup.select_one(selector)
-                if banner:
-                    banner_text = banner.get_text(strip=True).lower()
-                    if any(word in banner_text for word in ['closed', 'unavailable', 'offline']):
-                        response_time = int((time.time() - start_time) * 1000)
-                        return False, response_time, f"Status banner: {banner_text}"
-            
-            # Check page text for closed indicators
-            page_text = soup.get_text().lower()
-            if any(word in page_text for word in ['temporarily closed', 'currently unavailable', 'restaurant closed']):
-                response_time = int((time.time() - start_time) * 1000)
-                return False, response_time, "Store shows as closed"
-            
+            is_online, message = self._evaluate_grabfood_html(resp.text)
             response_time = int((time.time() - start_time) * 1000)
-            return True, response_time, None
+            return is_online, response_time, message
             
         except Exception as e:
             response_time = int((time.time() - start_time) * 1000)
             return False, response_time, f"GrabFood check error: {str(e)}"
     
+    def _evaluate_grabfood_html(self, html: str) -> Tuple[bool, str]:
+        """Classify a fetched GrabFood page as (is_online, error_msg)"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Check multiple indicators for closed status
+        closed_indicators = [
+            '.status-banner',
+            '.closed-banner', 
+            '.restaurant-closed',
+            '[data-testid="closed-banner"]'
+        ]
+        
+        for selector in closed_indicators:
+            banner = soup.select_one(selector)
+            if banner:
+                banner_text = banner.get_text(strip=True).lower()
+                if any(word in banner_text for word in ['closed', 'unavailable', 'offline']):
+                    return False, f"Status banner: {banner_text}"
+        
+        # Check page text for closed indicators
+        page_text = soup.get_text().lower()
+        if any(word in page_text for word in ['temporarily closed', 'currently unavailable', 'restaurant closed']):
+            return False, "Store shows as closed"
+        
+        return True, None
+    
+    def _evaluate_probe(self, probe: ProbeResponse) -> Tuple[bool, int, str]:
+        """Turn an async probe response into (is_online, response_time, error_msg)"""
+        url = probe.request.url
+        platform = "Foodpanda" if 'foodpanda.ph' in url else "GrabFood"
+        
+        if probe.error:
+            is_online, error_msg = False, f"{platform} check error: {probe.error}"
+        elif not probe.ok:
+            is_online, error_msg = False, f"{platform} check error: HTTP {probe.status}"
+        else:
+            try:
+                if platform == "Foodpanda":
+                    is_online, error_msg = self._evaluate_foodpanda_html(probe.text)
+                else:
+                    is_online, error_msg = self._evaluate_grabfood_html(probe.text)
+            except Exception as e:
+                is_online, error_msg = False, f"{platform} check error: {str(e)}"
+        
+        if is_online:
+            self.circuit_breaker.record_success(url)
+        else:
+            self.circuit_breaker.record_failure(url)
+        
+        return is_online, probe.elapsed_ms, error_msg
+    
     def check_store_with_threading(self, url: str) -> Dict[str, Any]:
         """Check single store with proper error handling"""
         try:
@@ -276,7 +312,7 @@ class StoreMonitor:
             }
     
     def check_all_stores(self):
-        """FIXED: Check all stores with proper synchronous patterns"""
+        """Check all stores: one async fan-out fetch, then classify and save in order"""
         current_time = config.get_current_time()
         
         logger.info(f"🔍 Starting store check cycle at {current_time.strftime('%Y-%m-%d %H:%M:%S %Z')}")
@@ -287,53 +323,52 @@ class StoreMonitor:
         offline_count = 0
         database_errors = 0
         
-        # Use ThreadPoolExecutor for concurrent checks
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            # Submit all store checks
-            future_to_url = {executor.submit(self.check_store_with_threading, url): url 
-                            for url in self.store_urls}
+        # Circuit-broken stores are reported without touching the network
+        probe_urls = [url for url in self.store_urls if self.circuit_breaker.is_available(url)]
+        
+        # Fetch every page concurrently (bounded fan-out, per-host token buckets)
+        try:
+            probes = self.probe_runner.run([ProbeRequest(url=url) for url in probe_urls])
+        except Exception as e:
+            logger.error(f"❌ Async probe batch failed: {str(e)}")
+            probes = [ProbeResponse(request=ProbeRequest(url=url), url=url, error=str(e)) for url in probe_urls]
+        probes_by_url = {probe.request.url: probe for probe in probes}
+        
+        for i, url in enumerate(self.store_urls, 1):
+            probe = probes_by_url.get(url)
+            try:
+                if probe is None:
+                    is_online, response_time, error_msg = False, 0, "Circuit breaker OPEN"
+                else:
+                    is_online, response_time, error_msg = self._evaluate_probe(probe)
+                html = probe.text if probe is not None and probe.ok else ""
+                store_name = self._get_store_name(url, html=html)
+            except Exception as e:
+                logger.error(f"  ❌ Error checking store {url}: {str(e)}")
+                offline_count += 1
+                continue
             
-            # Process results
-            for i, future in enumerate(concurrent.futures.as_completed(future_to_url), 1):
-                try:
-                    result = future.result(timeout=30)  # 30 second timeout per store
-                    
-                    store_name = result['name']
-                    url = result['url']
-                    is_online = result['is_online']
-                    response_time = result['response_time']
-                    error_msg = result['error_msg']
-                    
-                    status = "🟢 ONLINE" if is_online else "🔴 OFFLINE"
-                    logger.info(f"  📊 {i}/{len(self.store_urls)} {store_name}: {status} ({response_time}ms)")
-                    
-                    # Save to database
-                    try:
-                        store_id = db.get_or_create_store(store_name, url)
-                        success = db.save_status_check(store_id, is_online, response_time, error_msg)
-                        
-                        if not success:
-                            logger.error(f"  ❌ Failed to save status check for {store_name}")
-                            database_errors += 1
-                        
-                    except Exception as db_error:
-                        logger.error(f"  ❌ Database error for {store_name}: {str(db_error)}")
-                        database_errors += 1
-                    
-                    results.append((store_name, url, is_online, response_time, error_msg))
-                    if is_online:
-                        online_count += 1
-                    else:
-                        offline_count += 1
-                        
-                except concurrent.futures.TimeoutError:
-                    url = future_to_url[future]
-                    logger.error(f"  ❌ Timeout checking store: {url}")
-                    offline_count += 1
-                except Exception as e:
-                    url = future_to_url[future]
-                    logger.error(f"  ❌ Error checking store {url}: {str(e)}")
-                    offline_count += 1
+            status = "🟢 ONLINE" if is_online else "🔴 OFFLINE"
+            logger.info(f"  📊 {i}/{len(self.store_urls)} {store_name}: {status} ({response_time}ms)")
+            
+            # Save to database
+            try:
+                store_id = store_registry.get_store_id(store_name, url)
+                success = db.save_status_check(store_id, is_online, response_time, error_msg)
+                
+                if not success:
+                    logger.error(f"  ❌ Failed to save status check for {store_name}")
+                    database_errors += 1
+                
+            except Exception as db_error:
+                logger.error(f"  ❌ Database error for {store_name}: {str(db_error)}")
+                database_errors += 1
+            
+            results.append((store_name, url, is_online, response_time, error_msg))
+            if is_online:
+                online_count += 1
+            else:
+                offline_count += 1
         
         # Save summary report
         try:
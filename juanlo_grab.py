@@ -19,6 +19,9 @@ from enum import Enum
 import requests
 import urllib3
 
+from async_probe import AsyncProbeRunner, ProbeRequest, ProbeResponse
+from grab_api import extract_grabfood_merchant_id, extract_status_from_api_json, grabfood_api_urls
+
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -57,24 +60,6 @@ class StoreResult:
 # ==============================================================================
 # Helper Functions
 # ==============================================================================
-# ==============================================================================
-# ✨ NEW: GrabFood API Helper Functions
-# Add these BEFORE the GrabFoodMonitor class in monitor_service.py
-# ==============================================================================
-
-def extract_grabfood_merchant_id(url: str) -> Optional[str]:
-    """Extract merchant ID from GrabFood URL (e.g., '2-C6K2GPUYKYT3LE')"""
-    try:
-        parsed = urlparse(url)
-        # Pattern: /restaurant/store-name/2-MERCHANTID
-        match = re.search(r'/([0-9]-[A-Z0-9]+)$', parsed.path, re.IGNORECASE)
-        if match:
-            return match.group(1)
-        return None
-    except Exception as e:
-        logger.debug(f"Error extracting merchant ID: {e}")
-        return None
-
 def fetch_grabfood_api_data(merchant_id: str, referer_url: str, user_agents: List[str], 
                             ph_latlng: str = "14.5995,120.9842", 
                             max_retries: int = 3) -> Optional[Dict[str, Any]]:
@@ -84,10 +69,7 @@ def fetch_grabfood_api_data(merchant_id: str, referer_url: str, user_agents: Lis
     Returns JSON data if successful, None otherwise
     """
     
-    api_urls = [
-        f"https://portal.grab.com/foodweb/v2/restaurant?merchantCode={merchant_id}&latlng={ph_latlng}",
-        f"https://portal.grab.com/foodweb/v2/merchants/{merchant_id}?latlng={ph_latlng}"
-    ]
+    api_urls = grabfood_api_urls(merchant_id, ph_latlng)
     
     session = requests.Session()
     
@@ -142,64 +124,6 @@ def fetch_grabfood_api_data(merchant_id: str, referer_url: str, user_agents: Lis
     
     return None
 
-def extract_status_from_api_json(json_data: Dict[str, Any]) -> Tuple[Optional[str], Optional[float], Optional[int]]:
-    """
-    ✨ NEW FUNCTION
-    Extract status, rating, and vote_count from GrabFood API JSON
-    Returns: (status, rating, vote_count)
-    
-    Known status values:
-    - ACTIVE = Store is online and accepting orders
-    - INACTIVE = Store is offline/closed
-    """
-    try:
-        # Try multiple possible paths in the JSON structure
-        roots = [json_data]
-        
-        if isinstance(json_data, dict):
-            if 'data' in json_data:
-                roots.append(json_data['data'])
-            if 'merchant' in json_data:
-                roots.append(json_data['merchant'])
-            if 'restaurant' in json_data:
-                roots.append(json_data['restaurant'])
-        
-        for root in roots:
-            if not isinstance(root, dict):
-                continue
-            
-            status = root.get('status')
-            rating = root.get('rating')
-            vote_count = root.get('voteCount')
-            
-            if status:
-                # Convert rating to float if present
-                try:
-                    rating = float(rating) if rating is not None else None
-                except (ValueError, TypeError):
-                    rating = None
-                
-                return status, rating, vote_count
-        
-        return None, None, None
-        
-    except Exception as e:
-        logger.debug(f"Error parsing API JSON: {e}")
-        return None, None, None
-        
-def extract_merchant_id(url: str) -> Optional[str]:
-    """Extract merchant ID from GrabFood URL (e.g., '2-C6K2GPUYKYT3LE')"""
-    try:
-        parsed = urlparse(url)
-        # Pattern: /restaurant/store-name/2-MERCHANTID
-        match = re.search(r'/([0-9]-[A-Z0-9]+)$', parsed.path, re.IGNORECASE)
-        if match:
-            return match.group(1)
-        return None
-    except Exception as e:
-        print(f"   ❌ Error extracting merchant ID: {e}")
-        return None
-
 def extract_store_name_from_url(url: str) -> str:
     """Extract store name from URL"""
     try:
@@ -250,10 +174,7 @@ def load_grabfood_urls() -> List[str]:
 def fetch_grabfood_api(merchant_id: str, referer_url: str, max_retries: int = 3) -> Optional[Dict[str, Any]]:
     """Fetch store data from GrabFood API"""
     
-    api_urls = [
-        f"https://portal.grab.com/foodweb/v2/restaurant?merchantCode={merchant_id}&latlng={PH_LATLNG}",
-        f"https://portal.grab.com/foodweb/v2/merchants/{merchant_id}?latlng={PH_LATLNG}"
-    ]
+    api_urls = grabfood_api_urls(merchant_id, PH_LATLNG)
     
     session = requests.Session()
     
@@ -303,45 +224,32 @@ def fetch_grabfood_api(merchant_id: str, referer_url: str, max_retries: int = 3)
     
     return None
 
-def extract_status_from_json(json_data: Dict[str, Any]) -> Tuple[Optional[str], Optional[float], Optional[int]]:
-    """
-    Extract status, rating, and vote_count from GrabFood API JSON
-    Returns: (status, rating, vote_count)
-    """
-    try:
-        # Try multiple possible paths in the JSON
-        roots = [json_data]
-        
-        if isinstance(json_data, dict):
-            if 'data' in json_data:
-                roots.append(json_data['data'])
-            if 'merchant' in json_data:
-                roots.append(json_data['merchant'])
-            if 'restaurant' in json_data:
-                roots.append(json_data['restaurant'])
-        
-        for root in roots:
-            if not isinstance(root, dict):
-                continue
-            
-            status = root.get('status')
-            rating = root.get('rating')
-            vote_count = root.get('voteCount')
-            
-            if status:
-                # Convert rating to float if present
-                try:
-                    rating = float(rating) if rating is not None else None
-                except (ValueError, TypeError):
-                    rating = None
-                
-                return status, rating, vote_count
-        
-        return None, None, None
-        
-    except Exception as e:
-        print(f"   ⚠️ Error parsing JSON: {e}")
-        return None, None, None
+def prefetch_grabfood_api(urls: List[str]) -> Dict[str, ProbeResponse]:
+    """Fetch the API payload for every store in one concurrent batch, keyed by store URL"""
+    
+    probe_requests = []
+    for url in urls:
+        merchant_id = extract_grabfood_merchant_id(url)
+        if not merchant_id:
+            continue
+        api_urls = grabfood_api_urls(merchant_id, PH_LATLNG)
+        probe_requests.append(ProbeRequest(
+            url=api_urls[0],
+            fallback_urls=api_urls[1:],
+            timeout=REQUEST_TIMEOUT,
+            key=url,
+            headers={
+                'User-Agent': random.choice(USER_AGENTS),
+                'Accept': 'application/json, text/plain, */*',
+                'Accept-Language': 'en-PH,en;q=0.9',
+                'Origin': 'https://food.grab.com',
+                'Referer': url,
+                'Connection': 'keep-alive',
+            },
+        ))
+    
+    probes = AsyncProbeRunner(timeout=REQUEST_TIMEOUT).run(probe_requests)
+    return {probe.request.key: probe for probe in probes}
 
 def determine_store_status(api_status: Optional[str]) -> StoreStatus:
     """
@@ -368,8 +276,9 @@ def determine_store_status(api_status: Optional[str]) -> StoreStatus:
 # Store Checker
 # ==============================================================================
 
-def check_store_status(url: str, index: int, total: int) -> StoreResult:
-    """Check a single store's online/offline status"""
+def check_store_status(url: str, index: int, total: int,
+                       prefetched: Optional[ProbeResponse] = None) -> StoreResult:
+    """Check a single store's online/offline status (uses the prefetched API response when it succeeded)"""
     
     start_time = time.time()
     store_name = extract_store_name_from_url(url)
@@ -378,7 +287,7 @@ def check_store_status(url: str, index: int, total: int) -> StoreResult:
     print(f"   URL: {url}")
     
     # Extract merchant ID
-    merchant_id = extract_merchant_id(url)
+    merchant_id = extract_grabfood_merchant_id(url)
     if not merchant_id:
         response_time = int((time.time() - start_time) * 1000)
         print(f"   ❌ Could not extract merchant ID")
@@ -395,9 +304,13 @@ def check_store_status(url: str, index: int, total: int) -> StoreResult:
     
     print(f"   Merchant ID: {merchant_id}")
     
-    # Fetch from API
-    json_data = fetch_grabfood_api(merchant_id, url)
-    response_time = int((time.time() - start_time) * 1000)
+    # Fetch from API (prefetched batch first, sequential retries only if that failed)
+    json_data = prefetched.json() if prefetched is not None and prefetched.ok else None
+    if json_data:
+        response_time = prefetched.elapsed_ms
+    else:
+        json_data = fetch_grabfood_api(merchant_id, url)
+        response_time = int((time.time() - start_time) * 1000)
     
     if not json_data:
         print(f"   ❌ API request failed")
@@ -413,7 +326,7 @@ def check_store_status(url: str, index: int, total: int) -> StoreResult:
         )
     
     # Extract status info
-    api_status, rating, vote_count = extract_status_from_json(json_data)
+    api_status, rating, vote_count = extract_status_from_api_json(json_data)
     status = determine_store_status(api_status)
     
     # Build message
@@ -469,15 +382,14 @@ def test_all_stores():
     results: List[StoreResult] = []
     start_time = time.time()
     
+    # Fan out all API calls at once (per-host token bucket keeps it polite)
+    prefetched = prefetch_grabfood_api(urls)
+    print(f"⚡ Prefetched {sum(1 for p in prefetched.values() if p.ok)}/{len(urls)} API responses "
+          f"in {time.time() - start_time:.1f}s")
+    
     for i, url in enumerate(urls, 1):
-        result = check_store_status(url, i, len(urls))
+        result = check_store_status(url, i, len(urls), prefetched.get(url))
         results.append(result)
-        
-        # Delay between requests (anti-rate-limiting)
-        if i < len(urls):
-            delay = random.uniform(2, 4)
-            print(f"   ⏱️ Waiting {delay:.1f}s...")
-            time.sleep(delay)
     
     total_time = time.time() - start_time
     
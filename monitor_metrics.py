@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+CocoPan Monitor Metrics - Prometheus text-format /metrics for monitor_service
+- MonitorMetrics: tiny thread-safe registry of counters, gauges and histograms
+  (stdlib only; no prometheus_client dependency)
+- metrics.time(name, **labels): context manager observing elapsed seconds
+- start_metrics_server(): threaded http.server on METRICS_PORT serving
+  /metrics (text exposition format 0.0.4) and /healthz
+"""
+import time
+import logging
+import threading
+import http.server
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# Seconds; probes sit between a fast API hit and the watchdog deadline
+PROBE_BUCKETS = (0.25, 0.5, 1, 2, 3, 5, 8, 13, 20, 30, 45, 60)
+# Seconds; DB writes and SMTP sends
+IO_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class _Histogram:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class MonitorMetrics:
+    """Counters, gauges and histograms keyed by name + labels"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._meta: Dict[str, Tuple[str, str, Sequence[float]]] = {}   # name -> (kind, help, buckets)
+        self._values: Dict[str, Dict[LabelKey, object]] = {}
+
+    def define(self, name: str, kind: str, help_text: str, buckets: Sequence[float] = ()):
+        with self._lock:
+            self._meta[name] = (kind, help_text, buckets)
+            self._values.setdefault(name, {})
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._values[name]
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels):
+        """Gauges, and counters mirrored from an object that already keeps a running total"""
+        with self._lock:
+            self._values[name][_label_key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._values[name]
+            if key not in series:
+                series[key] = _Histogram(self._meta[name][2])
+            series[key].observe(value)
+
+    @contextmanager
+    def time(self, name: str, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name, (kind, help_text, _) in self._meta.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for key, value in sorted(self._values[name].items()):
+                    if kind != 'histogram':
+                        lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+                        continue
+                    for bound, count in zip(value.buckets, value.counts):  # counts are already cumulative
+                        lines.append(f"{name}_bucket{_format_labels(key, ('le', _format_value(bound)))} {count}")
+                    lines.append(f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {value.count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_value(round(value.sum, 6))}")
+                    lines.append(f"{name}_count{_format_labels(key)} {value.count}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MonitorMetrics()
+
+# ---- Cycle ----
+metrics.define('cocopan_cycles_total', 'counter', 'Monitor cycles completed')
+metrics.define('cocopan_cycle_duration_seconds', 'gauge', 'Wall-clock duration of the last cycle')
+metrics.define('cocopan_cycle_last_completed_timestamp_seconds', 'gauge', 'Unix time the last cycle finished')
+metrics.define('cocopan_cycle_workers', 'gauge', 'Probe workers used by the last cycle')
+metrics.define('cocopan_cycle_stores', 'gauge', 'Stores per status in the last cycle')
+metrics.define('cocopan_cycle_block_ratio', 'gauge', 'Share of probes in the last cycle that came back BLOCKED')
+metrics.define('cocopan_cycle_retry_ratio', 'gauge', 'Re-probes per checked store in the last cycle')
+# ---- Probes ----
+metrics.define('cocopan_probes_total', 'counter', 'Store probes by final status and deciding tier')
+metrics.define('cocopan_probe_latency_seconds', 'histogram', 'Store probe wall-clock latency', PROBE_BUCKETS)
+metrics.define('cocopan_probe_retries_total', 'counter', 'Re-probes of BLOCKED / TIMEOUT stores')
+metrics.define('cocopan_probe_retry_successes_total', 'counter', 'Re-probes that resolved the store')
+metrics.define('cocopan_probe_retries_skipped_total', 'counter', 'Re-probes dropped to meet the hour deadline')
+# ---- Drivers ----
+metrics.define('cocopan_driver_recycles_total', 'counter', 'Chrome drivers recycled, by reason')
+metrics.define('cocopan_driver_respawns_total', 'counter', 'Chrome drivers respawned after a watchdog kill')
+metrics.define('cocopan_watchdog_kills_total', 'counter', 'Probes killed for missing PROBE_DEADLINE')
+# ---- I/O ----
+metrics.define('cocopan_db_write_seconds', 'histogram', 'Database write latency by operation', IO_BUCKETS)
+metrics.define('cocopan_alert_send_seconds', 'histogram', 'Alert email send latency by kind', IO_BUCKETS)
+
+
+def start_metrics_server(port: Optional[int] = None) -> Optional[http.server.ThreadingHTTPServer]:
+    """Serve /metrics and /healthz from a daemon thread; returns None when disabled or the port is taken"""
+    port = config.METRICS_PORT if port is None else port
+    if not port:
+        return None
+
+    class MetricsHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] == "/metrics":
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            elif self.path == "/healthz":
+                self.send_response(200)
+                self.send_header("Content-type", "text/plain")
+                self.end_headers()
+                self.wfile.write(b"OK - Monitor Service Healthy")
+            else:
+                self.send_response(404)
+                self.end_headers()
+
+        def log_message(self, *args, **kwargs):
+            pass
+
+    class ReusableServer(http.server.ThreadingHTTPServer):
+        allow_reuse_address = True
+        daemon_threads = True
+
+    try:
+        httpd = ReusableServer(("", port), MetricsHandler)
+    except OSError as e:
+        logger.warning(f"⚠️ Metrics server not started on :{port}: {e}")
+        return None
+
+    threading.Thread(target=httpd.serve_forever, daemon=True, name="metrics-server").start()
+    logger.info(f"📈 Metrics server listening on :{port}/metrics")
+    return httpd
@@ -18,9 +18,15 @@ import sys
 import random
 import uuid
 import re
+import heapq
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta, date  # ← CHANGED: Added 'date'
 from typing import List, Dict, Any, Optional, Set, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from urllib.parse import urlparse
 from selenium import webdriver
@@ -28,6 +34,7 @@ from selenium.webdriver.chrome.options import Options
 
 import pytz
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import urllib3
 
@@ -40,6 +47,14 @@ except ImportError:
     HAS_FUZZY = False
     logging.warning("fuzzywuzzy not available - SKU matching will be basic")
 
+# Vectorized batch SKU matching (SKUMapper.map_names)
+try:
+    import numpy as np
+    from rapidfuzz import fuzz as rf_fuzz, process as rf_process, utils as rf_utils
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False
+
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -54,6 +69,23 @@ except ImportError:
 # Local modules
 from config import config
 from database import db
+from sku_catalog import sku_catalog
+from name_normalizer import sku_key
+from store_registry import store_registry
+from cycle_planner import CyclePlan, CyclePlanner
+from probe_watchdog import LatencyTracker, ProbeWatchdog, load_page, set_driver_timeouts
+from probe_timing import CycleTimings, StageTimer
+from monitor_metrics import metrics, start_metrics_server
+from probe_evidence import EvidencePolicy, evidence_line
+from artifact_store import artifact_store
+from grab_api import (extract_grabfood_merchant_id, extract_status_from_api_json, find_api_merchant,
+                      grabfood_api_urls, merchant_closed_signals, merchant_open_now)
+from driver_pool import DriverPool, HostRateLimiter
+from driver_lifecycle import DriverLifecycle
+from browser_profile import profile_store_for
+from driver_profile import ResourceMeter, apply_to_driver, apply_to_options, profile_for
+from page_analysis import PageAnalysis, analyze_html, extract_from_driver
+from selenium_waits import next_data_present, store_content_rendered, wait_until_ready
 
 # Admin alerts (optional)
 try:
@@ -99,6 +131,16 @@ class StoreStatus(Enum):
     BLOCKED = "blocked"
     ERROR = "error"
     UNKNOWN = "unknown"
+    TIMEOUT = "timeout"
+
+# Dashboards and legacy status_checks only know the original five statuses;
+# a watchdog TIMEOUT is stored as ERROR with a [TIMEOUT] evidence prefix.
+RETRYABLE_STATUSES = (StoreStatus.BLOCKED, StoreStatus.TIMEOUT)
+
+
+def _persisted_status(status: StoreStatus) -> str:
+    """Status string written to store_status_hourly"""
+    return "ERROR" if status == StoreStatus.TIMEOUT else status.value.upper()
 
 @dataclass
 class CheckResult:
@@ -106,6 +148,32 @@ class CheckResult:
     response_time: int
     message: str = None
     confidence: float = 1.0
+    tier: str = None  # which probe tier decided this result ('api', 'browser')
+    stage: str = None  # which classifier stage decided it ('next_data', 'error_page', 'keywords', ...)
+    timings: Dict[str, int] = field(default_factory=dict)  # ms per probe stage (probe_timing.STAGES)
+    details: Dict[str, Any] = field(default_factory=dict)  # page facts for the evidence log line
+
+
+# Phrases that mean the store is closed/terminated/offline, matched in one regex pass.
+# Longest first so the reported keyword is the most specific one present.
+CLOSED_KEYWORDS = [
+    'closed',
+    'currently closed',
+    'temporarily closed',
+    'terminated',
+    'permanently closed',
+    'closed permanently',
+    'no longer available',
+    'not available anymore',
+    'store has closed',
+    'not available',
+    'unavailable',
+    'not accepting orders',
+    'offline',
+    'store is closed',
+    'temporarily unavailable'
+]
+CLOSED_KEYWORDS_RE = re.compile('|'.join(re.escape(k) for k in sorted(CLOSED_KEYWORDS, key=len, reverse=True)))
 
 # ==============================================================================
 # ✨ NEW FUNCTIONS: Smart SKU Scraping Control
@@ -205,10 +273,21 @@ def should_run_startup_sku_test() -> bool:
     # Default: Allow for local development (but only if hasn't run today)
     logger.info("🧪 Running startup SKU test (use SKIP_STARTUP_SKU_TEST=true to disable)")
     return True
-# ==============================================================================
-# ✨ NEW: GrabFood API Helper Functions
-# Add these BEFORE the GrabFoodMonitor class in monitor_service.py
-# ==============================================================================
+
+@dataclass
+class SkuMatch:
+    sku_code: str
+    method: str   # 'exact', 'fuzzy', 'overlap' or 'pinned' (admin override)
+    score: float  # 100 for exact, fuzzy ratio (0-100), or word-overlap share (0-1)
+
+
+def _fuzz_process(name: str) -> str:
+    """fuzzywuzzy's full_process(force_ascii=True), so rapidfuzz scores match the per-name path"""
+    return rf_utils.default_process(name.encode('ascii', 'ignore').decode())
+
+
+DEFAULT_MIN_CONFIDENCE = 85  # only matches scored at this threshold are memoized
+_NOT_MEMOIZED = object()
 
 
 class SKUMapper:
@@ -235,10 +314,14 @@ class SKUMapper:
             self.name_to_sku_map = self._build_name_mapping()
             logger.info(f"✅ Built {len(self.name_to_sku_map)} name mappings")
             
+            self._prepare_catalog()
+            
             # Build SKU set for quick lookup
             self.all_sku_codes = set(sku['sku_code'] for sku in self.master_skus)
             logger.info(f"📦 Total SKU codes in database: {len(self.all_sku_codes)}")
             
+            self._init_match_memo()
+            
             logger.info(f"✅ SKU Mapper initialized successfully for {self.platform.upper()}")
             
         except Exception as e:
@@ -250,10 +333,8 @@ class SKUMapper:
     def _load_master_skus(self) -> List[Dict]:
         """Load ALL SKUs from database for the specified platform"""
         try:
-            # Use the global db object (same as working SKU mapper)
-            from database import db
-            
-            skus = db.get_master_skus_by_platform(self.platform)
+            # Shared per-process catalog; only re-queried when master_skus changes
+            skus = sku_catalog.skus(self.platform)
             
             if skus:
                 logger.debug(f"📦 Loaded {len(skus)} {self.platform.upper()} SKUs from database")
@@ -274,45 +355,126 @@ class SKUMapper:
             mapping[normalized_name] = sku['sku_code']
         return mapping
     
-    def _normalize_name(self, name: str) -> str:
+    def _prepare_catalog(self):
         """
-        Enhanced normalization: removes platform prefixes, promo text, and standardizes format
+        Catalog indexes, built once per mapper: the batch matcher's name list (map_names),
+        a token → catalog-name inverted index for overlap matching, and sku_code → record
         """
-        if not name:
-            return ""
-        
-        # Convert to uppercase
-        name = name.upper()
-        
-        # Normalize special characters
-        name = name.replace('Ñ', 'N').replace('ñ', 'N')
-        name = name.replace('É', 'E').replace('é', 'E')
-        
-        # Remove platform prefixes
-        name = re.sub(r'^(GRAB\s+|FOODPANDA\s+|FOOD PANDA\s+)', '', name)
-        
-        # Remove promotional phrases
-        promo_patterns = [
-            r'\s*FREE\s+MANGO\s+SUNRISE.*$',
-            r'\s*\+\s*\d+\s*PHP.*$',
-            r'\s*\(FREE\s+MANGO\s+SUNRISE\).*$',
-            r'\s*\(\+\s*\d+\s*PHP.*\).*$',
-            r'\s*WITH\s+FREE.*$',
-            r'\s*FREE.*$',
-        ]
-        
-        for pattern in promo_patterns:
-            name = re.sub(pattern, '', name, flags=re.IGNORECASE)
+        self._catalog_names = list(self.name_to_sku_map)
+        self._catalog_processed = [_fuzz_process(n) for n in self._catalog_names] if HAS_RAPIDFUZZ else []
+        self._catalog_words = [(set(n.split()), self.name_to_sku_map[n]) for n in self._catalog_names]
         
-        # Flatten parentheses - keep content but remove the parentheses themselves
-        name = re.sub(r'\s*\(([^)]+)\)\s*', r' \1 ', name)
-        name = re.sub(r'\s*\[([^\]]+)\]\s*', r' \1 ', name)
+        self._token_index: Dict[str, List[int]] = {}
+        for i, (words, _) in enumerate(self._catalog_words):
+            for word in words:
+                self._token_index.setdefault(word, []).append(i)
         
-        # Standardize spacing around special characters
-        name = re.sub(r'\s*-\s*', ' ', name)  # "K-SALT" -> "K SALT"
-        name = re.sub(r'\s+', ' ', name).strip()
-        
-        return name
+        self.sku_by_code: Dict[str, Dict] = {}
+        for sku in self.master_skus:
+            self.sku_by_code.setdefault(sku['sku_code'], sku)  # first record wins, like the old scan
+    
+    def _catalog_fingerprint(self) -> str:
+        """Version of the loaded master list; any add/rename/removal changes it"""
+        digest = hashlib.sha1()
+        for sku in sorted(self.master_skus, key=lambda s: (s['sku_code'], s['product_name'])):
+            digest.update(f"{sku['sku_code']}\t{sku['product_name']}\n".encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _init_match_memo(self, size: Optional[int] = None, persist: Optional[bool] = None):
+        """
+        Two-level scraped-name memo: an in-process LRU seeded from sku_name_matches.
+        Stored rows from another catalog_version are ignored (and overwritten when the
+        name is scored again); pinned rows are admin overrides and always win.
+        """
+        self.catalog_version = self._catalog_fingerprint()
+        self._memo: "OrderedDict[str, Optional[SkuMatch]]" = OrderedDict()
+        self._memo_lock = threading.Lock()
+        self._memo_size = config.SKU_MATCH_LRU_SIZE if size is None else size
+        self._persist_matches = (config.SKU_MATCH_PERSIST if persist is None else persist) and self._memo_size > 0
+        self._pinned: Dict[str, Optional[SkuMatch]] = {}
+        self.memo_hits = 0
+        self.memo_misses = 0
+        if self._persist_matches:
+            self._load_stored_matches()
+    
+    def _load_stored_matches(self):
+        rows = db.get_sku_name_matches(self.platform)
+        reused = stale = 0
+        for row in rows:
+            sku_code = row['sku_code']
+            if row['pinned']:
+                if sku_code and sku_code not in self.all_sku_codes:
+                    logger.warning(f"⚠️ Pinned match '{row['normalized_name']}' → {sku_code} "
+                                   f"points at a SKU no longer in the {self.platform} catalog - ignored")
+                    continue
+                self._pinned[row['normalized_name']] = SkuMatch(sku_code, 'pinned', 100) if sku_code else None
+            elif row['catalog_version'] == self.catalog_version and len(self._memo) < self._memo_size:
+                self._memo[row['normalized_name']] = (
+                    SkuMatch(sku_code, row['method'], row['confidence']) if sku_code else None)
+                reused += 1
+            else:
+                stale += 1
+        logger.info(f"🧠 SKU match memo: {reused} stored matches reused, {len(self._pinned)} pinned, "
+                    f"{stale} stale (catalog {self.catalog_version[:8]})")
+    
+    def _memo_get(self, normalized: str):
+        """Memoized match (None = known no-match), or _NOT_MEMOIZED"""
+        if normalized in self._pinned:
+            self.memo_hits += 1
+            return self._pinned[normalized]
+        if not self._memo_size:
+            return _NOT_MEMOIZED
+        with self._memo_lock:
+            if normalized in self._memo:
+                self._memo.move_to_end(normalized)
+                self.memo_hits += 1
+                return self._memo[normalized]
+            self.memo_misses += 1
+        return _NOT_MEMOIZED
+    
+    def _memo_put(self, entries: List[Tuple[str, Optional[SkuMatch]]]):
+        """Remember freshly scored names and write them through to sku_name_matches"""
+        if not self._memo_size or not entries:
+            return
+        with self._memo_lock:
+            for normalized, match in entries:
+                self._memo[normalized] = match
+                self._memo.move_to_end(normalized)
+            while len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
+        if self._persist_matches:
+            unique = dict(entries)
+            db.save_sku_name_matches(self.platform, [{
+                'normalized_name': normalized,
+                'sku_code': match.sku_code if match else None,
+                'confidence': match.score if match else 0,
+                'method': match.method if match else 'none',
+                'catalog_version': self.catalog_version,
+            } for normalized, match in unique.items()])
+    
+    def pin_match(self, scraped_name: str, sku_code: Optional[str], pinned_by: str) -> bool:
+        """Admin override: always map this name to sku_code (None = never match it)"""
+        if sku_code and sku_code not in self.all_sku_codes:
+            logger.error(f"❌ Cannot pin '{scraped_name}' to unknown {self.platform} SKU {sku_code}")
+            return False
+        normalized = self._normalize_name(scraped_name)
+        if not db.pin_sku_name_match(self.platform, normalized, sku_code, pinned_by, self.catalog_version):
+            return False
+        self._pinned[normalized] = SkuMatch(sku_code, 'pinned', 100) if sku_code else None
+        return True
+    
+    def log_match_summary(self):
+        lookups = self.memo_hits + self.memo_misses
+        if lookups:
+            logger.info(f"   🧠 SKU match memo: {self.memo_hits}/{lookups} names served without scoring "
+                        f"({self.memo_hits / lookups:.0%})")
+    
+    def _normalize_name(self, name: str) -> str:
+        """
+        Enhanced normalization: removes platform prefixes, promo text, and standardizes format
+        (shared, precompiled and memoized in name_normalizer.sku_key)
+        """
+        return sku_key(name)
     
     def find_sku_for_name(self, scraped_name: str, min_confidence: int = 85) -> Optional[str]:
         """
@@ -332,11 +494,24 @@ class SKUMapper:
         
         logger.debug(f"🔍 Looking for: '{scraped_name}' → normalized: '{normalized_scraped}'")
         
+        memoize = min_confidence == DEFAULT_MIN_CONFIDENCE
+        if memoize:
+            match = self._memo_get(normalized_scraped)
+            if match is not _NOT_MEMOIZED:
+                return match.sku_code if match else None
+        
+        match = self._score_normalized(normalized_scraped, min_confidence)
+        if memoize:
+            self._memo_put([(normalized_scraped, match)])
+        return match.sku_code if match else None
+    
+    def _score_normalized(self, normalized_scraped: str, min_confidence: int) -> Optional[SkuMatch]:
+        """exact → fuzzywuzzy extractOne → word overlap, for one already-normalized name"""
         # PRIORITY 1: Try exact match in master list
         if normalized_scraped in self.name_to_sku_map:
             sku_code = self.name_to_sku_map[normalized_scraped]
-            logger.debug(f"✅ Exact match: '{scraped_name}' → {sku_code}")
-            return sku_code
+            logger.debug(f"✅ Exact match: '{normalized_scraped}' → {sku_code}")
+            return SkuMatch(sku_code, 'exact', 100)
         
         # PRIORITY 2: Fuzzy matching if available
         if HAS_FUZZY:
@@ -350,33 +525,97 @@ class SKUMapper:
                 matched_name = best_match[0]
                 confidence = best_match[1]
                 sku_code = self.name_to_sku_map[matched_name]
-                logger.debug(f"🎯 Fuzzy match: '{scraped_name}' → {sku_code} (confidence: {confidence}%)")
-                return sku_code
+                logger.debug(f"🎯 Fuzzy match: '{normalized_scraped}' → {sku_code} (confidence: {confidence}%)")
+                return SkuMatch(sku_code, 'fuzzy', confidence)
         
         # PRIORITY 3: Basic substring matching fallback
-        normalized_scraped_words = set(normalized_scraped.split())
-        
-        best_match_score = 0
-        best_sku = None
+        match = self._overlap_match(normalized_scraped)
+        if match:
+            logger.debug(f"🔍 Substring match: '{normalized_scraped}' → {match.sku_code} (score: {match.score:.2f})")
+            return match
         
-        for master_name, sku_code in self.name_to_sku_map.items():
-            master_words = set(master_name.split())
-            
-            # Calculate word overlap
-            common_words = normalized_scraped_words.intersection(master_words)
-            if common_words:
-                score = len(common_words) / max(len(normalized_scraped_words), len(master_words))
-                if score > best_match_score and score >= 0.6:  # 60% word overlap
-                    best_match_score = score
-                    best_sku = sku_code
-        
-        if best_sku:
-            logger.debug(f"🔍 Substring match: '{scraped_name}' → {best_sku} (score: {best_match_score:.2f})")
-            return best_sku
-        
-        logger.debug(f"❌ No match found for: '{scraped_name}'")
+        logger.debug(f"❌ No match found for: '{normalized_scraped}'")
         return None
     
+    def _overlap_match(self, normalized: str) -> Optional[SkuMatch]:
+        """
+        PRIORITY 3 of find_sku_for_name: best word overlap >= 60%, first best wins.
+        Only catalog names sharing a token are scored, in catalog order.
+        """
+        words = set(normalized.split())
+        candidates = set()
+        for word in words:
+            candidates.update(self._token_index.get(word, ()))
+        best_score = 0
+        best_sku = None
+        for i in sorted(candidates):
+            master_words, sku_code = self._catalog_words[i]
+            common = words & master_words
+            if common:
+                score = len(common) / max(len(words), len(master_words))
+                if score > best_score and score >= 0.6:
+                    best_score = score
+                    best_sku = sku_code
+        return SkuMatch(best_sku, 'overlap', best_score) if best_sku else None
+
+    def map_names(self, names: List[str], min_confidence: int = DEFAULT_MIN_CONFIDENCE) -> List[Optional[SkuMatch]]:
+        """
+        Batch version of find_sku_for_name: one SkuMatch (or None) per name, same order.
+        Names are normalized once, exact hits come from the map, and everything else is
+        scored against the whole catalog in a single rapidfuzz cdist call
+        (token_sort_ratio, rounded like fuzzywuzzy); same exact → fuzzy → overlap precedence.
+        Memoized names skip all of that; newly scored ones are stored in one batch.
+        """
+        normalized = [self._normalize_name(n) if n and n.strip() else "" for n in names]
+        matches: List[Optional[SkuMatch]] = [None] * len(names)
+        memoize = min_confidence == DEFAULT_MIN_CONFIDENCE
+
+        pending, scored = [], []
+        for i, name in enumerate(names):
+            if not name or not name.strip():
+                continue
+            if memoize:
+                memo = self._memo_get(normalized[i])
+                if memo is not _NOT_MEMOIZED:
+                    matches[i] = memo
+                    continue
+            scored.append(i)
+            sku_code = self.name_to_sku_map.get(normalized[i])
+            if sku_code:
+                matches[i] = SkuMatch(sku_code, 'exact', 100)
+            else:
+                pending.append(i)
+
+        if not pending:
+            if memoize:
+                self._memo_put([(normalized[i], matches[i]) for i in scored])
+            return matches
+
+        if HAS_RAPIDFUZZ and self._catalog_names:
+            scores = rf_process.cdist(
+                [_fuzz_process(normalized[i]) for i in pending],
+                self._catalog_processed,
+                scorer=rf_fuzz.token_sort_ratio,
+                dtype=np.uint8,  # integer scores, like fuzzywuzzy, so ties break the same way
+            )
+            best = scores.argmax(axis=1)
+            for row, i in enumerate(pending):
+                score = int(scores[row, best[row]])
+                if score >= min_confidence:
+                    matches[i] = SkuMatch(self.name_to_sku_map[self._catalog_names[best[row]]], 'fuzzy', score)
+        elif HAS_FUZZY:
+            for i in pending:
+                best = process.extractOne(normalized[i], self._catalog_names, scorer=fuzz.token_sort_ratio)
+                if best and best[1] >= min_confidence:
+                    matches[i] = SkuMatch(self.name_to_sku_map[best[0]], 'fuzzy', best[1])
+
+        for i in pending:
+            if matches[i] is None:
+                matches[i] = self._overlap_match(normalized[i])
+        if memoize:
+            self._memo_put([(normalized[i], matches[i]) for i in scored])
+        return matches
+
     def map_scraped_items(self, scraped_items: List[Dict]) -> Dict:
         """
         Map scraped items to SKUs and identify matches/unknowns
@@ -394,11 +633,12 @@ class SKUMapper:
         unknown = []
         matched_skus = set()
         
-        for item in scraped_items:
+        matches = self.map_names([item.get('name', '') for item in scraped_items])
+        for item, match in zip(scraped_items, matches):
             scraped_name = item.get('name', '')
             price = item.get('price')
             
-            sku_code = self.find_sku_for_name(scraped_name)
+            sku_code = match.sku_code if match else None
             
             if sku_code:
                 matched.append({
@@ -440,22 +680,16 @@ class SKUMapper:
         """
         out_of_stock_skus = self.all_sku_codes - matched_skus
         
-        # Get details for out of stock items
-        out_of_stock_details = []
-        for sku_code in out_of_stock_skus:
-            # Find the SKU details from master list
-            for sku_data in self.master_skus:
-                if sku_data['sku_code'] == sku_code:
-                    out_of_stock_details.append({
-                        'sku_code': sku_code,
-                        'product_name': sku_data['product_name'],
-                        'category': sku_data.get('category', 'Unknown')
-                    })
-                    break
+        # Get details for out of stock items (all_sku_codes comes from master_skus, so every code has a record)
+        out_of_stock_details = [{
+            'sku_code': sku_code,
+            'product_name': self.sku_by_code[sku_code]['product_name'],
+            'category': self.sku_by_code[sku_code].get('category', 'Unknown')
+        } for sku_code in sorted(out_of_stock_skus)]
         
         return {
             'out_of_stock_skus': sorted(out_of_stock_skus),
-            'out_of_stock_details': sorted(out_of_stock_details, key=lambda x: x['sku_code']),
+            'out_of_stock_details': out_of_stock_details,
             'total_in_db': len(self.all_sku_codes),
             'total_scraped': len(matched_skus),
             'out_of_stock_count': len(out_of_stock_skus)
@@ -463,17 +697,22 @@ class SKUMapper:
     
     def get_master_sku_info(self, sku_code: str) -> Optional[Dict]:
         """Get full info for a SKU from master list"""
-        for sku in self.master_skus:
-            if sku['sku_code'] == sku_code:
-                return sku
-        return None
+        return self.sku_by_code.get(sku_code)
 # ------------------------------------------------------------------------------
 class StoreNameManager:
-    """Manages proper store name extraction and caching for GrabFood stores"""
+    """
+    Memory-resident store name index for GrabFood stores.
+    Built once from stores.name_override (admin renames), store_names.json and
+    URL slugs - in that order of precedence. No network I/O on lookup; titles are
+    only re-fetched by the offline `refresh-names` command.
+    """
 
-    def __init__(self):
+    NAMES_FILE = 'store_names.json'
+
+    def __init__(self, load_overrides: bool = True):
         self.name_cache: Dict[str, str] = {}
         self.store_cache: Dict[str, str] = {}
+        self.load_overrides = load_overrides
         self.headers = {
             'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
                            'AppleWebKit/537.36 (KHTML, like Gecko) '
@@ -488,6 +727,37 @@ class StoreNameManager:
             'Sec-Fetch-Site': 'none',
             'Cache-Control': 'max-age=0',
         }
+        self.refresh()
+
+    @staticmethod
+    def _url_key(url: str) -> str:
+        return url.rstrip('?').rstrip('/')
+
+    def refresh(self):
+        """(Re)build the index from store_names.json and stores.name_override"""
+        index: Dict[str, str] = {}
+
+        try:
+            with open(self.NAMES_FILE, 'r') as f:
+                store_names = json.load(f).get('store_names', {})
+            for url, entry in store_names.items():
+                name = (entry or {}).get('store_name') or ""
+                if name:
+                    index[self._url_key(url)] = self.clean_store_name(name)
+        except Exception as e:
+            logger.debug(f"Could not load predefined names: {e}")
+
+        overrides = 0
+        if self.load_overrides:
+            try:
+                for url, name in db.get_store_name_overrides().items():
+                    index[self._url_key(url)] = name.strip()
+                    overrides += 1
+            except Exception as e:
+                logger.debug(f"Could not load name overrides: {e}")
+
+        self.store_cache = index
+        logger.info(f"🏷️ Store name index: {len(index)} names ({overrides} overrides)")
 
     def clean_store_name(self, name: str) -> str:
         """Clean and standardize store names"""
@@ -549,51 +819,218 @@ class StoreNameManager:
             return 'unknown'
 
     def get_store_name(self, url: str) -> str:
-        """Get store name from predefined data or extract from URL"""
-        # Cache hit
-        if url in self.store_cache:
-            return self.store_cache[url]
+        """Get store name from the in-memory index, falling back to the URL slug"""
+        key = self._url_key(url)
+        name = self.store_cache.get(key)
+        if name is None:
+            name = self.extract_store_name_from_url(url)
+            self.store_cache[key] = name
+        return name
 
-        # Predefined names (store_names.json)
+    def refresh_names_from_pages(self, urls: List[str], overwrite: bool = False) -> int:
+        """
+        OFFLINE maintenance: fetch each store page, read its title and write the
+        name into store_names.json. Existing entries keep their curated
+        store_name unless overwrite=True (name_on_platform is always updated).
+
+        Returns:
+            Number of entries added or changed
+        """
         try:
-            with open('store_names.json', 'r') as f:
+            with open(self.NAMES_FILE, 'r') as f:
                 payload = json.load(f)
-                store_names = payload.get('store_names', {})
-            clean_url = url.rstrip('?').rstrip('/')
-            if clean_url in store_names:
-                name = store_names[clean_url].get('store_name') or ""
-                if name:
-                    name = self.clean_store_name(name)
-                    self.store_cache[url] = name
-                    return name
-        except Exception as e:
-            logger.debug(f"Could not load predefined names: {e}")
+        except Exception:
+            payload = {'store_names': {}, 'meta': {}}
+        store_names = payload.setdefault('store_names', {})
 
-        # Fallback to URL extraction
-        try:
-            # Optional online fetch for title
+        session = requests.Session()
+        session.headers.update(self.headers)
+        changed = 0
+
+        for i, url in enumerate(urls, 1):
+            key = self._url_key(url)
+            try:
+                try:
+                    resp = session.get(url, timeout=config.REQUEST_TIMEOUT)
+                except requests.exceptions.SSLError:
+                    resp = session.get(url, timeout=config.REQUEST_TIMEOUT, verify=False)
+                title = analyze_html(resp.text).title if resp.status_code == 200 else ""
+            except Exception as e:
+                logger.warning(f"   [{i}/{len(urls)}] ❌ {url}: {e}")
+                continue
+
+            # "Cocopan - Pacita Complex ⭐ 4.3" -> "Pacita Complex"
+            platform_name = title.split('⭐')[0].replace('Cocopan - ', '').replace('Cocopan ', '').strip()
+            if not platform_name:
+                logger.warning(f"   [{i}/{len(urls)}] ⚠️ No title for {url}")
+                continue
+
+            entry = store_names.get(key)
+            if entry is None:
+                store_names[key] = {
+                    'id': max([e.get('id', 0) for e in store_names.values()] or [0]) + 1,
+                    'store_name': f"COCOPAN {platform_name.upper()}",
+                    'name_on_platform': platform_name,
+                    'platform': self.get_platform_from_url(url),
+                }
+                changed += 1
+            elif entry.get('name_on_platform') != platform_name or overwrite:
+                entry['name_on_platform'] = platform_name
+                if overwrite:
+                    entry['store_name'] = f"COCOPAN {platform_name.upper()}"
+                changed += 1
+            logger.info(f"   [{i}/{len(urls)}] 🏷️ {platform_name}")
+
+        payload.setdefault('meta', {})['total_stores'] = len(store_names)
+        with open(self.NAMES_FILE, 'w') as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+
+        self.refresh()
+        return changed
+
+# ------------------------------------------------------------------------------
+# Tiered probing: cheap JSON API first, full browser render as fallback
+# ------------------------------------------------------------------------------
+class ProbeTier(ABC):
+    """
+    One stage of the tiered prober.
+    probe() returns a CheckResult when this tier can decide the store's status,
+    or None to escalate to the next (more expensive) tier.
+    """
+    name = "base"
+
+    @abstractmethod
+    def probe(self, url: str) -> Optional[CheckResult]:
+        ...
+
+
+class ApiProbeTier(ProbeTier):
+    """Merchant status straight from the portal.grab.com foodweb/v2 JSON API"""
+    name = "api"
+
+    def __init__(self, host_limiter: HostRateLimiter, pool_size: int = 4):
+        self.host_limiter = host_limiter
+        self.ph_latlng = config.GRAB_API_LATLNG
+        self.timeout = config.REQUEST_TIMEOUT
+        # One pooled keep-alive session shared by all worker threads
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max(2, pool_size))
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': config.USER_AGENT,
+            'Accept': 'application/json, text/plain, */*',
+            'Accept-Language': 'en-PH,en;q=0.9',
+            'Origin': 'https://food.grab.com',
+            'Connection': 'keep-alive',
+        })
+
+    def probe(self, url: str) -> Optional[CheckResult]:
+        merchant_id = extract_grabfood_merchant_id(url)
+        if not merchant_id:
+            logger.debug(f"   ⚡ API tier: no merchant ID in {url}")
+            return None
+
+        start_time = time.time()
+        timer = StageTimer()
+        for api_url in grabfood_api_urls(merchant_id, self.ph_latlng):
+            self.host_limiter.wait(api_url)
             try:
-                resp = requests.get(url, headers=self.headers, timeout=config.REQUEST_TIMEOUT)
-                if resp.status_code == 200:
-                    try:
-                        soup = BeautifulSoup(resp.text, 'html.parser')
-                        title = soup.title.string.strip() if soup.title and soup.title.string else ""
-                    except Exception:
-                        pass
+                with timer.stage('navigate'):
+                    resp = self.session.get(api_url, headers={'Referer': url}, timeout=self.timeout)
             except requests.exceptions.SSLError:
                 try:
-                    resp = requests.get(url, headers=self.headers, timeout=config.REQUEST_TIMEOUT, verify=False)
-                except Exception:
-                    resp = None
+                    with timer.stage('navigate'):
+                        resp = self.session.get(api_url, headers={'Referer': url}, timeout=self.timeout, verify=False)
+                except Exception as e:
+                    logger.debug(f"   ⚡ API tier request failed: {e}")
+                    continue
+            except Exception as e:
+                logger.debug(f"   ⚡ API tier request failed: {e}")
+                continue
 
-            name = self.extract_store_name_from_url(url)
-            self.store_cache[url] = name
-            return name
-        except Exception as e:
-            logger.debug(f"Name extraction fallback failed: {e}")
-            name = self.extract_store_name_from_url(url)
-            self.store_cache[url] = name
-            return name
+            if resp.status_code in (401, 403, 429):
+                # Blocked / rate limited - a browser render may still get through
+                logger.info(f"   ⚡ API tier blocked (HTTP {resp.status_code}) → escalating")
+                return None
+            if resp.status_code != 200:
+                continue
+
+            try:
+                with timer.stage('parse'):
+                    payload = resp.json()
+                    api_status, rating, _ = extract_status_from_api_json(payload)
+                    merchant = find_api_merchant(payload)
+            except ValueError:
+                continue
+            if not api_status:
+                continue
+
+            response_time = int((time.time() - start_time) * 1000)
+            status_upper = str(api_status).upper()
+            rating_text = f", rating {rating:.1f}★" if rating is not None else ""
+
+            # Same rule as _check_next_data: ACTIVE only means the merchant is listed, so a
+            # closed flag decides OFFLINE, ONLINE needs opening hours saying open right now,
+            # and anything else goes to the browser tier
+            closed = merchant_closed_signals(merchant)
+            if closed:
+                return CheckResult(
+                    status=StoreStatus.OFFLINE,
+                    response_time=response_time,
+                    message=f"API {', '.join(closed)}{rating_text}",
+                    confidence=0.9,
+                    stage="api_json",
+                    timings=timer.as_dict()
+                )
+            if merchant_open_now(merchant):
+                return CheckResult(
+                    status=StoreStatus.ONLINE,
+                    response_time=response_time,
+                    message=f"API status={status_upper}, open now{rating_text}",
+                    confidence=0.9,
+                    stage="api_json",
+                    timings=timer.as_dict()
+                )
+
+            logger.info(f"   ⚡ API tier: status '{api_status}' without an open/closed flag → escalating")
+            return None
+
+        return None
+
+
+class BrowserProbeTier(ProbeTier):
+    """Full Selenium render of the store page using a pooled driver"""
+    name = "browser"
+
+    def __init__(self, monitor: 'GrabFoodMonitor'):
+        self.monitor = monitor
+
+    def probe(self, url: str) -> Optional[CheckResult]:
+        self.monitor.host_limiter.wait(url)
+        pool = self.monitor.driver_pool
+        timer = StageTimer()
+        acquire_start = time.perf_counter()
+        with pool.acquire() as driver:
+            timer.add('acquire', (time.perf_counter() - acquire_start) * 1000)
+            start = time.time()
+            with self.monitor.watchdog.watch(driver, label=url) as watch:
+                result = self.monitor.check_grabfood_store(url, driver=driver, timer=timer)
+                finished = time.monotonic()
+            if not watch.expired:
+                self.monitor.save_page_artifact(url, driver, result)
+                return result
+            # Chrome was killed: the pool swaps in a fresh driver on release
+            pool.retire(driver)
+            if not watch.killed_before(finished):
+                return result  # the probe had already finished when the kill landed
+            return CheckResult(
+                status=StoreStatus.TIMEOUT,
+                response_time=int((time.time() - start) * 1000),
+                message=f"Probe exceeded {self.monitor.watchdog.deadline:.0f}s deadline - Chrome restarted",
+                confidence=0.1,
+                stage="watchdog",
+                timings=timer.as_dict()
+            )
 
 # ------------------------------------------------------------------------------
 # Enhanced GrabFood Monitor with Client Email Integration (EXISTING - UNCHANGED)
@@ -604,6 +1041,51 @@ class StoreNameManager:
         # ------------------------------------------------------------------------------
 # Enhanced GrabFood Monitor with Selenium Scraping
 # ------------------------------------------------------------------------------
+class RetryScheduler:
+    """
+    Min-heap of (next_attempt_time, url) for blocked stores.
+    Each store backs off exponentially with jitter, independently of the others.
+    """
+
+    def __init__(self, base_delay: float = None, max_delay: float = None, max_attempts: int = None):
+        self.base_delay = config.BLOCKED_RETRY_BASE_DELAY if base_delay is None else base_delay
+        self.max_delay = config.BLOCKED_RETRY_MAX_DELAY if max_delay is None else max_delay
+        self.max_attempts = config.BLOCKED_RETRY_MAX_ATTEMPTS if max_attempts is None else max_attempts
+        self.attempts: Dict[str, int] = {}
+        self._heap: List[Tuple[float, str]] = []
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number `attempt` (1-based), with 50-100% jitter"""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return delay * random.uniform(0.5, 1.0)
+
+    def schedule(self, url: str, now: float) -> bool:
+        """Queue the next retry for url; False when it has used up its attempts"""
+        attempt = self.attempts.get(url, 0) + 1
+        if attempt > self.max_attempts:
+            return False
+        self.attempts[url] = attempt
+        heapq.heappush(self._heap, (now + self.backoff(attempt), url))
+        return True
+
+    def pop_due(self, now: float) -> Optional[str]:
+        if self._heap and self._heap[0][0] <= now:
+            return heapq.heappop(self._heap)[1]
+        return None
+
+    def next_due_in(self, now: float) -> Optional[float]:
+        return max(0.0, self._heap[0][0] - now) if self._heap else None
+
+    def drain(self) -> List[str]:
+        """Drop everything still waiting (deadline reached)"""
+        urls = [url for _, url in self._heap]
+        self._heap = []
+        return urls
+
+    def __len__(self):
+        return len(self._heap)
+
+
 class GrabFoodMonitor:
     """GrabFood monitor using Selenium scraping with immediate client email alerts"""
 
@@ -613,13 +1095,38 @@ class GrabFoodMonitor:
         self.timezone = config.get_timezone()
         self.stats = {}
         self.previous_offline_stores = set()
-        self.driver: Optional[webdriver.Chrome] = None
-        
-        # Setup Selenium WebDriver
-        self._setup_driver()
+        self._stats_lock = threading.Lock()
+
+        # Lean Chrome profile (resource blocking + eager load) and bandwidth accounting
+        self.driver_profile = profile_for('monitor')
+        self.profile_store = profile_store_for('monitor')
+        self.resource_meter = ResourceMeter('monitor')
+
+        # Setup Selenium WebDriver pool (MONITOR_WORKERS parallel probes)
+        self.driver_lifecycle = DriverLifecycle(self._setup_driver, 'monitor')
+        self.driver_pool = DriverPool(self._setup_driver, size=config.MONITOR_WORKERS,
+                                      lifecycle=self.driver_lifecycle)
+        self.watchdog = ProbeWatchdog(config.PROBE_DEADLINE)
+        self.latency = LatencyTracker()
+        self.cycle_timings = CycleTimings()
+        self.evidence = EvidencePolicy()
+        self._run_id: Optional[uuid.UUID] = None
+        self.host_limiter = HostRateLimiter(config.HOST_MIN_INTERVAL, config.HOST_INTERVAL_JITTER)
+
+        # Deadline-aware planning; _skip_reprobes is set when the cycle falls behind
+        self.planner = CyclePlanner(platform="grabfood")
+        self._skip_reprobes = False
+
+        # Tiered prober: JSON API fast path, Selenium render as fallback
+        self.probe_tiers: List[ProbeTier] = []
+        if config.PROBE_API_FIRST:
+            self.probe_tiers.append(ApiProbeTier(self.host_limiter, pool_size=self.driver_pool.size))
+        self.probe_tiers.append(BrowserProbeTier(self))
 
         logger.info(f"🛒 GrabFood Monitor initialized (Selenium-based checking)")
         logger.info(f"   📋 {len(self.store_urls)} GrabFood stores to monitor")
+        logger.info(f"   🧵 {self.driver_pool.size} concurrent Chrome workers")
+        logger.info(f"   🪜 Probe tiers: {' → '.join(t.name for t in self.probe_tiers)}")
 
         if HAS_ADMIN_ALERTS:
             logger.info(f"   📧 Admin alerts enabled")
@@ -628,8 +1135,8 @@ class GrabFoodMonitor:
         else:
             logger.warning(f"   ⚠️ Client alerts NOT available - offline notifications disabled")
 
-    def _setup_driver(self):
-        """Setup Chrome WebDriver for Selenium scraping"""
+    def _setup_driver(self) -> webdriver.Chrome:
+        """Create one Chrome WebDriver for Selenium scraping (pool factory)"""
         chrome_options = Options()
         chrome_options.add_argument('--headless=new')
         chrome_options.add_argument('--no-sandbox')
@@ -645,12 +1152,19 @@ class GrabFoodMonitor:
         chrome_options.add_argument(f'user-agent={random.choice(user_agents)}')
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
+        apply_to_options(chrome_options, self.driver_profile)
+        profile_slot = self.profile_store.prepare(chrome_options)
 
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            driver = webdriver.Chrome(options=chrome_options)
+            self.profile_store.bind(profile_slot, driver)
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            set_driver_timeouts(driver)
+            apply_to_driver(driver, self.driver_profile)
             logger.info("✓ Chrome WebDriver ready")
+            return driver
         except Exception as e:
+            self.profile_store.failed(profile_slot)
             logger.error(f"❌ Failed to initialize Chrome WebDriver: {e}")
             logger.error("   Make sure Chrome and chromedriver are installed!")
             raise
@@ -676,15 +1190,18 @@ class GrabFoodMonitor:
             logger.error(f"Failed to load URLs: {e}")
             return []
     
-    def _log_html_content(self, url: str, title: str, visible_text: str, html_length: int):
+    def _log_html_content(self, url: str, title: str, visible_text: str, html_length: int,
+                          transfer_bytes: int = None, reason: str = "debug"):
         """
-        ✨ NEW: Log HTML content for debugging
-        Shows what we're actually seeing in the page
+        Full dump of what we saw on the page. Only called for probes the
+        EvidencePolicy picks (non-ONLINE, low confidence, sampled or EVIDENCE_DEBUG).
         """
-        logger.info(f"   📄 HTML Content Analysis:")
+        if transfer_bytes is None:
+            transfer_bytes = html_length
+        logger.info(f"   📄 HTML Content Analysis ({reason}):")
         logger.info(f"      URL: {url}")
         logger.info(f"      Page Title: '{title}'")
-        logger.info(f"      HTML Length: {html_length} bytes")
+        logger.info(f"      HTML Length: {html_length} bytes (transferred {transfer_bytes})")
         logger.info(f"      Visible Text Length: {len(visible_text)} chars")
         logger.info(f"   📝 First 800 chars of visible text:")
         logger.info(f"      {'-'*60}")
@@ -697,104 +1214,88 @@ class GrabFoodMonitor:
 
     def _check_for_closed_keywords(self, title_lower: str, visible_lower: str) -> Tuple[bool, Optional[str]]:
         """
-        ✨ UPDATED: Combined check for ALL closed/terminated/offline keywords
+        Combined check for ALL closed/terminated/offline keywords (CLOSED_KEYWORDS),
+        one precompiled regex search over the title, then the first 1000 chars of text
         Returns: (is_closed, keyword_found)
         """
-        # ALL keywords that indicate store is closed/terminated/offline
-        closed_keywords = [
-            'closed',
-            'currently closed',
-            'temporarily closed',
-            'terminated',
-            'permanently closed',
-            'closed permanently',
-            'no longer available',
-            'not available anymore',
-            'store has closed',
-            'not available',
-            'unavailable',
-            'not accepting orders',
-            'offline',
-            'store is closed',
-            'temporarily unavailable'
-        ]
-        
-        # Check in title first
-        for keyword in closed_keywords:
-            if keyword in title_lower:
-                logger.info(f"   🔍 Found '{keyword}' in TITLE → Store is CLOSED")
-                return True, keyword
-        
-        # Check in first 1000 chars of visible text
-        first_1000 = visible_lower[:1000]
-        for keyword in closed_keywords:
-            if keyword in first_1000:
-                logger.info(f"   🔍 Found '{keyword}' in visible text → Store is CLOSED")
-                return True, keyword
-        
-        # No closed keywords found
-        logger.info(f"   🔍 NO closed keywords found → Store appears OPEN")
+        match = CLOSED_KEYWORDS_RE.search(title_lower)
+        if match:
+            logger.debug(f"   🔍 Found '{match.group(0)}' in TITLE → Store is CLOSED")
+            return True, match.group(0)
+
+        match = CLOSED_KEYWORDS_RE.search(visible_lower, 0, 1000)
+        if match:
+            logger.debug(f"   🔍 Found '{match.group(0)}' in visible text → Store is CLOSED")
+            return True, match.group(0)
+
+        logger.debug(f"   🔍 NO closed keywords found → Store appears OPEN")
         return False, None
 
-    def _is_error_page(self, title_lower: str, visible_lower: str, html: str) -> bool:
-        """Check if page is an error page or blocked"""
-        error_indicators = [
-            ('oops' in title_lower and 'something went wrong' in title_lower),
-            ('404' in title_lower or 'not found' in title_lower),
+    def _error_page_status(self, title_lower: str, visible_lower: str, html: str = "") -> Optional[StoreStatus]:
+        """
+        Check if page is an error page or blocked.
+        Returns BLOCKED for bot walls / access errors, ERROR for broken pages, None otherwise.
+        """
+        html_lower = html.lower() if html else visible_lower
+        blocked_indicators = [
             ('403' in title_lower or 'forbidden' in title_lower),
             ('401' in title_lower or 'unauthorized' in title_lower),
-            ('cloudflare' in html.lower() and 'checking your browser' in html.lower()),
+            ('cloudflare' in html_lower and 'checking your browser' in html_lower),
             ('access denied' in visible_lower and len(visible_lower) < 500)
         ]
-        
+        error_indicators = [
+            ('oops' in title_lower and 'something went wrong' in title_lower),
+            ('404' in title_lower or 'not found' in title_lower),
+        ]
+
+        if any(blocked_indicators):
+            logger.debug(f"   ⚠️ Blocked/denied page detected")
+            return StoreStatus.BLOCKED
         if any(error_indicators):
-            logger.info(f"   ⚠️ Error page detected in HTML")
-            return True
-        return False
+            logger.debug(f"   ⚠️ Error page detected in HTML")
+            return StoreStatus.ERROR
+        return None
 
-    def _check_next_data(self, soup: BeautifulSoup, store_name: str, url: str, response_time: int) -> Optional[CheckResult]:
+    def _check_next_data(self, page: PageAnalysis, store_name: str, url: str, response_time: int) -> Optional[CheckResult]:
         """Extract status from __NEXT_DATA__ JSON"""
         try:
-            next_data = soup.find('script', {'id': '__NEXT_DATA__'})
-            if not next_data or not next_data.string:
+            if page.next_data is None:
                 logger.debug(f"   📊 __NEXT_DATA__ not found in page")
                 return None
             
-            data = json.loads(next_data.string)
-            props = data.get('props', {}).get('pageProps', {})
-            
-            if 'merchant' not in props:
+            merchant = page.merchant
+            if not merchant:
                 logger.debug(f"   📊 __NEXT_DATA__ found but no merchant data")
                 return None
             
-            merchant = props['merchant']
             actual_name = merchant.get('name', store_name)
+            merchant_status = str(merchant.get('status') or '').upper()
+            closed = merchant_closed_signals(merchant)
             
-            # Check various status indicators
-            is_closed = merchant.get('isClosed', False)
-            is_available = merchant.get('available', True)
-            merchant_status = merchant.get('status', '').upper()
-            
-            logger.info(f"   📊 __NEXT_DATA__ found: status={merchant_status}, isClosed={is_closed}, available={is_available}")
+            logger.debug(f"   📊 __NEXT_DATA__ found: status={merchant_status}, closed signals={closed}")
             
-            # Determine status
-            if merchant_status == 'INACTIVE' or is_closed or not is_available:
+            # Only a closed signal is conclusive. status=ACTIVE just means the merchant is
+            # listed - a closed banner can still be up, so an open verdict stays below
+            # CLASSIFIER_MIN_CONFIDENCE and the keyword stage gets its say
+            if closed:
                 status = StoreStatus.OFFLINE
-                message = f"__NEXT_DATA__: status={merchant_status}, isClosed={is_closed}, available={is_available}"
+                message = f"__NEXT_DATA__: {', '.join(closed)}"
+                confidence = 0.95
             else:
                 status = StoreStatus.ONLINE
                 message = f"__NEXT_DATA__: status={merchant_status}, store is accepting orders"
+                explicit = merchant_status == 'ACTIVE' or 'isClosed' in merchant or 'available' in merchant \
+                    or merchant_open_now(merchant)
+                confidence = 0.8 if explicit else 0.6
             
             return CheckResult(
                 status=status,
                 response_time=response_time,
                 message=message,
-                confidence=0.95
+                confidence=confidence,
+                stage="next_data"
             )
             
-        except json.JSONDecodeError as e:
-            logger.debug(f"   ⚠️ __NEXT_DATA__ JSON parse error: {e}")
-            return None
         except Exception as e:
             logger.debug(f"   ⚠️ Error parsing __NEXT_DATA__: {e}")
             return None
@@ -821,89 +1322,156 @@ class GrabFoodMonitor:
                 status=StoreStatus.ONLINE,
                 response_time=response_time,
                 message=f"HTML title shows rating: {rating}★ - store appears active",
-                confidence=0.75
+                confidence=0.75,
+                stage="html_title"
             )
             
         except Exception as e:
             logger.debug(f"   ⚠️ HTML parsing error: {e}")
             return None
     
-    def check_grabfood_store(self, url: str, retry_count: int = 0) -> CheckResult:
+    def _classify_page(self, page: PageAnalysis, page_title: str, url: str, response_time: int) -> CheckResult:
         """
-        ✨ UPDATED CHECK LOGIC:
-        1. FIRST: Check if NO "closed" keywords found → ONLINE (85% confidence)
-        2. Check if "closed" keywords found → OFFLINE (95% confidence)
-        3. Check for error pages → ERROR/BLOCKED
-        4. Try __NEXT_DATA__ extraction → ONLINE/OFFLINE (95% confidence)
-        5. Try HTML parsing fallback → ONLINE (75% confidence)
+        Tiered decision pipeline, cheapest structured signal first. Stops at the
+        first stage whose result reaches CLASSIFIER_MIN_CONFIDENCE; otherwise the
+        most confident result seen wins. result.stage records the decider.
         """
+        title_lower = page_title.lower()
+        visible_lower = page.visible_text.lower()
+        store_name = self.name_manager.get_store_name(url)
+
+        def error_page_stage() -> Optional[CheckResult]:
+            status = self._error_page_status(title_lower, visible_lower)
+            if status is None:
+                return None
+            return CheckResult(status=status, response_time=response_time,
+                               message=f"Error page: '{page_title[:80]}'", confidence=0.9, stage="error_page")
+
+        def keyword_stage() -> CheckResult:
+            is_closed, found_keyword = self._check_for_closed_keywords(title_lower, visible_lower)
+            if is_closed:
+                return CheckResult(status=StoreStatus.OFFLINE, response_time=response_time,
+                                   message=f"Store is closed (found keyword: '{found_keyword}')",
+                                   confidence=0.95, stage="keywords")
+            return CheckResult(status=StoreStatus.ONLINE, response_time=response_time,
+                               message="No closed indicators found - store appears open",
+                               confidence=0.85, stage="keywords")
+
+        stages = (
+            lambda: self._check_next_data(page, store_name, url, response_time),
+            error_page_stage,
+            keyword_stage,
+        )
+
+        best: Optional[CheckResult] = None
+        for stage in stages:
+            result = stage()
+            if result is None:
+                continue
+            if result.confidence >= config.CLASSIFIER_MIN_CONFIDENCE:
+                return result
+            if best is None or result.confidence > best.confidence:
+                best = result
+        return best
+
+    def check_grabfood_store(self, url: str, retry_count: int = 0, driver=None,
+                             timer: Optional[StageTimer] = None) -> CheckResult:
+        """
+        Load the store page and classify it with _classify_page:
+        1. __NEXT_DATA__ merchant JSON → OFFLINE (95%) on a closed flag; open flags (80%) fall through
+        2. Error page detection → BLOCKED/ERROR
+        3. Closed keywords found → OFFLINE (95%), none found → ONLINE (85%)
+        Stage durations accumulate on timer (across re-probes) and land in result.timings.
+        Without a driver, one is borrowed from the pool for the call (pooled drivers are
+        recycled and respawned, so none is held on to between probes).
+        """
+        if driver is None:
+            with self.driver_pool.acquire() as pooled:
+                return self.check_grabfood_store(url, retry_count, driver=pooled, timer=timer)
+
         start_time = time.time()
         max_retries = 2
+        timer = timer or StageTimer()
 
         try:
             # Load page with Selenium
-            logger.info(f"   🌐 Loading page: {url}")
-            self.driver.get(url)
-            time.sleep(3)  # Wait for page to load
-            
-            # Get page source
-            html = self.driver.page_source
-            soup = BeautifulSoup(html, 'html.parser')
+            logger.debug(f"   🌐 Loading page: {url}")
+            with timer.stage('navigate'):
+                load_page(driver, url)
+            with timer.stage('wait'):
+                # __NEXT_DATA__ and the rated title arrive with the server HTML (and the eager
+                # load returns at DOMContentLoaded), so wait for the client-rendered store body
+                wait_until_ready(driver, [next_data_present, store_content_rendered],
+                                 timeout=config.MONITOR_READY_TIMEOUT, label="store page")
             
-            # Get visible text
-            soup_copy = BeautifulSoup(html, 'html.parser')
-            for tag in soup_copy(["script", "style", "meta", "link"]):
-                tag.decompose()
-            visible_text = soup_copy.get_text(separator='\n', strip=True)
+            # Extract title/text/merchant inside the browser; ship page_source only as a fallback
+            page = extract_from_driver(driver, timer=timer)
+            if page is None:
+                logger.debug(f"   ↩️ In-browser extractor failed, falling back to page_source")
+                with timer.stage('extract'):
+                    page_source = driver.page_source
+                with timer.stage('parse'):
+                    page = analyze_html(page_source)
+            visible_text = page.visible_text
+            self.resource_meter.record_page(driver)
             
             # Calculate response time
             response_time = int((time.time() - start_time) * 1000)
             
-            # Get page title
-            page_title = self.driver.title
-            
-            # ✨ LOG EVERYTHING WE FETCHED
-            self._log_html_content(url, page_title, visible_text, len(html))
-            
-            # Get lowercase versions for checking
-            title_lower = page_title.lower()
-            visible_lower = visible_text.lower()
+            # Get page title (rendered title can differ from the markup one)
+            page_title = page.title or driver.title
             
-            # ✅ PRIORITY 1 & 2: Check for closed keywords
-            is_closed, found_keyword = self._check_for_closed_keywords(title_lower, visible_lower)
-            
-            if is_closed:
-                # Found "closed" keywords → Store is OFFLINE
-                return CheckResult(
-                    status=StoreStatus.OFFLINE,
-                    response_time=response_time,
-                    message=f"Store is closed (found keyword: '{found_keyword}')",
-                    confidence=0.95
-                )
-            else:
-                # NO "closed" keywords found → Store is ONLINE!
-                return CheckResult(
-                    status=StoreStatus.ONLINE,
-                    response_time=response_time,
-                    message="No closed indicators found - store appears open",
-                    confidence=0.85
-                )
+            with timer.stage('classify'):
+                result = self._classify_page(page, page_title, url, response_time)
+            result.timings = timer.as_dict()
+            result.details = {'title': page_title[:80], 'html_bytes': page.html_length,
+                              'xfer_bytes': page.transfer_bytes, 'text_chars': len(visible_text)}
+
+            # Full text only where someone will want to look at it
+            reason = self.evidence.capture_reason(result.status.value, result.confidence)
+            if reason:
+                self._log_html_content(url, page_title, visible_text, page.html_length, page.transfer_bytes, reason)
+                result.details['full_text'] = reason
+
+            return result
             
         except Exception as e:
             response_time = int((time.time() - start_time) * 1000)
             logger.error(f"   ❌ Error checking store: {e}")
             
-            if retry_count < max_retries:
+            # A killed driver will only fail again; the pool replaces it after this probe
+            if retry_count < max_retries and not self._skip_reprobes and not self.watchdog.expired(driver):
                 time.sleep(2)
-                return self.check_grabfood_store(url, retry_count + 1)
+                return self.check_grabfood_store(url, retry_count + 1, driver=driver, timer=timer)
             
             return CheckResult(
                 status=StoreStatus.ERROR,
                 response_time=response_time,
                 message=f"Exception: {str(e)[:100]}",
-                confidence=0.2
+                confidence=0.2,
+                stage="exception",
+                timings=timer.as_dict()
             )
 
+    def save_page_artifact(self, url: str, driver, result: CheckResult):
+        """
+        Keep the exact page behind OFFLINE / BLOCKED / ERROR verdicts (ONLINE is sampled).
+        Called once the verdict is final and outside the watchdog window, so the
+        page_source pull never counts against the probe deadline.
+        """
+        if result.stage == "exception" or not artifact_store.wants(result.status.value):
+            return
+        try:
+            body = driver.page_source
+        except Exception as e:
+            logger.debug(f"   Could not read page_source for the artifact: {e}")
+            return
+        artifact_store.save('monitor', url, body, result.status.value,
+                            store_id=store_registry.lookup(url), run_id=self._run_id,
+                            meta={'stage': result.stage, 'confidence': result.confidence},
+                            sampled=True)
+        result.details['artifact'] = True
+
     def check_all_grabfood_stores_with_client_alerts(self):
         """Check stores using Selenium and send immediate client emails when offline"""
         
@@ -917,18 +1485,22 @@ class GrabFoodMonitor:
             effective_at = now.replace(minute=0, second=0, microsecond=0)
         
         run_id = uuid.uuid4()
+        self._run_id = run_id
 
         self.stats = {
             'cycle_start': datetime.now(),
             'cycle_end': None,
             'total_stores': len(self.store_urls),
             'checked': 0, 'online': 0, 'offline': 0, 'blocked': 0, 'errors': 0, 'unknown': 0,
-            'retries': 0, 'retry_successes': 0,
+            'retries': 0, 'retry_successes': 0, 'retries_skipped': 0, 'timeouts': 0,
             'newly_offline': 0, 'newly_online': 0
         }
 
+        self.resource_meter.reset()
+        self.latency.reset()
+        self.cycle_timings.reset()
+
         current_time = config.get_current_time()
-        target_hour = effective_at.hour
         
         logger.info(f"🛒 GRABFOOD MONITORING (SELENIUM) with CLIENT ALERTS at {current_time.strftime('%Y-%m-%d %H:%M:%S %Z')}")
         logger.info(f"📋 Checking {len(self.store_urls)} GrabFood stores")
@@ -936,86 +1508,29 @@ class GrabFoodMonitor:
         logger.info(f"💾 Data will be saved to: {effective_at.strftime('%Y-%m-%d %H:00:00')}")
         logger.info(f"✨ Logic: NO 'closed' keywords = ONLINE | 'closed' keywords found = OFFLINE")
 
-        all_results: List[Dict[str, Any]] = []
-        blocked_stores: List[str] = []
-        current_offline_stores = set()
-
-        # First pass - check all stores
-        for i, url in enumerate(self.store_urls, 1):
-            current_hour = config.get_current_time().hour
-            if should_skip_store_by_time(url, current_hour):
-                continue
-
-            result = self._check_single_store_safe(url, i, len(self.store_urls))
-            if result:
-                all_results.append(result)
-                
-                if result['result'].status == StoreStatus.OFFLINE:
-                    current_offline_stores.add(url)
-                elif result['result'].status == StoreStatus.BLOCKED:
-                    blocked_stores.append(url)
-
-            # Delay between requests
-            if i < len(self.store_urls):
-                time.sleep(random.uniform(3, 5))
-
-        # Retry logic for blocked stores
-        retry_round = 1
-        max_retry_rounds = 5
-
-        while blocked_stores and retry_round <= max_retry_rounds:
-            current_time = config.get_current_time()
-            minutes_remaining = 60 - current_time.minute
-
-            if current_time.hour != target_hour and current_time.minute >= 0:
-                logger.info(f"⏰ Reached target hour {target_hour}:00, stopping retries")
-                break
-
-            if minutes_remaining < 5:
-                logger.info(f"⏰ Only {minutes_remaining} minutes until {target_hour}:00, stopping retries")
-                break
-
-            logger.info(f"🔄 Retry round {retry_round}: {len(blocked_stores)} blocked stores")
-
-            retry_delay = min(180, 60 * retry_round)
-            logger.info(f"   ⏱️ Waiting {retry_delay} seconds before retry...")
-            time.sleep(retry_delay)
-
-            newly_unblocked = []
-            still_blocked = []
-
-            for url in blocked_stores:
-                logger.info(f"   🔄 Retrying blocked store: {url}")
-
-                for i, result_data in enumerate(all_results):
-                    if result_data['url'] == url:
-                        retry_result = self._check_single_store_safe(url, retry_round, len(blocked_stores), is_retry=True)
-                        if retry_result:
-                            self.stats['retries'] += 1
-
-                            if retry_result['result'].status != StoreStatus.BLOCKED:
-                                all_results[i] = retry_result
-                                newly_unblocked.append(url)
-                                self.stats['retry_successes'] += 1
-                                
-                                if retry_result['result'].status == StoreStatus.OFFLINE:
-                                    current_offline_stores.add(url)
-                                else:
-                                    current_offline_stores.discard(url)
-                                    
-                                logger.info(f"   ✅ Retry successful: {retry_result['name']} now {retry_result['result'].status.value}")
-                            else:
-                                still_blocked.append(url)
-                                logger.info(f"   🚫 Still blocked: {retry_result['name']}")
-                        break
-
-                time.sleep(random.uniform(2, 5))
-
-            blocked_stores = still_blocked
-            retry_round += 1
-
-            if newly_unblocked:
-                logger.info(f"   🎉 Unblocked {len(newly_unblocked)} stores in round {retry_round-1}")
+        current_hour = config.get_current_time().hour
+        work = [(i, url) for i, url in enumerate(self.store_urls, 1)
+                if not should_skip_store_by_time(url, current_hour)]
+
+        # Plan workers and order so the cycle finishes before the hour boundary
+        plan = self.planner.plan(
+            work, now,
+            max_workers=max(config.MONITOR_MAX_WORKERS, self.driver_pool.size),
+            hot_urls=self.previous_offline_stores,
+            host_interval=config.HOST_MIN_INTERVAL + config.HOST_INTERVAL_JITTER / 2,
+        )
+        if plan.workers > self.driver_pool.size:
+            plan.workers = min(plan.workers, self.driver_pool.grow(plan.workers))
+        self._skip_reprobes = not plan.allow_retries
+        CyclePlanner.log_plan(plan)
+
+        # Main pass and blocked-store retries share the driver pool
+        all_results: List[Dict[str, Any]] = self._run_probe_cycle(plan, work, len(self.store_urls))
+        self._skip_reprobes = False
+        current_offline_stores = {r['url'] for r in all_results if r['result'].status == StoreStatus.OFFLINE}
+
+        CyclePlanner.log_report(plan, {r['url']: r['result'].response_time for r in all_results},
+                                self.stats['retries'], self.stats['retries_skipped'])
 
         # DETECT STATE CHANGES AND SEND IMMEDIATE CLIENT ALERTS
         newly_offline_stores = current_offline_stores - self.previous_offline_stores
@@ -1040,7 +1555,8 @@ class GrabFoodMonitor:
             
             if newly_offline_alerts:
                 logger.info(f"🚨 IMMEDIATE ALERT: {len(newly_offline_alerts)} stores just went offline!")
-                success = client_alerts.send_immediate_offline_alert(newly_offline_alerts, len(self.store_urls))
+                with metrics.time('cocopan_alert_send_seconds', kind='immediate_offline'):
+                    success = client_alerts.send_immediate_offline_alert(newly_offline_alerts, len(self.store_urls))
                 if success:
                     logger.info("✅ Immediate offline alert sent to clients")
                 else:
@@ -1053,7 +1569,10 @@ class GrabFoodMonitor:
         self._send_client_alerts(all_results)
 
         # Save results
+        persist_start = time.perf_counter()
         self._save_all_results(all_results, effective_at, run_id)
+        persist_ms = int((time.perf_counter() - persist_start) * 1000)
+        self.cycle_timings.record({'persist': persist_ms})
 
         # Admin alerts
         if HAS_ADMIN_ALERTS:
@@ -1062,6 +1581,8 @@ class GrabFoodMonitor:
         # Final stats
         self.stats['cycle_end'] = datetime.now()
         duration = (self.stats['cycle_end'] - self.stats['cycle_start']).total_seconds()
+        self._save_cycle_metrics(run_id, effective_at, plan.workers, duration, persist_ms, len(all_results))
+        self._export_metrics(duration, plan.workers)
 
         logger.info("=" * 70)
         logger.info(f"✅ GRABFOOD MONITORING COMPLETED in {duration/60:.1f} minutes")
@@ -1073,7 +1594,13 @@ class GrabFoodMonitor:
         logger.info(f"   🚫 Blocked: {self.stats['blocked']}")
         logger.info(f"   ⚠️ Errors: {self.stats['errors']}")
         logger.info(f"   ❓ Unknown: {self.stats['unknown']}")
+        logger.info(f"   ⏱️ Timeouts: {self.stats['timeouts']} (Chrome respawns so far: {self.driver_pool.respawns})")
         logger.info(f"   🔄 Retries: {self.stats['retries']} (successes: {self.stats['retry_successes']})")
+        self.latency.log_summary()
+        self._log_stage_summary()
+        self.driver_lifecycle.log_summary()
+        self.resource_meter.log_summary()
+        artifact_store.log_summary()
         if self.stats['newly_offline'] > 0:
             logger.info(f"   🚨 CLIENT ALERTS: Sent immediate alerts for {self.stats['newly_offline']} newly offline stores")
 
@@ -1083,38 +1610,167 @@ class GrabFoodMonitor:
         """Legacy method - calls the new client alerts version"""
         return self.check_all_grabfood_stores_with_client_alerts()
 
+    def _run_probe_cycle(self, plan: CyclePlan, work: List[Tuple[int, str]],
+                         total: int) -> List[Dict[str, Any]]:
+        """
+        Probe stores in plan order across plan.workers drivers, retrying BLOCKED
+        stores from a backoff heap as soon as they are due - interleaved with the
+        main pass rather than in rounds after it. Re-probes are dropped once the
+        remaining main-pass estimate no longer fits before plan.deadline.
+        Returns one result per URL in the original store order (`work`), so
+        downstream state-diffs, alerts and saves see the same sequence as a
+        serial pass.
+        """
+        if not work:
+            return []
+
+        results_by_url: Dict[str, Dict[str, Any]] = {}
+        retries = RetryScheduler()
+        retry_deadline = plan.deadline
+        pending_main = list(plan.order)
+        pending_main.reverse()  # pop() from the end keeps plan order
+        pending_ms = sum(plan.est_ms.get(url, 0) for _, url in pending_main)
+        in_flight = {}          # future -> (url, is_retry)
+        workers = max(1, min(plan.workers, self.driver_pool.size, len(work)))  # an emptied pool restarts on acquire
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="probe") as executor:
+            while pending_main or in_flight or len(retries):
+                now = time.monotonic()
+
+                if len(retries) and now >= retry_deadline:
+                    dropped = retries.drain()
+                    logger.info(f"⏰ Retry deadline reached, {len(dropped)} stores stay BLOCKED")
+
+                # Fill free workers: due retries first, then the main pass
+                while len(in_flight) < workers:
+                    url = retries.pop_due(now)
+                    if url is not None:
+                        attempt = retries.attempts[url]
+                        logger.info(f"   🔄 Retrying blocked store (attempt {attempt}): {url}")
+                        future = executor.submit(self._probe_with_pool, url, attempt,
+                                                 retries.max_attempts, is_retry=True)
+                        in_flight[future] = (url, True)
+                    elif pending_main:
+                        i, url = pending_main.pop()
+                        pending_ms -= plan.est_ms.get(url, 0)
+                        future = executor.submit(self._probe_with_pool, url, i, total)
+                        in_flight[future] = (url, False)
+                    else:
+                        break
+
+                if not in_flight:
+                    # Only backed-off retries remain; sleep until the next is due (or the deadline)
+                    due_in = retries.next_due_in(now)
+                    if due_in is None:
+                        break
+                    time.sleep(min(due_in, max(0.0, retry_deadline - now)) + 0.01)
+                    continue
+
+                # Fall behind the plan -> stop secondary re-probes inside checks too
+                self._skip_reprobes = not plan.can_afford(pending_ms, now)
+
+                # A due retry can only start in a free slot: with every worker busy, wake on a
+                # completion instead of spinning on a zero timeout
+                due_in = retries.next_due_in(now) if len(in_flight) < workers else None
+                done, _ = wait(list(in_flight), timeout=due_in, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, is_retry = in_flight.pop(future)
+                    result = future.result()
+                    if not result:
+                        continue
+
+                    blocked = result['result'].status in RETRYABLE_STATUSES
+                    if is_retry:
+                        with self._stats_lock:
+                            self.stats['retries'] += 1
+                            if not blocked:
+                                self.stats['retry_successes'] += 1
+                        if blocked:
+                            logger.info(f"   🚫 Still blocked: {result['name']}")
+                        else:
+                            results_by_url[url] = result
+                            logger.info(f"   ✅ Retry successful: {result['name']} now {result['result'].status.value}")
+                    else:
+                        results_by_url[url] = result
+
+                    if not blocked:
+                        continue
+                    if not plan.can_afford(pending_ms + plan.est_ms.get(url, 0)):
+                        with self._stats_lock:
+                            self.stats['retries_skipped'] += 1
+                        logger.info(f"   ✂️ No time left to re-probe {result['name']}, stays BLOCKED")
+                    elif not retries.schedule(url, time.monotonic()):
+                        logger.info(f"   🚫 Giving up on {result['name']} after {retries.max_attempts} retries")
+
+        return [results_by_url[url] for _, url in work if url in results_by_url]
+
+    def _probe_with_pool(self, url: str, index: int, total: int, is_retry: bool = False) -> Dict[str, Any]:
+        """Check one store through the tiered prober (API first, pooled browser as fallback)"""
+        return self._check_single_store_safe(url, index, total, is_retry=is_retry)
+
+    def probe_store(self, url: str) -> CheckResult:
+        """Run probe tiers cheapest-first; the first tier that decides wins"""
+        for tier in self.probe_tiers:
+            try:
+                result = tier.probe(url)
+            except Exception as e:
+                logger.warning(f"   ⚠️ Probe tier '{tier.name}' failed: {e}")
+                result = None
+            if result is not None:
+                result.tier = tier.name
+                return result
+
+        return CheckResult(
+            status=StoreStatus.UNKNOWN,
+            response_time=0,
+            message="No probe tier could determine status",
+            confidence=0.1,
+            tier=None
+        )
+
     def _check_single_store_safe(self, url: str, index: int, total: int, is_retry: bool = False) -> Dict[str, Any]:
         """Check single store with proper error handling"""
         store_name = self.name_manager.get_store_name(url)
 
         try:
             retry_text = " (retry)" if is_retry else ""
-            logger.info(f"   [{index}/{total}] Checking {store_name}{retry_text}...")
-            result = self.check_grabfood_store(url)
+            logger.debug(f"   [{index}/{total}] Checking {store_name}{retry_text}...")
+            probe_start = time.monotonic()
+            result = self.probe_store(url)
+            probe_seconds = time.monotonic() - probe_start
+            self.latency.record(probe_seconds * 1000)
+            self.cycle_timings.record(result.timings)
+            metrics.observe('cocopan_probe_latency_seconds', probe_seconds, tier=result.tier or 'none')
+            metrics.inc('cocopan_probes_total', status=result.status.value, tier=result.tier or 'none')
 
             if not is_retry:
-                self.stats['checked'] += 1
-                self._bump_stats(result.status)
-
-            emoji = {
-                StoreStatus.ONLINE: "🟢",
-                StoreStatus.OFFLINE: "🔴",
-                StoreStatus.BLOCKED: "🚫",
-                StoreStatus.ERROR: "⚠️",
-                StoreStatus.UNKNOWN: "❓"
-            }.get(result.status, "❓")
-
-            logger.info(f"      {emoji} {result.status.value.upper()} ({result.response_time}ms)")
-            if result.message:
-                logger.info(f"      📝 {result.message}")
+                with self._stats_lock:
+                    self.stats['checked'] += 1
+                    self._bump_stats(result.status)
+
+            evidence_line(
+                logger,
+                n=f"{index}/{total}",
+                store=store_name,
+                retry=True if is_retry else None,
+                status=result.status.value,
+                conf=round(result.confidence, 2),
+                tier=result.tier,
+                stage=result.stage,
+                ms=result.response_time,
+                msg=(result.message or "")[:160] or None,
+                timings=result.timings or None,
+                **result.details,
+            )
 
             return {'url': url, 'name': store_name, 'result': result}
 
         except Exception as e:
             logger.error(f"   [{index}/{total}] Failed to check {store_name}: {e}")
             if not is_retry:
-                self.stats['checked'] += 1
-                self.stats['errors'] += 1
+                with self._stats_lock:
+                    self.stats['checked'] += 1
+                    self.stats['errors'] += 1
             return {'url': url, 'name': store_name,
                     'result': CheckResult(StoreStatus.ERROR, 0, f"Check failed: {str(e)[:100]}", 0.1)}
 
@@ -1130,6 +1786,8 @@ class GrabFoodMonitor:
             self.stats['errors'] += 1
         elif status == StoreStatus.UNKNOWN:
             self.stats['unknown'] += 1
+        elif status == StoreStatus.TIMEOUT:
+            self.stats['timeouts'] += 1
 
     def _send_client_alerts(self, results: List[Dict[str, Any]]):
         """Send hourly client alerts (all offline stores)"""
@@ -1156,14 +1814,16 @@ class GrabFoodMonitor:
 
             if offline_stores:
                 logger.info(f"📧 Sending hourly status alert for {len(offline_stores)} offline stores")
-                success = client_alerts.send_hourly_status_alert(offline_stores, total_stores)
+                with metrics.time('cocopan_alert_send_seconds', kind='hourly'):
+                    success = client_alerts.send_hourly_status_alert(offline_stores, total_stores)
                 if success:
                     logger.info("✅ Hourly client alerts sent successfully")
                 else:
                     logger.warning("⚠️ Hourly client alerts failed or skipped")
             else:
                 logger.info("📧 All stores online - sending positive status update")
-                _ = client_alerts.send_hourly_status_alert([], total_stores)
+                with metrics.time('cocopan_alert_send_seconds', kind='hourly'):
+                    _ = client_alerts.send_hourly_status_alert([], total_stores)
 
         except Exception as e:
             logger.error(f"Error sending client alerts: {e}")
@@ -1174,13 +1834,13 @@ class GrabFoodMonitor:
             problem_stores = []
             for rd in results:
                 result = rd['result']
-                if result.status in [StoreStatus.BLOCKED, StoreStatus.UNKNOWN, StoreStatus.ERROR]:
+                if result.status in [StoreStatus.BLOCKED, StoreStatus.UNKNOWN, StoreStatus.ERROR, StoreStatus.TIMEOUT]:
                     url = rd['url']
                     platform = self.name_manager.get_platform_from_url(url)
                     problem_stores.append(ProblemStore(
                         name=rd['name'],
                         url=url,
-                        status=result.status.value.upper(),
+                        status=_persisted_status(result.status),
                         message=result.message or "Routine verification needed",
                         response_time=result.response_time,
                         platform=platform
@@ -1188,7 +1848,8 @@ class GrabFoodMonitor:
 
             if problem_stores:
                 logger.info(f"📋 Found {len(problem_stores)} GrabFood stores for routine verification")
-                success = admin_alerts.send_manual_verification_alert(problem_stores)
+                with metrics.time('cocopan_alert_send_seconds', kind='admin_verification'):
+                    success = admin_alerts.send_manual_verification_alert(problem_stores)
                 if success:
                     logger.info("✅ Friendly admin reminder sent")
                 else:
@@ -1197,17 +1858,26 @@ class GrabFoodMonitor:
             # Bot detection for excessive blocking
             blocked_count = sum(1 for r in results if r['result'].status == StoreStatus.BLOCKED)
             if blocked_count >= 5:
-                admin_alerts.send_bot_detection_alert(blocked_count)
+                with metrics.time('cocopan_alert_send_seconds', kind='admin_bot_detection'):
+                    admin_alerts.send_bot_detection_alert(blocked_count)
 
         except Exception as e:
             logger.error(f"Error with admin alerts: {e}")
 
     def _save_all_results(self, results: List[Dict[str, Any]], effective_at: datetime, run_id: uuid.UUID):
-        """Save all results to database with hourly snapshots"""
+        """Save all results to database with hourly snapshots (one transaction per cycle)"""
         logger.info("💾 Saving GrabFood results to database...")
 
-        saved_count = 0
+        rows: List[Dict[str, Any]] = []
         error_count = 0
+        probe_time = datetime.now(self.timezone)
+
+        # Resolve every store ID in memory; unknown stores are created in one batch
+        try:
+            store_ids = store_registry.resolve_many((rd['name'], rd['url']) for rd in results)
+        except Exception as e:
+            logger.error(f"Store registry batch resolve failed: {e}")
+            store_ids = {}
 
         for rd in results:
             try:
@@ -1216,52 +1886,42 @@ class GrabFoodMonitor:
                 result: CheckResult = rd['result']
 
                 platform = self.name_manager.get_platform_from_url(url)
-                store_id = db.get_or_create_store(store_name, url)
-                evidence = result.message or ""
-
-                # Save to hourly snapshot table
-                db.upsert_store_status_hourly(
-                    effective_at=effective_at,
-                    platform=platform,
-                    store_id=store_id,
-                    status=result.status.value.upper(),
-                    confidence=result.confidence,
-                    response_ms=result.response_time,
-                    evidence=evidence,
-                    probe_time=datetime.now(self.timezone),
-                    run_id=run_id,
-                )
-                saved_count += 1
-
-                # Backward-compatible status check storage
-                try:
-                    is_online = (result.status == StoreStatus.ONLINE)
-                    msg = result.message or ""
-                    if result.status == StoreStatus.BLOCKED:
-                        msg = f"[BLOCKED] {msg}"
-                    elif result.status == StoreStatus.UNKNOWN:
-                        msg = f"[UNKNOWN] {msg}"
-                    elif result.status == StoreStatus.ERROR:
-                        msg = f"[ERROR] {msg}"
-                    elif result.status == StoreStatus.OFFLINE:
-                        msg = f"[OFFLINE] {msg}"
-
-                    db.save_status_check(store_id, is_online, result.response_time, msg)
-                except Exception as e:
-                    logger.debug(f"(Optional) legacy save_status_check failed: {e}")
+                store_id = store_ids.get(url) or store_registry.get_store_id(store_name, url)
+
+                # Backward-compatible status_checks message
+                msg = result.message or ""
+                if result.status == StoreStatus.BLOCKED:
+                    msg = f"[BLOCKED] {msg}"
+                elif result.status == StoreStatus.UNKNOWN:
+                    msg = f"[UNKNOWN] {msg}"
+                elif result.status == StoreStatus.ERROR:
+                    msg = f"[ERROR] {msg}"
+                elif result.status == StoreStatus.TIMEOUT:
+                    msg = f"[ERROR] [TIMEOUT] {msg}"
+                elif result.status == StoreStatus.OFFLINE:
+                    msg = f"[OFFLINE] {msg}"
+
+                rows.append({
+                    'store_id': store_id,
+                    'platform': platform,
+                    'status': _persisted_status(result.status),
+                    'confidence': result.confidence,
+                    'response_ms': result.response_time,
+                    'evidence': (f"[TIMEOUT] {result.message}" if result.status == StoreStatus.TIMEOUT
+                                 else result.message or ""),
+                    'probe_time': probe_time,
+                    'is_online': result.status == StoreStatus.ONLINE,
+                    'message': msg,
+                    'timings': result.timings,
+                })
 
             except Exception as e:
                 logger.error(f"Database error for {rd.get('name','?')}: {e}")
                 error_count += 1
 
-        # Backward-compatible summary report
-        try:
-            total = len(results)
-            online = sum(1 for r in results if r['result'].status == StoreStatus.ONLINE)
-            offline = sum(1 for r in results if r['result'].status == StoreStatus.OFFLINE)
-            db.save_summary_report(total, online, offline)
-        except Exception as e:
-            logger.debug(f"(Optional) legacy save_summary_report failed: {e}")
+        with metrics.time('cocopan_db_write_seconds', op='save_cycle_results'):
+            saved = db.save_cycle_results(rows, effective_at, run_id)
+        saved_count = len(rows) if saved else 0
 
         logger.info(f"✅ Saved {saved_count}/{len(results)} GrabFood records")
         if error_count > 0:
@@ -1269,12 +1929,69 @@ class GrabFoodMonitor:
 
         logger.info(f"💾 Data saved to hour slot: {effective_at.strftime('%Y-%m-%d %H:00:00')}")
 
+    def _save_cycle_metrics(self, run_id: uuid.UUID, effective_at: datetime, workers: int,
+                            duration: float, persist_ms: int, stores_checked: int):
+        """Per-stage aggregate, bytes and retries for this run → cycle_metrics"""
+        meter = self.resource_meter.summary()
+        with metrics.time('cocopan_db_write_seconds', op='save_cycle_metrics'):
+            db.save_cycle_metrics(
+                run_id=run_id,
+                effective_at=effective_at,
+                platform='grabfood',
+                started_at=self.stats['cycle_start'],
+                duration_ms=int(duration * 1000),
+                stores_checked=stores_checked,
+                workers=workers,
+                retries=self.stats['retries'],
+                timeouts=self.stats['timeouts'],
+                pages=meter['pages'],
+                bytes_transferred=meter['bytes_transferred'],
+                persist_ms=persist_ms,
+                stage_stats=self.cycle_timings.aggregate(),
+            )
+
+    def _export_metrics(self, duration: float, workers: int):
+        """Publish this cycle's stats on /metrics"""
+        stats = self.stats
+        metrics.inc('cocopan_cycles_total')
+        metrics.set('cocopan_cycle_duration_seconds', round(duration, 3))
+        metrics.set('cocopan_cycle_last_completed_timestamp_seconds', int(time.time()))
+        metrics.set('cocopan_cycle_workers', workers)
+        for status in ('online', 'offline', 'blocked', 'errors', 'unknown', 'timeouts'):
+            metrics.set('cocopan_cycle_stores', stats[status], status=status)
+        checked = max(1, stats['checked'])
+        metrics.set('cocopan_cycle_block_ratio', round(stats['blocked'] / checked, 4))
+        metrics.set('cocopan_cycle_retry_ratio', round(stats['retries'] / checked, 4))
+        metrics.inc('cocopan_probe_retries_total', stats['retries'])
+        metrics.inc('cocopan_probe_retry_successes_total', stats['retry_successes'])
+        metrics.inc('cocopan_probe_retries_skipped_total', stats['retries_skipped'])
+
+        # Running totals kept by the pool / lifecycle / watchdog themselves
+        lifecycle = self.driver_lifecycle.summary()
+        metrics.set('cocopan_driver_recycles_total', lifecycle['recycles_pages'], reason='pages')
+        metrics.set('cocopan_driver_recycles_total', lifecycle['recycles_rss'], reason='rss')
+        metrics.set('cocopan_driver_respawns_total', self.driver_pool.respawns)
+        metrics.set('cocopan_watchdog_kills_total', self.watchdog.kills)
+
+    def _log_stage_summary(self):
+        stages = self.cycle_timings.aggregate()
+        if not stages:
+            return
+        logger.info("   ⏱️ Probe stages (sum / p50 / p95):")
+        for name, s in stages.items():
+            logger.info(f"      {name:<9} {s['sum'] / 1000:7.1f}s  {s['p50']:6.0f}ms  {s['p95']:6.0f}ms  ({s['count']})")
+
     def close(self):
-        """Close Selenium driver"""
-        if self.driver:
+        """Close all pooled Selenium drivers"""
+        watchdog = getattr(self, 'watchdog', None)
+        if watchdog:
+            watchdog.stop()
+        artifact_store.flush()
+        pool = getattr(self, 'driver_pool', None)
+        if pool:
             try:
-                self.driver.quit()
-                logger.info("✓ Selenium WebDriver closed")
+                pool.close()
+                logger.info("✓ Selenium WebDriver pool closed")
             except:
                 pass
 
@@ -1302,6 +2019,7 @@ def main():
 
     try:
         monitor = GrabFoodMonitor()
+        start_metrics_server()
 
         if not monitor.store_urls:
             logger.error("❌ No GrabFood URLs loaded!")
@@ -1391,5 +2109,18 @@ def main():
     finally:
         logger.info("👋 GrabFood monitor stopped")
 
+def refresh_names():
+    """Offline command: re-fetch store page titles into store_names.json"""
+    overwrite = '--overwrite' in sys.argv
+    with open(config.STORE_URLS_FILE) as f:
+        urls = [url for url in json.load(f).get('urls', []) if 'grab.com' in url]
+
+    logger.info(f"🏷️ Refreshing store names from {len(urls)} GrabFood pages (overwrite={overwrite})...")
+    changed = StoreNameManager(load_overrides=False).refresh_names_from_pages(urls, overwrite=overwrite)
+    logger.info(f"✅ {changed} store name entries updated in {StoreNameManager.NAMES_FILE}")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if 'refresh-names' in sys.argv:
+        refresh_names()
+    else:
+        main()
\ No newline at end of file
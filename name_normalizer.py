@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+CocoPan Name Normalizer - one precompiled, memoized product-name pipeline
+- sku_key(): the matching key SKUMapper and SkuCatalog index by (upper-cased,
+  Ñ/É folded, GRAB/FOODPANDA prefix and promo tails dropped, brackets
+  flattened, hyphens and whitespace collapsed)
+- clean_scraped_name(): scraper cleanup of a raw menu-card name (trailing
+  price, description sentence, marketing copy)
+- display_name(): dashboard label without the platform prefix
+- The ten-odd re.sub calls of the old per-module helpers are folded into a few
+  compiled patterns; sku_key and clean_scraped_name results are kept in a
+  bounded LRU (NAME_CACHE_SIZE) since the same ~60 names repeat on every menu
+"""
+import re
+from functools import lru_cache
+from typing import Optional
+
+from config import config
+
+_FOLD = str.maketrans({'Ñ': 'N', 'É': 'E'})  # applied after upper(), so ñ/é are already Ñ/É
+_PLATFORM_PREFIX = re.compile(r'^(?:GRAB\s+|FOODPANDA\s+|FOOD PANDA\s+)')
+# Promo tails, cut in two passes to keep the old rule order: "... WITH FREE MANGO SUNRISE"
+# loses the promo first and keeps "WITH", exactly as before
+_PROMO_TAIL = re.compile(r'\s*(?:FREE\s+MANGO\s+SUNRISE|\+\s*\d+\s*PHP)', re.IGNORECASE)
+_FREE_TAIL = re.compile(r'\s*(?:WITH\s+)?FREE', re.IGNORECASE)
+_PARENS = re.compile(r'\(([^)]+)\)')
+_BRACKETS = re.compile(r'\[([^\]]+)\]')
+
+_TRAILING_PRICE = re.compile(r'\s*P?\s*\d+[\d,.]*\s*$')
+_GLUED_DESCRIPTION = re.compile(r'^([^.]+?[a-z])([A-Z][a-z].{10,})$')
+_DESCRIPTION_MARKER = re.compile('|'.join(re.escape(m) for m in (
+    'A soft', 'A golden', 'A delicious', 'A crispy', 'A fluffy',
+    'Made with', 'Served with', 'Topped with', 'Filled with',
+    'Perfect for', 'Great for', 'Ideal for',
+)))
+
+
+def _truncate_at(pattern: re.Pattern, text: str) -> str:
+    match = pattern.search(text)
+    return text[:match.start()] if match else text
+
+
+@lru_cache(maxsize=config.NAME_CACHE_SIZE)
+def sku_key(name: str) -> str:
+    """Normalized product name used for SKU matching ('' for empty input)"""
+    if not name:
+        return ""
+    name = _PLATFORM_PREFIX.sub('', name.upper().translate(_FOLD), count=1)
+    name = _truncate_at(_FREE_TAIL, _truncate_at(_PROMO_TAIL, name))
+    # Flatten parentheses, then brackets - keep the content, drop the brackets themselves
+    name = _BRACKETS.sub(r' \1 ', _PARENS.sub(r' \1 ', name))
+    return ' '.join(name.replace('-', ' ').split())  # "K-SALT" -> "K SALT"
+
+
+@lru_cache(maxsize=config.NAME_CACHE_SIZE)
+def clean_scraped_name(name: str) -> str:
+    """Just the product name out of a scraped menu-card title"""
+    if not name:
+        return name
+    name = _TRAILING_PRICE.sub('', name)
+    if '.' in name:
+        name = name.split('.')[0].strip()
+    match = _GLUED_DESCRIPTION.match(name)
+    if match:
+        name = match.group(1).strip()
+    return _truncate_at(_DESCRIPTION_MARKER, name).strip()
+
+
+def display_name(name: Optional[str]) -> str:
+    """Product name for dashboards, without the GRAB / FOODPANDA prefix"""
+    if not name:
+        return ""
+    return name.replace("GRAB ", "").replace("FOODPANDA ", "")
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters of the memoized steps, for benchmarks and run summaries"""
+    return {fn.__name__: fn.cache_info()._asdict() for fn in (sku_key, clean_scraped_name)}
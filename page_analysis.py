@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+CocoPan Page Analysis - single-pass HTML parsing for store probes
+- Parses page_source once with lxml (no second BeautifulSoup tree)
+- Extracts <title>, the __NEXT_DATA__ payload and a capped visible-text prefix in one walk
+- Returns a compact PageAnalysis struct for the status classifiers
+- extract_from_driver() builds the same struct inside the browser (execute_script)
+  so only a few KB cross the WebDriver wire instead of the full page_source
+"""
+import json
+import logging
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from lxml import etree, html as lxml_html
+
+logger = logging.getLogger(__name__)
+
+# Keyword checks only ever look at the start of the page
+VISIBLE_TEXT_LIMIT = 1000
+
+# Same tags the old BeautifulSoup path decomposed before get_text()
+_INVISIBLE_TAGS = frozenset({'script', 'style', 'meta', 'link'})
+
+
+@dataclass
+class PageAnalysis:
+    """What the classifiers need from a page - nothing more"""
+    title: str = ""
+    visible_text: str = ""          # newline-joined, stripped text nodes, capped at text_limit
+    next_data: Optional[Dict[str, Any]] = None
+    html_length: int = 0            # document bytes (in-browser: navigation timing decodedBodySize)
+    transfer_bytes: int = 0         # bytes pulled over the WebDriver wire to build this
+
+    @property
+    def merchant(self) -> Optional[Dict[str, Any]]:
+        """props.pageProps.merchant from __NEXT_DATA__, when present"""
+        if not isinstance(self.next_data, dict):
+            return None
+        merchant = self.next_data.get('props', {}).get('pageProps', {}).get('merchant')
+        return merchant if isinstance(merchant, dict) else None
+
+
+def analyze_html(html: str, text_limit: int = VISIBLE_TEXT_LIMIT) -> PageAnalysis:
+    """
+    Parse HTML once and pull out title, __NEXT_DATA__ and a visible-text prefix.
+
+    Text collection stops at text_limit characters, but the walk continues
+    (without building strings) so a __NEXT_DATA__ script at the end of
+    <body> is still found.
+    """
+    analysis = PageAnalysis(html_length=len(html or ""), transfer_bytes=len(html or ""))
+    if not html:
+        return analysis
+
+    try:
+        root = lxml_html.document_fromstring(html)
+    except (etree.ParserError, ValueError) as e:
+        logger.debug(f"lxml could not parse page: {e}")
+        return analysis
+
+    chunks = []
+    collected = 0
+    skip_depth = 0  # > 0 while inside an invisible subtree
+
+    for event, el in etree.iterwalk(root, events=('start', 'end')):
+        tag = el.tag if isinstance(el.tag, str) else None
+        if event == 'start':
+            if tag == 'title' and not analysis.title:
+                analysis.title = (el.text_content() or "").strip()
+            elif tag == 'script' and el.get('id') == '__NEXT_DATA__' and analysis.next_data is None:
+                analysis.next_data = _load_next_data(el.text)
+
+            if tag is None or tag in _INVISIBLE_TAGS:
+                skip_depth += 1
+            elif skip_depth == 0 and collected < text_limit and el.text:
+                text = el.text.strip()
+                if text:
+                    chunks.append(text)
+                    collected += len(text) + 1
+        else:
+            if tag is None or tag in _INVISIBLE_TAGS:
+                skip_depth -= 1
+            # Tail text belongs to the parent, so it counts once we have left an invisible subtree
+            if skip_depth == 0 and collected < text_limit and el.tail:
+                text = el.tail.strip()
+                if text:
+                    chunks.append(text)
+                    collected += len(text) + 1
+
+    analysis.visible_text = '\n'.join(chunks)[:text_limit]
+    return analysis
+
+
+def _load_next_data(payload: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not payload:
+        return None
+    try:
+        data = json.loads(payload)
+        return data if isinstance(data, dict) else None
+    except ValueError as e:
+        logger.debug(f"__NEXT_DATA__ JSON parse error: {e}")
+        return None
+
+
+# Runs inside the page via driver.execute_script; returns a small JSON string
+# instead of shipping the whole page_source over the WebDriver wire.
+BROWSER_EXTRACTOR_JS = r"""
+var limit = arguments[0];
+// HTML size from the navigation timing entry the browser already keeps (the same
+// timing the ResourceMeter reads); serializing outerHTML would cost a full page copy
+var nav = performance.getEntriesByType ? performance.getEntriesByType("navigation")[0] : null;
+var out = {title: document.title || "", text: "", merchant: null, nextData: false,
+           htmlLength: nav ? (nav.decodedBodySize || 0) : 0};
+var body = document.body;
+if (body) {
+    var raw = (body.innerText || "").slice(0, limit * 4);
+    out.text = raw.split("\n").map(function (l) { return l.trim(); })
+                  .filter(function (l) { return l.length; }).join("\n").slice(0, limit);
+}
+try {
+    var data = window.__NEXT_DATA__;
+    if (!data) {
+        var el = document.getElementById("__NEXT_DATA__");
+        if (el && el.textContent) { data = JSON.parse(el.textContent); }
+    }
+    if (data) {
+        out.nextData = true;
+        var m = data.props && data.props.pageProps && data.props.pageProps.merchant;
+        if (m && typeof m === "object") {
+            out.merchant = {};
+            ["id", "name", "status", "isClosed", "available", "rating", "voteCount",
+             "openingHours", "closedReason"].forEach(function (k) {
+                if (m[k] !== undefined) { out.merchant[k] = m[k]; }
+            });
+        }
+    }
+} catch (e) { out.nextDataError = String(e); }
+return JSON.stringify(out);
+"""
+
+
+def extract_from_driver(driver, text_limit: int = VISIBLE_TEXT_LIMIT, timer=None) -> Optional[PageAnalysis]:
+    """
+    Build a PageAnalysis inside the browser (title, innerText prefix, merchant
+    subset of __NEXT_DATA__). Returns None when the extractor fails, so the
+    caller can fall back to driver.page_source + analyze_html.
+    An optional probe_timing.StageTimer gets the script round-trip as 'extract'
+    and the JSON decode as 'parse'.
+    """
+    try:
+        with timer.stage('extract') if timer else nullcontext():
+            payload = driver.execute_script(BROWSER_EXTRACTOR_JS, text_limit)
+        with timer.stage('parse') if timer else nullcontext():
+            data = json.loads(payload) if isinstance(payload, str) else None
+    except Exception as e:
+        logger.debug(f"In-browser extractor failed: {e}")
+        return None
+
+    if not isinstance(data, dict):
+        return None
+
+    # Only the merchant subset crosses the wire; keep the props.pageProps shape
+    next_data = None
+    if data.get('nextData'):
+        merchant = data.get('merchant')
+        next_data = {'props': {'pageProps': {'merchant': merchant} if merchant else {}}}
+
+    return PageAnalysis(
+        title=(data.get('title') or "").strip(),
+        visible_text=(data.get('text') or "")[:text_limit],
+        next_data=next_data,
+        html_length=int(data.get('htmlLength') or 0),
+        transfer_bytes=len(payload),
+    )
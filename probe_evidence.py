@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+CocoPan Probe Evidence - one structured log line per probe instead of ~25
+- evidence_line(): compact JSON at INFO (status, confidence, tier, stage,
+  timings, page facts), easy to grep and to parse back out of the logs
+- EvidencePolicy: the full visible-text dump is only logged for non-ONLINE,
+  low-confidence or sampled probes; EVIDENCE_DEBUG=true brings it back for
+  every probe of a run
+"""
+import json
+import random
+import logging
+from typing import Any, Optional
+
+from config import config
+
+
+class EvidencePolicy:
+    """Decides which probes get their full page text logged"""
+
+    def __init__(self, sample_rate: Optional[float] = None, min_confidence: Optional[float] = None,
+                 debug: Optional[bool] = None):
+        self.sample_rate = config.EVIDENCE_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.min_confidence = config.EVIDENCE_MIN_CONFIDENCE if min_confidence is None else min_confidence
+        self.debug = config.EVIDENCE_DEBUG if debug is None else debug
+
+    def capture_reason(self, status: str, confidence: float) -> Optional[str]:
+        """Why this probe's full text should be logged, or None to keep only the evidence line"""
+        if self.debug:
+            return "debug"
+        if status != "online":
+            return "status"
+        if confidence < self.min_confidence:
+            return "low_confidence"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+
+def evidence_line(logger: logging.Logger, **fields: Any):
+    """Log one compact JSON object at INFO; None-valued fields are dropped"""
+    payload = {k: v for k, v in fields.items() if v is not None}
+    logger.info("🧾 evidence " + json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=str))
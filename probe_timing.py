@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+CocoPan Probe Timing - per-stage durations for every probe and cycle
+- STAGES: acquire, navigate, wait, extract, parse, classify, persist
+- StageTimer: `with timer.stage('navigate'): ...` accumulates milliseconds per stage
+- CycleTimings: per-cycle sum / p50 / p95 / p99 for each stage, stored in cycle_metrics
+"""
+import math
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence
+
+STAGES = ('acquire', 'navigate', 'wait', 'extract', 'parse', 'classify', 'persist')
+
+
+def percentile(sorted_samples: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence (0 when empty)"""
+    if not sorted_samples:
+        return 0.0
+    index = max(0, math.ceil(p / 100.0 * len(sorted_samples)) - 1)
+    return sorted_samples[index]
+
+
+class StageTimer:
+    """Milliseconds spent per stage during one probe"""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    def add(self, name: str, ms: float):
+        self.timings[name] = self.timings.get(name, 0.0) + ms
+
+    def as_dict(self) -> Dict[str, int]:
+        return {name: int(round(ms)) for name, ms in self.timings.items()}
+
+
+class CycleTimings:
+    """Collects probe stage timings across a cycle"""
+
+    def __init__(self):
+        self._samples: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self._samples = {}
+
+    def record(self, timings: Optional[Dict[str, float]]):
+        if not timings:
+            return
+        with self._lock:
+            for name, ms in timings.items():
+                self._samples.setdefault(name, []).append(ms)
+
+    def aggregate(self) -> Dict[str, Dict[str, float]]:
+        """{stage: {'count', 'sum', 'p50', 'p95', 'p99'}} in STAGES order"""
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self._samples.items()}
+        ordered = [s for s in STAGES if s in samples] + [s for s in samples if s not in STAGES]
+        return {
+            name: {
+                'count': len(samples[name]),
+                'sum': round(sum(samples[name]), 1),
+                'p50': percentile(samples[name], 50),
+                'p95': percentile(samples[name], 95),
+                'p99': percentile(samples[name], 99),
+            }
+            for name in ordered
+        }
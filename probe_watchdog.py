@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+CocoPan Probe Watchdog - hard wall-clock deadlines for Selenium probes
+- set_driver_timeouts(): page-load / script timeouts on every driver we start
+- load_page(): driver.get() that keeps whatever rendered when the page-load timeout fires
+- ProbeWatchdog: one background thread tracks in-flight probes; when a probe
+  misses its deadline the Chrome session is killed, which unblocks the
+  wedged driver.get() with an exception instead of stalling the cycle
+- kill_driver(): chromedriver plus its Chrome children, without waiting on WebDriver
+- LatencyTracker: p50/p95/p99 probe latency per cycle
+"""
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from selenium.common.exceptions import TimeoutException
+
+from config import config
+from probe_timing import percentile
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+logger = logging.getLogger(__name__)
+
+
+def set_driver_timeouts(driver, page_load: Optional[float] = None, script: Optional[float] = None):
+    """Apply PAGE_LOAD_TIMEOUT / SCRIPT_TIMEOUT so a single call cannot block forever"""
+    try:
+        driver.set_page_load_timeout(config.PAGE_LOAD_TIMEOUT if page_load is None else page_load)
+        driver.set_script_timeout(config.SCRIPT_TIMEOUT if script is None else script)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not set driver timeouts: {e}")
+
+
+def load_page(driver, url: str) -> bool:
+    """
+    Navigate, treating the page-load timeout as "stop loading and use what is there".
+    Returns False when the timeout fired.
+    """
+    try:
+        driver.get(url)
+        return True
+    except TimeoutException:
+        logger.info(f"   ⏱️ Page load hit {config.PAGE_LOAD_TIMEOUT:.0f}s limit - using the partial page")
+        try:
+            driver.execute_script("window.stop();")
+        except Exception:
+            pass
+        return False
+
+
+def kill_driver(driver):
+    """
+    Hard-kill a driver's chromedriver and Chrome processes.
+    driver.quit() goes through the same wedged HTTP channel, so it is not used here.
+    """
+    process = getattr(getattr(driver, 'service', None), 'process', None)
+    if process is None:
+        return
+    if HAS_PSUTIL:
+        try:
+            for child in psutil.Process(process.pid).children(recursive=True):
+                try:
+                    child.kill()
+                except psutil.Error:
+                    pass
+        except psutil.Error as e:
+            logger.debug(f"kill_driver: could not list Chrome children: {e}")
+    try:
+        process.kill()
+    except Exception as e:
+        logger.debug(f"kill_driver: {e}")
+
+
+@dataclass
+class _Watch:
+    driver: object
+    label: str
+    deadline: float
+    expired: bool = False
+    killed_at: Optional[float] = None    # monotonic time the watchdog killed Chrome
+    finished_at: Optional[float] = None  # monotonic time the guarded block ended
+
+    def killed_before(self, finished: float) -> bool:
+        """True when Chrome was killed before `finished` (a result produced after the kill is junk)"""
+        return self.expired and self.killed_at is not None and self.killed_at < finished
+
+
+class ProbeWatchdog:
+    """Background thread enforcing per-probe deadlines"""
+
+    def __init__(self, deadline: Optional[float] = None, interval: float = 0.5):
+        self.deadline = config.PROBE_DEADLINE if deadline is None else deadline
+        self.interval = interval
+        self.kills = 0
+        self._watches: Dict[int, _Watch] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="probe-watchdog", daemon=True)
+        self._thread.start()
+
+    @contextmanager
+    def watch(self, driver, label: str = "probe", deadline: Optional[float] = None):
+        """Guard a with-block; yields the watch, whose .expired is True if the driver was killed"""
+        entry = _Watch(driver, label, time.monotonic() + (self.deadline if deadline is None else deadline))
+        with self._lock:
+            self._watches[id(driver)] = entry
+        try:
+            yield entry
+        finally:
+            with self._lock:
+                entry.finished_at = time.monotonic()
+                self._watches.pop(id(driver), None)
+
+    def expired(self, driver) -> bool:
+        """True when the driver's current probe has been killed"""
+        with self._lock:
+            entry = self._watches.get(id(driver))
+        return bool(entry and entry.expired)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            now = time.monotonic()
+            with self._lock:
+                overdue = [w for w in self._watches.values()
+                           if not w.expired and w.finished_at is None and now >= w.deadline]
+                for entry in overdue:
+                    entry.expired = True
+                    entry.killed_at = now
+            for entry in overdue:
+                self.kills += 1
+                logger.warning(f"⏱️ Watchdog: {entry.label} missed its {self.deadline:.0f}s deadline - killing Chrome")
+                kill_driver(entry.driver)
+
+    def stop(self):
+        self._stop.set()
+
+
+class LatencyTracker:
+    """Collects per-probe wall-clock latencies for percentile reporting"""
+
+    def __init__(self):
+        self._samples: List[float] = []
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self._samples = []
+
+    def record(self, ms: float):
+        with self._lock:
+            self._samples.append(ms)
+
+    def percentiles(self) -> Dict[str, float]:
+        """{'p50', 'p95', 'p99', 'max', 'count'} using nearest-rank"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0, 'count': 0}
+
+        return {'p50': percentile(samples, 50), 'p95': percentile(samples, 95), 'p99': percentile(samples, 99),
+                'max': samples[-1], 'count': len(samples)}
+
+    def log_summary(self, label: str = "Probe latency"):
+        p = self.percentiles()
+        if not p['count']:
+            return
+        logger.info(f"   ⏱️ {label}: p50 {p['p50'] / 1000:.1f}s, p95 {p['p95'] / 1000:.1f}s, "
+                    f"p99 {p['p99'] / 1000:.1f}s, max {p['max'] / 1000:.1f}s ({p['count']} probes)")
@@ -27,6 +27,10 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 from config import config
 from database import db
+from store_registry import store_registry
+from artifact_store import artifact_store
+from async_probe import AsyncProbeRunner, ProbeRequest, ProbeResponse
+from grab_api import extract_grabfood_merchant_id, grabfood_api_urls
 
 # ------------------------- Logging -------------------------
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -43,31 +47,12 @@ DEFAULT_UAS = [
     'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
 ]
 
-def ensure_dir(path: str):
-    os.makedirs(path, exist_ok=True)
-
 def debug_save_snapshot(prefix: str, url: str, body: str, status: int = None, headers: Dict[str, Any] = None):
-    """Save response for later inspection."""
+    """Queue a response in the artifact store for later inspection (outcome = prefix)."""
     try:
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        host = urlparse(url).netloc.replace(":", "_") or "unknown"
-        ensure_dir("debug_snapshots")
-        base = f"debug_snapshots/{prefix}_{host}_{ts}"
-        
-        # Save response body
-        ext = ".json" if "application/json" in str(headers.get("Content-Type", "")) else ".html"
-        with open(base + ext, "w", encoding="utf-8") as f:
-            f.write(body or "")
-        
-        # Save metadata
-        with open(base + ".meta.txt", "w", encoding="utf-8") as f:
-            f.write(
-                f"URL: {url}\n"
-                f"Status: {status}\n"
-                f"Headers: {dict(headers or {})}\n"
-                f"Length: {len(body or '')}\n"
-            )
-        logger.debug(f"[dbg] Saved snapshot → {base}{ext}")
+        meta = {'status': status, 'content_type': (headers or {}).get("Content-Type")}
+        if artifact_store.save('ratings', url, body, prefix, store_id=store_registry.lookup(url), meta=meta):
+            logger.debug(f"[dbg] Queued {prefix} snapshot for {url}")
     except Exception as e:
         logger.debug(f"[dbg] Snapshot save failed: {e}")
 
@@ -91,83 +76,71 @@ def pick_ua(uas: List[str]) -> str:
     return random.choice(uas)
 
 # ------------------------- GrabFood API Extractor ----------
-def extract_grabfood_merchant_id(url: str) -> Optional[str]:
-    """Extract merchant ID from GrabFood URL (e.g., '2-C6K2GPUYKYT3LE')"""
-    try:
-        parsed = urlparse(url)
-        # Pattern: /restaurant/store-name/2-MERCHANTID or /2-MERCHANTID
-        match = re.search(r'/([0-9]-[A-Z0-9]+)$', parsed.path, re.IGNORECASE)
-        if match:
-            return match.group(1)
+def grabfood_api_request(merchant_id: str, key: Any = None) -> ProbeRequest:
+    """Build the probe for a merchant: restaurant endpoint first, merchants endpoint as fallback."""
+    api_urls = grabfood_api_urls(merchant_id)
+    
+    return ProbeRequest(
+        url=api_urls[0],
+        fallback_urls=api_urls[1:],
+        timeout=15,
+        key=key if key is not None else merchant_id,
+        headers={
+            'User-Agent': pick_ua(DEFAULT_UAS),
+            'Accept': 'application/json, text/plain, */*',
+            'Accept-Language': 'en-PH,en;q=0.9',
+            'Origin': 'https://food.grab.com',
+            'Referer': 'https://food.grab.com/',
+            'Connection': 'keep-alive',
+        },
+    )
+
+def api_response_from_probe(probe: ProbeResponse) -> Optional[Dict[str, Any]]:
+    """Convert a probe into the {status, headers, url, json, text} dict; None unless HTTP 200 + JSON."""
+    if probe.error:
+        logger.debug(f"API request error: {probe.error}")
         return None
-    except Exception as e:
-        logger.debug(f"Error extracting GrabFood merchant ID: {e}")
+    if not probe.ok:
+        logger.debug(f"API returned status {probe.status} for {probe.url}")
+        return None
+    data = probe.json()
+    if data is None:
+        logger.debug(f"Non-JSON response from {probe.url}")
         return None
+    return {
+        "status": probe.status,
+        "headers": probe.headers,
+        "url": probe.url,
+        "json": data,
+        "text": probe.text
+    }
 
 def fetch_grabfood_api(merchant_id: str, attempt: int = 1) -> Optional[Dict[str, Any]]:
     """Fetch data from GrabFood API endpoint."""
-    # Manila coordinates (can be adjusted)
-    latlng = "14.5995,120.9842"
+    # Back off on retries; first-attempt pacing is handled by the per-host token bucket
+    if attempt > 1:
+        time.sleep((attempt - 1) * random.uniform(0.5, 1.0))
     
-    # Try both API endpoints
-    api_urls = [
-        f"https://portal.grab.com/foodweb/v2/restaurant?merchantCode={merchant_id}&latlng={latlng}",
-        f"https://portal.grab.com/foodweb/v2/merchants/{merchant_id}?latlng={latlng}"
-    ]
-    
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': pick_ua(DEFAULT_UAS),
-        'Accept': 'application/json, text/plain, */*',
-        'Accept-Language': 'en-PH,en;q=0.9',
-        'Origin': 'https://food.grab.com',
-        'Referer': 'https://food.grab.com/',
-        'Connection': 'keep-alive',
-    })
+    probe = AsyncProbeRunner().run([grabfood_api_request(merchant_id)])[0]
+    return api_response_from_probe(probe)
+
+def prefetch_grabfood_api(urls: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Fetch the API payload for many GrabFood stores in one concurrent batch, keyed by store URL."""
+    probe_requests = []
+    for url in urls:
+        merchant_id = extract_grabfood_merchant_id(url)
+        if merchant_id:
+            probe_requests.append(grabfood_api_request(merchant_id, key=url))
     
-    # Add delay to avoid rate limiting
-    time.sleep(random.uniform(0.8, 2.2) + (attempt - 1) * random.uniform(0.5, 1.0))
+    if not probe_requests:
+        return {}
     
-    for api_url in api_urls:
-        try:
-            resp = session.get(api_url, timeout=15, allow_redirects=True)
-            
-            if resp.status_code == 200:
-                try:
-                    data = resp.json()
-                    return {
-                        "status": resp.status_code,
-                        "headers": dict(resp.headers),
-                        "url": resp.url,
-                        "json": data,
-                        "text": resp.text
-                    }
-                except json.JSONDecodeError:
-                    logger.debug(f"Non-JSON response from {api_url}")
-                    continue
-            else:
-                logger.debug(f"API returned status {resp.status_code} for {api_url}")
-                
-        except requests.exceptions.SSLError:
-            try:
-                resp = session.get(api_url, timeout=15, allow_redirects=True, verify=False)
-                if resp.status_code == 200:
-                    data = resp.json()
-                    return {
-                        "status": resp.status_code,
-                        "headers": dict(resp.headers),
-                        "url": resp.url,
-                        "json": data,
-                        "text": resp.text
-                    }
-            except Exception as e:
-                logger.debug(f"SSL retry failed: {e}")
-                
-        except Exception as e:
-            logger.debug(f"API request error: {e}")
-            continue
-    
-    return None
+    start = time.time()
+    probes = AsyncProbeRunner().run(probe_requests)
+    responses = {probe.request.key: api_response_from_probe(probe) for probe in probes}
+    ok = sum(1 for r in responses.values() if r)
+    logger.info(f"⚡ Prefetched GrabFood API for {ok}/{len(probes)} stores in {time.time() - start:.1f}s")
+    return responses
 
 def extract_grabfood_rating_from_json(json_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """Extract rating and status from GrabFood API JSON response."""
@@ -383,8 +356,8 @@ def fetch_html(url: str, attempt: int = 1) -> Optional[Dict[str, Any]]:
 
 # ------------------------- Scraper Core ---------------------
 class RatingScraper:
-    def scrape_grabfood_rating(self, url: str) -> Optional[Dict[str, Any]]:
-        """Scrape GrabFood rating using API endpoint."""
+    def scrape_grabfood_rating(self, url: str, prefetched: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Scrape GrabFood rating using API endpoint (first attempt may use a prefetched response)."""
         tries = 3
         
         # Extract merchant ID
@@ -397,7 +370,10 @@ class RatingScraper:
         
         for attempt in range(1, tries + 1):
             # Fetch from API
-            api_response = fetch_grabfood_api(merchant_id, attempt)
+            if attempt == 1 and prefetched:
+                api_response = prefetched
+            else:
+                api_response = fetch_grabfood_api(merchant_id, attempt)
             
             if not api_response:
                 logger.debug(f"   Attempt {attempt}/{tries}: No API response")
@@ -470,9 +446,10 @@ class RatingScraper:
             debug_save_snapshot("fp_norating", url, r["text"], r["status"], r["headers"])
         return None
 
-    def scrape_store_rating(self, url: str, platform: str) -> Optional[Dict[str, Any]]:
+    def scrape_store_rating(self, url: str, platform: str,
+                            prefetched: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         if "grab.com" in url or platform == "grabfood":
-            return self.scrape_grabfood_rating(url)
+            return self.scrape_grabfood_rating(url, prefetched)
         if "foodpanda" in url or platform == "foodpanda":
             return self.scrape_foodpanda_rating(url)
         logger.error(f"Unknown platform for URL: {url}")
@@ -564,6 +541,9 @@ class RatingMonitor:
             "store_results": []
         }
 
+        # GrabFood API calls are fanned out up front; Foodpanda still goes store by store
+        prefetched = prefetch_grabfood_api([s["url"] for s in stores if s["platform"] == "grabfood"])
+
         for i, store in enumerate(stores, 1):
             url, platform = store["url"], store["platform"]
             platform_emoji = "🛒" if platform == "grabfood" else "🐼"
@@ -571,7 +551,7 @@ class RatingMonitor:
             logger.info(f"   {url}")
 
             try:
-                data = self.scraper.scrape_store_rating(url, platform)
+                data = self.scraper.scrape_store_rating(url, platform, prefetched.get(url))
                 if data and data.get("success"):
                     rating = data["rating"]
                     status = data.get("status", "UNKNOWN")
@@ -579,7 +559,7 @@ class RatingMonitor:
                     vote_count = data.get("vote_count")
                     store_name = self.extract_store_name(url)
 
-                    store_id = db.get_or_create_store(store_name, url)
+                    store_id = store_registry.get_store_id(store_name, url)
                     ok = db.save_store_rating(
                         store_id=store_id,
                         platform=platform,
@@ -621,7 +601,7 @@ class RatingMonitor:
                 logger.error(f"   ❌ Error: {e}")
                 results["failed"] += 1
 
-            if i < len(stores):
+            if i < len(stores) and platform == "foodpanda":
                 delay = random.uniform(3, 6)
                 logger.debug(f"   ⏱️ Waiting {delay:.1f}s…")
                 time.sleep(delay)
@@ -639,10 +619,11 @@ class RatingMonitor:
         logger.info(f"   📈 Success rate:   {success_rate:.1f}%")
         if results["scraper_blocked"] > 0:
             logger.warning(f"\n⚠️ {results['scraper_blocked']} stores couldn't be scraped (blocked/not found)")
-            logger.warning("   Check debug_snapshots/* to inspect responses")
+            logger.warning(f"   Check {config.ARTIFACT_DIR}/index.db (artifact_store.find) to inspect responses")
         if results["alerts_created"] > 0:
             logger.warning(f"\n🚨 {results['alerts_created']} rating alerts created! Check dashboard.")
         logger.info("=" * 70)
+        artifact_store.flush()
         return results
 
 # ------------------------- Entrypoint -----------------------
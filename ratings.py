@@ -17,13 +17,21 @@ import random
 import logging
 from typing import Optional, Dict, Any, List
 from datetime import datetime
-from urllib.parse import urlparse
 
 import undetected_chromedriver as uc
 from bs4 import BeautifulSoup
 
+from driver_profile import ResourceMeter, apply_to_driver, apply_to_options, profile_for
+from probe_watchdog import load_page, set_driver_timeouts
+from driver_lifecycle import DriverLifecycle
+from browser_profile import profile_store_for
+from artifact_store import artifact_store
+from selenium_waits import (MenuCountStable, next_data_present, scroll_until_stable,
+                            title_has_rating, wait_until_ready)
+
 from config import config
 from database import db
+from store_registry import store_registry
 
 # ------------------------- Logging -------------------------
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -95,11 +103,12 @@ def create_foodpanda_driver():
     return driver
 
 
-def create_grabfood_driver():
+def create_grabfood_driver(profile=None):
     """
     Create Chrome driver for GrabFood - EXACT copy from grabfood_sku_scraper.py setup_driver()
-    WITH headless, WITH --disable-gpu
+    WITH headless, WITH --disable-gpu, plus the 'ratings' driver profile (see driver_profile.py)
     """
+    profile = profile or profile_for('ratings')
     chrome_binary = find_chrome_binary()
     if not chrome_binary:
         raise Exception("Chrome not found! Please install Chrome or check the path.")
@@ -114,37 +123,33 @@ def create_grabfood_driver():
 
     user_agent = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/145.0.0.0 Safari/537.36'
     options.add_argument(f'--user-agent={user_agent}')
+    apply_to_options(options, profile)
+    profile_store = profile_store_for('ratings')
+    profile_slot = profile_store.prepare(options)
 
-    driver = uc.Chrome(
-        options=options,
-        browser_executable_path=chrome_binary,
-        version_main=145,
-        use_subprocess=True
-    )
+    try:
+        driver = uc.Chrome(
+            options=options,
+            browser_executable_path=chrome_binary,
+            version_main=145,
+            use_subprocess=True
+        )
+    except Exception:
+        profile_store.failed(profile_slot)
+        raise
+    profile_store.bind(profile_slot, driver)
+    set_driver_timeouts(driver)
+    apply_to_driver(driver, profile)
     return driver
 
 
 # ------------------------- Debug Snapshots -----------------
 
-def ensure_dir(path: str):
-    os.makedirs(path, exist_ok=True)
-
-
 def debug_save_snapshot(prefix: str, url: str, body: str):
-    """Save response HTML for later inspection."""
+    """Queue response HTML in the artifact store for later inspection (outcome = prefix)."""
     try:
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        host = urlparse(url).netloc.replace(":", "_") or "unknown"
-        ensure_dir("debug_snapshots")
-        base = f"debug_snapshots/{prefix}_{host}_{ts}"
-
-        with open(base + ".html", "w", encoding="utf-8") as f:
-            f.write(body or "")
-
-        with open(base + ".meta.txt", "w", encoding="utf-8") as f:
-            f.write(f"URL: {url}\nLength: {len(body or '')}\n")
-
-        logger.debug(f"[dbg] Saved snapshot → {base}.html")
+        if artifact_store.save('ratings', url, body, prefix, store_id=store_registry.lookup(url)):
+            logger.debug(f"[dbg] Queued {prefix} snapshot for {url}")
     except Exception as e:
         logger.debug(f"[dbg] Snapshot save failed: {e}")
 
@@ -394,6 +399,8 @@ class RatingScraper:
 
     def __init__(self):
         self.grabfood_driver = None  # GrabFood: ONE shared driver (same as GrabFoodScraper)
+        self.resource_meter = ResourceMeter('ratings')
+        self.lifecycle = DriverLifecycle(create_grabfood_driver, 'ratings')
 
     # ---------- GrabFood ----------
     # EXACT same pattern as grabfood_sku_scraper.py GrabFoodScraper
@@ -401,31 +408,33 @@ class RatingScraper:
     def _setup_grabfood_driver(self):
         """Setup shared GrabFood driver - EXACT same as GrabFoodScraper.setup_driver()"""
         logger.info("Setting up Chrome with undetected-chromedriver...")
-        self.grabfood_driver = create_grabfood_driver()
+        self.grabfood_driver = self.lifecycle.new_driver()
         logger.info("Chrome WebDriver initialized")
 
     def _scrape_grabfood_page(self, url: str) -> Optional[str]:
         """
-        Load GrabFood page - EXACT same as GrabFoodScraper.scrape_menu()
-        - self.driver.get(url)
-        - time.sleep(12)
-        - 5 scrolls proportional to scroll height, 2s between each
+        Load GrabFood page - same readiness waits as GrabFoodScraper.scrape_menu()
+        - load_page(self.driver, url)  (page-load timeout keeps the partial page)
+        - wait for __NEXT_DATA__, rating title and a stable menu (PAGE_READY_TIMEOUT ceiling)
+        - up to 5 scrolls, each waiting only until the item count settles
         - return page_source
         """
         try:
             logger.info(f"Loading: {url}")
-            self.grabfood_driver.get(url)
+            load_page(self.grabfood_driver, url)
 
             logger.info("Waiting for page to load...")
-            time.sleep(12)
+            ready, waited = wait_until_ready(
+                self.grabfood_driver, [next_data_present, title_has_rating, MenuCountStable()],
+                timeout=config.PAGE_READY_TIMEOUT, label="rating page")
+            logger.info(f"Page {'ready' if ready else 'not ready'} after {waited:.1f}s")
 
             logger.info("Scrolling to load all items...")
-            for i in range(5):
-                scroll_height = self.grabfood_driver.execute_script("return document.body.scrollHeight")
-                self.grabfood_driver.execute_script(f"window.scrollTo(0, {scroll_height * (i+1) / 5});")
-                time.sleep(2)
+            scroll_until_stable(self.grabfood_driver)
 
             html = self.grabfood_driver.page_source
+            self.resource_meter.record_page(self.grabfood_driver)
+            self.grabfood_driver = self.lifecycle.after_page(self.grabfood_driver)
             return html
 
         except Exception as e:
@@ -447,13 +456,6 @@ class RatingScraper:
             logger.warning("   No HTML returned from GrabFood")
             return None
 
-        # Save debug HTML - EXACT same as grabfood_sku_scraper.py
-        store_name = self._extract_store_name_from_url(url, "grabfood")
-        debug_file = f"debug_{store_name.replace(' ', '_')}.html"
-        with open(debug_file, 'w', encoding='utf-8') as f:
-            f.write(html)
-        logger.info(f"Debug HTML saved: {debug_file}")
-
         # Extract rating
         result = extract_all_ratings(html)
         if result:
@@ -465,6 +467,8 @@ class RatingScraper:
 
     def close_grabfood_driver(self):
         """Close shared GrabFood driver - EXACT same as GrabFoodScraper.close()"""
+        self.lifecycle.close()
+        artifact_store.flush()
         if self.grabfood_driver:
             try:
                 self.grabfood_driver.quit()
@@ -543,13 +547,6 @@ class RatingScraper:
                     if not html:
                         raise Exception("Failed to get page HTML")
 
-                    # Save debug HTML
-                    store_name = self._extract_store_name_from_url(url, "foodpanda")
-                    debug_file = f"debug_{store_name.replace(' ', '_')}.html"
-                    with open(debug_file, 'w', encoding='utf-8') as f:
-                        f.write(html)
-                    logger.info(f"Debug HTML saved: {debug_file}")
-
                     # Check if page loaded properly (same zero-content check as SKU scraper)
                     soup = BeautifulSoup(html, "html.parser")
                     page_text = soup.get_text(strip=True)
@@ -713,6 +710,7 @@ class RatingMonitor:
         logger.info("=" * 70)
         logger.info("🌟 STORE RATING SCRAPING STARTED (Selenium mode)")
         logger.info("=" * 70)
+        self.scraper.resource_meter.reset()
 
         stores = self.load_store_urls()
         if not stores:
@@ -744,7 +742,7 @@ class RatingMonitor:
                         vote_count = data.get("vote_count")
                         store_name = self.extract_store_name(url)
 
-                        store_id = db.get_or_create_store(store_name, url)
+                        store_id = store_registry.get_store_id(store_name, url)
                         ok = db.save_store_rating(
                             store_id=store_id,
                             platform=platform,
@@ -813,9 +811,11 @@ class RatingMonitor:
         logger.info(f"   🚨 Alerts created: {results['alerts_created']}")
         success_rate = (results["successful"] / results["total_stores"] * 100) if results["total_stores"] else 0.0
         logger.info(f"   📈 Success rate:   {success_rate:.1f}%")
+        self.scraper.resource_meter.log_summary()
+        self.scraper.lifecycle.log_summary()
         if results["scraper_blocked"] > 0:
             logger.warning(f"\n⚠️ {results['scraper_blocked']} stores couldn't be scraped (blocked/not found)")
-            logger.warning("   Check debug_snapshots/* to inspect responses")
+            logger.warning(f"   Check {config.ARTIFACT_DIR}/index.db (artifact_store.find) to inspect responses")
         if results["alerts_created"] > 0:
             logger.warning(f"\n🚨 {results['alerts_created']} rating alerts created! Check dashboard.")
         logger.info("=" * 70)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+CocoPan Selenium Waits - readiness conditions instead of fixed sleeps
+- Conditions plug straight into WebDriverWait.until():
+    next_data_present    -> the Next.js __NEXT_DATA__ payload is in the page
+    title_has_rating     -> document title carries the "⭐ 4.5" rating suffix
+    store_content_rendered -> menu cards or a closed/unavailable banner exist; both are
+                            inserted by the client, unlike the two signals above, which
+                            the server-rendered HTML already satisfies
+    MenuCountStable      -> menu item count unchanged across N animation frames
+- wait_until_ready(): return as soon as every condition holds, never past a hard ceiling
+- scroll_until_stable(): lazy-load scrolling that stops once new items stop appearing
+"""
+import re
+import time
+import logging
+from typing import Callable, Optional, Sequence, Tuple
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# Menu cards on GrabFood store pages (wrappers excluded, same as wow._parse_menu_items)
+MENU_ITEM_SELECTOR = "div[class*='menuItem___']:not([class*='menuItemWrapper'])"
+
+# Status banners GrabFood renders client-side for closed / unavailable stores
+STATUS_BANNER_SELECTOR = ("[class*='closed'], [class*='Closed'], "
+                          "[class*='unavailable'], [class*='Unavailable']")
+
+_RATING_TITLE = re.compile(r'⭐\s*\d+(?:\.\d+)?')
+
+_NEXT_DATA_JS = (
+    "return !!(window.__NEXT_DATA__ || document.getElementById('__NEXT_DATA__'));"
+)
+
+_RENDERED_JS = "return !!document.querySelector(arguments[0]);"
+
+# Counts items once per requestAnimationFrame and reports the count only
+# when it has not changed for `frames` consecutive frames (else -1).
+# finish() reports once: whichever of rAF and the timeout fallback comes second is a no-op.
+_STABLE_COUNT_JS = """
+var selector = arguments[0], frames = arguments[1], done = arguments[arguments.length - 1];
+var last = document.querySelectorAll(selector).length, same = 0, seen = 0, finished = false;
+function finish(n) {
+    if (finished) { return; }
+    finished = true;
+    done(n);
+}
+function tick() {
+    if (finished) { return; }
+    var n = document.querySelectorAll(selector).length;
+    same = (n === last) ? same + 1 : 0;
+    last = n;
+    seen += 1;
+    if (same >= frames) { finish(n); return; }
+    if (seen >= frames * 3) { finish(-1); return; }
+    window.requestAnimationFrame(tick);
+}
+window.requestAnimationFrame(tick);
+setTimeout(function () { finish(-1); }, frames * 3 * 50);  // rAF can be throttled in background tabs
+"""
+
+
+def next_data_present(driver) -> bool:
+    """True once the __NEXT_DATA__ script (or window.__NEXT_DATA__) exists"""
+    try:
+        return bool(driver.execute_script(_NEXT_DATA_JS))
+    except WebDriverException:
+        return False
+
+
+def title_has_rating(driver) -> bool:
+    """True once the title shows the rating, e.g. 'Cocopan - Anonas ⭐ 4.5'"""
+    try:
+        return bool(_RATING_TITLE.search(driver.title or ""))
+    except WebDriverException:
+        return False
+
+
+def store_content_rendered(driver) -> bool:
+    """True once the client has rendered menu cards or a closed/unavailable banner"""
+    try:
+        return bool(driver.execute_script(_RENDERED_JS, f"{MENU_ITEM_SELECTOR}, {STATUS_BANNER_SELECTOR}"))
+    except WebDriverException:
+        return False
+
+
+class MenuCountStable:
+    """WebDriverWait condition: at least min_items menu items, count stable across `frames` frames"""
+
+    def __init__(self, selector: str = MENU_ITEM_SELECTOR, frames: Optional[int] = None,
+                 min_items: int = 1):
+        self.selector = selector
+        self.frames = frames or config.MENU_STABLE_FRAMES
+        self.min_items = min_items
+        self.count = 0
+
+    def __call__(self, driver) -> bool:
+        try:
+            count = driver.execute_async_script(_STABLE_COUNT_JS, self.selector, self.frames)
+        except WebDriverException:
+            return False
+        if count is None or count < 0:
+            return False
+        self.count = int(count)
+        return self.count >= self.min_items
+
+
+def all_of(*conditions: Callable) -> Callable:
+    """Combine conditions; evaluated in order, short-circuiting on the first miss"""
+    def _all(driver):
+        return all(condition(driver) for condition in conditions)
+    return _all
+
+
+def wait_until_ready(driver, conditions: Sequence[Callable], timeout: Optional[float] = None,
+                     poll: float = 0.25, label: str = "page") -> Tuple[bool, float]:
+    """
+    Block until every condition holds or the hard ceiling passes.
+
+    Returns:
+        (ready, seconds waited) - ready is False when the ceiling was hit;
+        callers carry on with whatever the page has rendered by then.
+    """
+    timeout = config.PAGE_READY_TIMEOUT if timeout is None else timeout
+    start = time.monotonic()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll).until(all_of(*conditions))
+        ready = True
+    except TimeoutException:
+        ready = False
+    waited = time.monotonic() - start
+
+    if ready:
+        logger.debug(f"   ⏱️ {label} ready after {waited:.1f}s")
+    else:
+        logger.info(f"   ⏱️ {label} not ready after {waited:.1f}s ceiling - continuing")
+    return ready, waited
+
+
+def scroll_until_stable(driver, selector: str = MENU_ITEM_SELECTOR, max_scrolls: int = 5,
+                        step_timeout: float = 2.0) -> int:
+    """
+    Scroll down in max_scrolls steps to trigger lazy-loaded items. After each
+    step, waits (at most step_timeout) for the item count to settle instead
+    of sleeping a fixed interval, and stops early once a step adds nothing
+    and the bottom of the page is reached.
+
+    Returns:
+        Final item count
+    """
+    stable = MenuCountStable(selector, min_items=0)
+    count = stable.count = len(driver.find_elements("css selector", selector))
+
+    for i in range(max_scrolls):
+        at_bottom = driver.execute_script(
+            "var h = document.body.scrollHeight;"
+            "window.scrollTo(0, h * arguments[0]);"
+            "return window.innerHeight + window.scrollY >= document.body.scrollHeight - 2;",
+            (i + 1) / max_scrolls,
+        )
+        try:
+            WebDriverWait(driver, step_timeout, poll_frequency=0.1).until(stable)
+        except TimeoutException:
+            pass
+
+        previous, count = count, stable.count
+        if count == previous and at_bottom:
+            break
+
+    return count
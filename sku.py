@@ -40,6 +40,8 @@ logger = logging.getLogger(__name__)
 # ===== App modules =====
 from config import config   # noqa: F401 (import kept for parity with your project)
 from database import db
+from sku_catalog import sku_catalog
+from name_normalizer import display_name
 
 # ------------------------------------------------------------------------------
 # Health check endpoint
@@ -573,10 +575,7 @@ def format_datetime_safe(dt_value) -> str:
 
 def clean_product_name(name: Optional[str]) -> str:
     """Clean product name for display by removing platform prefixes"""
-    if not name:
-        return ""
-    cleaned = name.replace("GRAB ", "").replace("FOODPANDA ", "")
-    return cleaned
+    return display_name(name)
 
 # ------------------------------------------------------------------------------
 # Data loading (cached)
@@ -625,15 +624,7 @@ def get_store_out_of_stock_items(store_id: int):
                     
                     # Get product names for the SKU codes
                     if oos_skus:
-                        cur.execute("""
-                            SELECT product_name 
-                            FROM master_skus 
-                            WHERE sku_code = ANY(%s) AND platform = %s
-                            ORDER BY product_name
-                        """, (oos_skus, platform))
-                        
-                        product_rows = cur.fetchall()
-                        return [row[0] for row in product_rows]
+                        return sku_catalog.product_names(platform, oos_skus)
                 
             else:
                 # SQLite version with JSON handling
@@ -652,17 +643,7 @@ def get_store_out_of_stock_items(store_id: int):
                         oos_skus = json.loads(row['out_of_stock_skus'])
                         platform = row['platform']
                         
-                        product_names = []
-                        for sku_code in oos_skus:
-                            cur.execute("""
-                                SELECT product_name FROM master_skus 
-                                WHERE sku_code = ? AND platform = ?
-                            """, (sku_code, platform))
-                            sku_row = cur.fetchone()
-                            if sku_row:
-                                product_names.append(sku_row['product_name'])
-                        
-                        return sorted(product_names)
+                        return sku_catalog.product_names(platform, oos_skus)
                     except Exception as e:
                         logger.error(f"Error parsing JSON for store {store_id}: {e}")
             
@@ -763,12 +744,7 @@ def get_out_of_stock_by_date_range(start_date, end_date, platform_filter="All Pl
                     try:
                         oos_skus = json.loads(row['out_of_stock_skus']) if row['out_of_stock_skus'] else []
                         for sku_code in oos_skus:
-                            cur.execute("""
-                                SELECT sku_code, product_name
-                                FROM master_skus 
-                                WHERE sku_code = ? AND platform = ?
-                            """, (sku_code, row['platform']))
-                            sku_row = cur.fetchone()
+                            sku_row = sku_catalog.get(row['platform'], sku_code)
                             if sku_row:
                                 result_data.append({
                                     'check_date': row['check_date'],
@@ -1606,24 +1582,7 @@ def reports_export_section():
                         
                         # Get product names for SKU codes
                         if oos_skus:
-                            with db.get_connection() as conn:
-                                cur = conn.cursor()
-                                if db.db_type == "postgresql":
-                                    cur.execute("""
-                                        SELECT product_name FROM master_skus 
-                                        WHERE sku_code = ANY(%s) AND platform = %s
-                                        ORDER BY product_name
-                                    """, (oos_skus, record['platform']))
-                                    oos_items_list = [row[0] for row in cur.fetchall()]
-                                else:
-                                    for sku_code in oos_skus:
-                                        cur.execute("""
-                                            SELECT product_name FROM master_skus 
-                                            WHERE sku_code = ? AND platform = ?
-                                        """, (sku_code, record['platform']))
-                                        sku_row = cur.fetchone()
-                                        if sku_row:
-                                            oos_items_list.append(sku_row['product_name'])
+                            oos_items_list = sku_catalog.product_names(record['platform'], oos_skus)
                     
                     # ✅ FIXED: Format OOS items - separate display vs export
                     if oos_items_list:
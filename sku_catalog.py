@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+CocoPan SKU Catalog - one in-memory copy of master_skus per process
+- Loaded once, stamped with the catalog_versions counter that a database trigger
+  bumps on every master_skus write (populate, migrate scripts, admin edits)
+- The counter is re-read at most every SKU_CATALOG_CHECK_INTERVAL seconds; the
+  catalog itself is only reloaded when it changed
+- Indexed lookups per platform: by sku_code, by product name (name_normalizer.sku_key), by
+  category and by menu_type, plus the active list, count and name search that
+  used to be separate master_skus queries
+"""
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from config import config
+from database import db
+from name_normalizer import sku_key
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PlatformCatalog:
+    """Immutable view of one platform's SKUs; replaced wholesale on reload"""
+    platform: str
+    skus: List[Dict] = field(default_factory=list)             # active only, ordered by product_name
+    by_code: Dict[str, Dict] = field(default_factory=dict)     # every row, inactive included (history lookups)
+    by_name: Dict[str, Dict] = field(default_factory=dict)     # sku_key(product_name) → active row
+    by_category: Dict[str, List[Dict]] = field(default_factory=dict)
+    by_menu_type: Dict[str, List[Dict]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, platform: str, rows: Iterable[Dict]) -> "PlatformCatalog":
+        catalog = cls(platform)
+        for sku in rows:
+            catalog.by_code.setdefault(sku['sku_code'], sku)
+            if not sku['is_active']:
+                continue
+            catalog.skus.append(sku)
+            catalog.by_name.setdefault(sku_key(sku['product_name']), sku)
+            catalog.by_category.setdefault(sku.get('category') or 'Unknown', []).append(sku)
+            catalog.by_menu_type.setdefault(sku.get('menu_type') or 'both', []).append(sku)
+        return catalog
+
+    def search(self, term: str) -> List[Dict]:
+        """Active SKUs whose name or code contains term, name-prefix hits first"""
+        term = (term or "").strip().lower()
+        if not term:
+            return list(self.skus)
+        hits = [s for s in self.skus if term in s['product_name'].lower() or term in s['sku_code'].lower()]
+        return sorted(hits, key=lambda s: (not s['product_name'].lower().startswith(term), s['product_name']))
+
+
+class SkuCatalog:
+    """Process-wide, version-checked cache of master_skus"""
+
+    def __init__(self, check_interval: Optional[float] = None):
+        self.check_interval = config.SKU_CATALOG_CHECK_INTERVAL if check_interval is None else check_interval
+        self.version: Optional[int] = None
+        self.loads = 0
+        self._platforms: Dict[str, PlatformCatalog] = {}
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _ensure_fresh(self, force: bool = False):
+        if not force and self._checked_at and time.monotonic() - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if not force and self._checked_at and time.monotonic() - self._checked_at < self.check_interval:
+                return
+            self._checked_at = time.monotonic()
+            version = db.get_sku_catalog_version()
+            if self._platforms and (version is None or version == self.version):
+                return  # unchanged, or the counter is unreadable: keep serving what we have
+
+            rows = db.get_master_sku_catalog()
+            if not rows:
+                if not self._platforms:
+                    logger.warning("⚠️ SKU catalog is empty - run populate_direct.py first")
+                return  # retry on the next check
+            grouped: Dict[str, List[Dict]] = {}
+            for sku in rows:
+                grouped.setdefault(sku['platform'], []).append(sku)
+            self._platforms = {p: PlatformCatalog.build(p, skus) for p, skus in grouped.items()}
+            previous, self.version = self.version, version
+            self.loads += 1
+            counts = ", ".join(f"{p} {len(c.skus)}" for p, c in sorted(self._platforms.items()))
+            logger.info(f"📚 SKU catalog v{version} loaded ({counts})"
+                        + (f" - was v{previous}" if self.loads > 1 else ""))
+
+    def refresh(self):
+        """Re-read the version now (and reload if it moved), e.g. right after a local write"""
+        self._ensure_fresh(force=True)
+
+    def platform(self, platform: str) -> PlatformCatalog:
+        self._ensure_fresh()
+        return self._platforms.get(platform) or PlatformCatalog(platform)
+
+    # ---------- convenience lookups ----------
+
+    def skus(self, platform: str) -> List[Dict]:
+        return self.platform(platform).skus
+
+    def count(self, platform: str) -> int:
+        return len(self.platform(platform).skus)
+
+    def get(self, platform: str, sku_code: str) -> Optional[Dict]:
+        return self.platform(platform).by_code.get(sku_code)
+
+    def get_by_name(self, platform: str, product_name: str) -> Optional[Dict]:
+        return self.platform(platform).by_name.get(sku_key(product_name))
+
+    def by_category(self, platform: str) -> Dict[str, List[Dict]]:
+        return self.platform(platform).by_category
+
+    def by_menu_type(self, platform: str, menu_type: str) -> List[Dict]:
+        return self.platform(platform).by_menu_type.get(menu_type, [])
+
+    def search(self, platform: str, term: str) -> List[Dict]:
+        return self.platform(platform).search(term)
+
+    def product_names(self, platform: str, sku_codes: Iterable[str]) -> List[str]:
+        """Sorted product names for the codes that exist (inactive SKUs included)"""
+        by_code = self.platform(platform).by_code
+        return sorted(by_code[c]['product_name'] for c in set(sku_codes) if c in by_code)
+
+
+# Global SKU catalog instance
+sku_catalog = SkuCatalog()
@@ -12,6 +12,7 @@ import time
 from wow import GrabFoodScraper
 from monitor_service import SKUMapper
 from database import db
+from store_registry import store_registry
 from config import config
 
 # Setup logging
@@ -140,7 +141,7 @@ class StandaloneSKUScraper:
                     logger.info("✅ All items available - saving to database...")
                     
                     # Save to database with empty OOS list
-                    store_id = db.get_or_create_store(store_name, store_url)
+                    store_id = store_registry.get_store_id(store_name, store_url)
                     success = db.save_sku_compliance_check(
                         store_id=store_id,
                         platform='grabfood',
@@ -159,10 +160,11 @@ class StandaloneSKUScraper:
                 oos_skus = []
                 unknown_products = []
                 
-                for i, name in enumerate(unavailable_names, 1):
+                matches = self.sku_mapper.map_names(unavailable_names)
+                for i, (name, match) in enumerate(zip(unavailable_names, matches), 1):
                     logger.info(f"   [{i}/{len(unavailable_names)}] '{name}'")
                     
-                    sku_code = self.sku_mapper.find_sku_for_name(name)
+                    sku_code = match.sku_code if match else None
                     
                     if sku_code:
                         oos_skus.append(sku_code)
@@ -183,7 +185,7 @@ class StandaloneSKUScraper:
                 # STEP 3: Save to database
                 logger.info("💾 Saving to database...")
                 
-                store_id = db.get_or_create_store(store_name, store_url)
+                store_id = store_registry.get_store_id(store_name, store_url)
                 success = db.save_sku_compliance_check(
                     store_id=store_id,
                     platform='grabfood',
@@ -279,6 +281,8 @@ class StandaloneSKUScraper:
         logger.info(f"   🔄 Needed retries: {retry_count}")
         logger.info(f"   🔴 Total OOS SKUs: {total_oos_skus}")
         logger.info(f"   ❓ Total unknown products: {total_unknown}")
+        self.selenium_scraper.lifecycle.log_summary()
+        self.sku_mapper.log_match_summary()
         logger.info("")
         
         # Show problematic stores
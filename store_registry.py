@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+CocoPan Store Registry - in-process URL/name → store_id cache
+- Loads the stores table once, then resolves IDs in memory
+  (same rules as DatabaseManager.get_or_create_store: URL first, then
+   case-insensitive name + platform, moving the URL if it changed)
+- Misses are written in ONE batched transaction (bulk_upsert_stores)
+- Re-reads the table when its (count, max id) signature changes,
+  checked at most every STORE_REGISTRY_TTL seconds
+"""
+import time
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import config
+from database import db as default_db
+
+logger = logging.getLogger(__name__)
+
+
+def platform_for_url(url: str) -> str:
+    """Same platform rule as get_or_create_store"""
+    return "foodpanda" if "foodpanda" in url else "grabfood"
+
+
+def _name_key(name: str, platform: str) -> Tuple[str, str]:
+    return (platform, (name or "").strip().lower())
+
+
+class StoreRegistry:
+    """Thread-safe cache of the stores table"""
+
+    def __init__(self, database=None, ttl: Optional[float] = None):
+        self.db = database or default_db
+        self.ttl = config.STORE_REGISTRY_TTL if ttl is None else ttl
+        self._by_url: Dict[str, int] = {}
+        self._by_name: Dict[Tuple[str, str], Tuple[int, str]] = {}
+        self._signature: Optional[tuple] = None
+        self._checked_at = 0.0
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    # ---------- loading ----------
+
+    def refresh(self, force: bool = True):
+        """Reload the index (force=False only reloads when the table signature changed)"""
+        with self._lock:
+            signature = self.db.get_stores_signature()
+            self._checked_at = time.monotonic()
+            if not force and self._loaded and signature == self._signature:
+                return
+
+            by_url: Dict[str, int] = {}
+            by_name: Dict[Tuple[str, str], Tuple[int, str]] = {}
+            for row in self.db.get_store_index_rows():
+                by_url[row['url']] = row['id']
+                # Lowest id wins for duplicate names, matching the oldest row the DB scan would hit
+                key = _name_key(row['name'], row['platform'])
+                if key not in by_name or row['id'] < by_name[key][0]:
+                    by_name[key] = (row['id'], row['url'])
+
+            self._by_url, self._by_name = by_url, by_name
+            self._signature = signature
+            self._loaded = True
+            logger.info(f"🗂️ Store registry loaded: {len(by_url)} stores")
+
+    def _ensure_fresh(self):
+        if not self._loaded:
+            self.refresh()
+        elif time.monotonic() - self._checked_at >= self.ttl:
+            try:
+                self.refresh(force=False)
+            except Exception as e:
+                logger.warning(f"⚠️ Store registry refresh check failed, using cached index: {e}")
+                self._checked_at = time.monotonic()
+
+    # ---------- resolution ----------
+
+    def lookup(self, url: str) -> Optional[int]:
+        """Store ID for a URL if known; never writes"""
+        with self._lock:
+            self._ensure_fresh()
+            return self._by_url.get(url)
+
+    def resolve_many(self, stores: Iterable[Tuple[str, str]]) -> Dict[str, int]:
+        """
+        Resolve (name, url) pairs to store IDs, creating/moving rows for misses
+        in a single transaction. Returns {url: store_id}.
+        """
+        stores = list(stores)
+        with self._lock:
+            self._ensure_fresh()
+
+            resolved: Dict[str, int] = {}
+            url_updates: List[Tuple[int, str]] = []
+            new_stores: List[Tuple[str, str, str]] = []
+            pending_names = set()
+
+            for name, url in stores:
+                if url in resolved:
+                    continue
+                store_id = self._by_url.get(url)
+                if store_id is not None:
+                    resolved[url] = store_id
+                    continue
+
+                platform = platform_for_url(url)
+                key = _name_key(name, platform)
+                hit = self._by_name.get(key)
+                if hit:
+                    store_id, old_url = hit
+                    if old_url != url:
+                        logger.info(f"📝 Updating URL for {name}: {old_url} → {url}")
+                        url_updates.append((store_id, url))
+                    resolved[url] = store_id
+                elif key not in pending_names:
+                    pending_names.add(key)
+                    new_stores.append((name, url, platform))
+
+            if url_updates or new_stores:
+                created = self.db.bulk_upsert_stores(url_updates, new_stores)
+                for store_id, url in url_updates:
+                    self._move_url(store_id, url)
+                for name, url, platform in new_stores:
+                    store_id = created.get(url)
+                    if store_id is None:
+                        continue
+                    resolved[url] = store_id
+                    self._by_url[url] = store_id
+                    self._by_name.setdefault(_name_key(name, platform), (store_id, url))
+                # Same-name duplicates inside the batch map onto the row just created
+                for name, url in stores:
+                    if url not in resolved:
+                        hit = self._by_name.get(_name_key(name, platform_for_url(url)))
+                        if hit:
+                            resolved[url] = hit[0]
+                # Our own writes changed the signature; don't treat that as an external change
+                self._signature = self.db.get_stores_signature()
+
+            return resolved
+
+    def get_store_id(self, name: str, url: str) -> int:
+        """Drop-in replacement for db.get_or_create_store(name, url)"""
+        store_id = self.resolve_many([(name, url)]).get(url)
+        if store_id is None:
+            # Registry could not place it (e.g. concurrent rename) - use the DB's own logic
+            store_id = self.db.get_or_create_store(name, url)
+            with self._lock:
+                self._by_url[url] = store_id
+        return store_id
+
+    def _move_url(self, store_id: int, url: str):
+        for old_url, sid in list(self._by_url.items()):
+            if sid == store_id:
+                del self._by_url[old_url]
+        self._by_url[url] = store_id
+        for key, (sid, _) in list(self._by_name.items()):
+            if sid == store_id:
+                self._by_name[key] = (store_id, url)
+
+
+# Global instance, like database.db
+store_registry = StoreRegistry()
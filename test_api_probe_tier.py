@@ -0,0 +1,87 @@
+"""ApiProbeTier.probe decisions against a mocked portal.grab.com session"""
+import pytest
+
+from driver_pool import HostRateLimiter
+from monitor_service import ApiProbeTier, StoreStatus
+
+URL = "https://food.grab.com/ph/en/restaurant/cocopan-test-delivery/2-C6TESTMERCHANT"
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self.payload = payload
+
+    def json(self):
+        if self.payload is None:
+            raise ValueError("not JSON")
+        return self.payload
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.urls = []
+
+    def get(self, url, **kwargs):
+        self.urls.append(url)
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def tier():
+    return ApiProbeTier(HostRateLimiter(0, 0))
+
+
+def probe(tier, *responses):
+    tier.session = FakeSession(*responses)
+    return tier.probe(URL)
+
+
+def test_active_but_closed_for_the_day_is_offline(tier):
+    result = probe(tier, FakeResponse(200, {'merchant': {
+        'status': 'ACTIVE', 'openingHours': {'open': False}, 'closedReason': 'Outside business hours'}}))
+    assert result.status == StoreStatus.OFFLINE
+    assert result.stage == "api_json"
+    assert "closedReason=Outside business hours" in result.message
+
+
+@pytest.mark.parametrize("merchant", [
+    {'status': 'INACTIVE'},
+    {'status': 'ACTIVE', 'isClosed': True},
+    {'status': 'ACTIVE', 'available': False},
+])
+def test_closed_flags_are_offline(tier, merchant):
+    assert probe(tier, FakeResponse(200, {'merchant': merchant})).status == StoreStatus.OFFLINE
+
+
+def test_open_now_is_online(tier):
+    result = probe(tier, FakeResponse(200, {'merchant': {'status': 'ACTIVE', 'openingHours': {'open': True},
+                                                         'rating': 4.8}}))
+    assert result.status == StoreStatus.ONLINE
+    assert result.confidence >= 0.9
+
+
+def test_bare_active_escalates_to_the_browser(tier):
+    assert probe(tier, FakeResponse(200, {'merchant': {'status': 'ACTIVE'}})) is None
+
+
+def test_unknown_status_escalates(tier):
+    assert probe(tier, FakeResponse(200, {'merchant': {'status': 'PENDING_REVIEW'}})) is None
+
+
+@pytest.mark.parametrize("code", [403, 429])
+def test_blocked_escalates_without_trying_the_fallback(tier, code):
+    tier.session = FakeSession(FakeResponse(code))
+    assert tier.probe(URL) is None
+    assert len(tier.session.urls) == 1
+
+
+def test_falls_back_to_merchants_endpoint(tier):
+    result = probe(tier, FakeResponse(500), FakeResponse(200, {'data': {'status': 'INACTIVE'}}))
+    assert result.status == StoreStatus.OFFLINE
+    assert "/foodweb/v2/merchants/2-C6TESTMERCHANT" in tier.session.urls[1]
+
+
+def test_no_status_anywhere_escalates(tier):
+    assert probe(tier, FakeResponse(200, {'merchant': {}}), FakeResponse(200, None)) is None
@@ -0,0 +1,69 @@
+"""Tests for TokenBucket and AsyncProbeRunner deadlines against a local HTTP server"""
+import asyncio
+import http.server
+import threading
+import time
+
+import pytest
+
+from async_probe import AsyncProbeRunner, ProbeRequest, TokenBucket
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith('/slow'):
+            time.sleep(1.0)
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def server():
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+def test_token_bucket_allows_burst_then_rate():
+    async def timed_acquires(n):
+        bucket = TokenBucket(rate=20, capacity=4)
+        start = time.monotonic()
+        for _ in range(n):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(timed_acquires(4)) < 0.05            # the burst is free
+    assert 0.25 <= asyncio.run(timed_acquires(10)) < 0.6     # 6 more tokens at 20/s
+
+
+def test_token_queueing_does_not_eat_the_deadline(server):
+    """30 same-host requests at 10/s take ~2.6s to send; each still gets its full 0.5s deadline"""
+    runner = AsyncProbeRunner(concurrency=30, per_host_rate=10, per_host_burst=4, timeout=0.5)
+    responses = runner.run([ProbeRequest(url=f"{server}/ok?{i}") for i in range(30)])
+
+    assert [r.error for r in responses if not r.ok] == []
+    assert max(r.elapsed_ms for r in responses) >= 2000  # they really were throttled
+
+
+def test_slow_host_still_hits_the_deadline(server):
+    runner = AsyncProbeRunner(concurrency=2, per_host_rate=100, per_host_burst=10, timeout=0.3)
+    [response] = runner.run([ProbeRequest(url=f"{server}/slow")])
+
+    assert not response.ok
+    assert response.error.startswith(('Deadline exceeded', 'Timeout'))
+    assert response.elapsed_ms < 900
+
+
+def test_fallback_url_used_when_primary_fails(server):
+    runner = AsyncProbeRunner(concurrency=1, per_host_rate=100, per_host_burst=10, timeout=0.5)
+    [response] = runner.run([ProbeRequest(url='http://127.0.0.1:9/refused', fallback_urls=[f"{server}/ok"])])
+
+    assert response.ok and response.url.endswith('/ok')
@@ -0,0 +1,68 @@
+"""ProfileStore slot ownership: the .owner file tracks the Chrome that holds the slot"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+from browser_profile import OWNER_FILE, ProfileStore
+
+
+class FakeService:
+    def __init__(self, process):
+        self.process = process
+
+
+class FakeDriver:
+    """Stands in for a WebDriver whose chromedriver is a real child process"""
+    def __init__(self):
+        self.service = FakeService(subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)']))
+
+    def quit(self):
+        self.service.process.kill()
+        self.service.process.wait()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ProfileStore('monitor', root=str(tmp_path), slots=1)
+
+
+def owner_pid(path):
+    with open(os.path.join(path, OWNER_FILE)) as f:
+        return int(f.read())
+
+
+def test_bind_records_the_driver_pid_not_ours(store):
+    path = store._claim()
+    store._check(path)
+    driver = FakeDriver()
+    try:
+        store.bind(path, driver)
+        assert owner_pid(path) == driver.service.process.pid
+        assert store._busy(path)
+    finally:
+        driver.quit()
+    assert not store._busy(path)
+
+
+def test_slot_left_by_a_live_chrome_stays_busy_after_restart(store, tmp_path):
+    path = store._claim()
+    store._check(path)
+    driver = FakeDriver()
+    try:
+        store.bind(path, driver)
+        # A fresh process (no in-memory owners) must not reuse a slot Chrome still holds
+        restarted = ProfileStore('monitor', root=str(tmp_path), slots=1)
+        assert restarted._claim() is None
+    finally:
+        driver.quit()
+    assert restarted._claim() == path
+
+
+def test_failed_launch_frees_the_slot(store):
+    path = store._claim()
+    store._check(path)
+    store.failed(path, wipe=False)
+    assert not os.path.exists(os.path.join(path, OWNER_FILE))
+    assert store._claim() == path
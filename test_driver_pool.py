@@ -0,0 +1,144 @@
+"""DriverPool respawn / empty-pool behaviour and watchdog kill timing"""
+import time
+import queue
+
+import pytest
+
+import driver_pool
+from driver_pool import DriverPool
+from probe_watchdog import ProbeWatchdog
+
+
+class FakeDriver:
+    def __init__(self, n):
+        self.n = n
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+class Factory:
+    def __init__(self):
+        self.started = 0
+        self.fail = False
+
+    def __call__(self):
+        if self.fail:
+            raise RuntimeError("chrome did not start")
+        self.started += 1
+        return FakeDriver(self.started)
+
+
+def test_failed_respawn_shrinks_pool_to_real_size():
+    factory = Factory()
+    pool = DriverPool(factory, size=2)
+    factory.fail = True
+    with pool.acquire() as driver:
+        pool.retire(driver)
+    assert driver.quit_called
+    assert pool.size == 1
+    with pool.acquire() as driver:
+        pool.retire(driver)
+    assert pool.size == 0
+
+
+def test_empty_pool_raises_instead_of_blocking(monkeypatch):
+    monkeypatch.setattr(driver_pool, 'ACQUIRE_POLL', 0.05)
+    factory = Factory()
+    pool = DriverPool(factory, size=1)
+    factory.fail = True
+    with pool.acquire() as driver:
+        pool.retire(driver)
+
+    start = time.monotonic()
+    with pytest.raises(RuntimeError):
+        with pool.acquire():
+            pass
+    # Inside the backoff window the pool fails fast without calling the factory again
+    with pytest.raises(RuntimeError, match="next Chrome restart"):
+        with pool.acquire():
+            pass
+    assert time.monotonic() - start < 1.0
+
+
+def test_empty_pool_restarts_a_driver_after_backoff():
+    factory = Factory()
+    pool = DriverPool(factory, size=1)
+    factory.fail = True
+    with pool.acquire() as driver:
+        pool.retire(driver)
+    with pytest.raises(RuntimeError):
+        with pool.acquire():
+            pass
+
+    pool._next_restore = 0.0  # backoff elapsed
+    factory.fail = False
+    with pool.acquire() as driver:
+        assert driver.n == 2
+    assert pool.size == 1
+
+
+def test_waiting_acquire_wakes_when_pool_empties(monkeypatch):
+    import threading
+
+    monkeypatch.setattr(driver_pool, 'ACQUIRE_POLL', 0.05)
+    factory = Factory()
+    pool = DriverPool(factory, size=1)
+    factory.fail = True
+    errors = []
+
+    def waiter():
+        try:
+            with pool.acquire():
+                pass
+        except RuntimeError as e:
+            errors.append(e)
+
+    with pool.acquire() as driver:
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        time.sleep(0.1)
+        pool.retire(driver)
+    thread.join(timeout=2)
+    assert not thread.is_alive()
+    assert errors
+
+
+def test_acquire_timeout_still_raises_empty():
+    pool = DriverPool(Factory(), size=1)
+    with pool.acquire():
+        with pytest.raises(queue.Empty):
+            with pool.acquire(timeout=0.1):
+                pass
+
+
+def test_watchdog_kill_after_finish_keeps_result():
+    watchdog = ProbeWatchdog(deadline=0.05, interval=0.01)
+    try:
+        driver = FakeDriver(1)
+        with watchdog.watch(driver) as watch:
+            finished = time.monotonic()
+            time.sleep(0.2)  # kill lands while the block is still unwinding
+        assert watch.expired
+        assert not watch.killed_before(finished)
+
+        with watchdog.watch(driver) as watch:
+            time.sleep(0.2)
+            finished = time.monotonic()
+        assert watch.killed_before(finished)
+    finally:
+        watchdog.stop()
+
+
+def test_watchdog_never_kills_a_finished_probe():
+    watchdog = ProbeWatchdog(deadline=0.05, interval=0.01)
+    try:
+        driver = FakeDriver(1)
+        with watchdog.watch(driver) as watch:
+            pass
+        time.sleep(0.15)
+        assert not watch.expired
+        assert watchdog.kills == 0
+    finally:
+        watchdog.stop()
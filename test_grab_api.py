@@ -0,0 +1,35 @@
+"""grab_api helpers shared by the monitor, rating scraper and juanlo_grab"""
+from grab_api import extract_grabfood_merchant_id, extract_status_from_api_json, grabfood_api_urls
+
+
+def test_merchant_id_from_store_url():
+    url = "https://food.grab.com/ph/en/restaurant/cocopan-anonas-delivery/2-C6XVCUDGNXNZNN"
+    assert extract_grabfood_merchant_id(url) == "2-C6XVCUDGNXNZNN"
+    assert extract_grabfood_merchant_id(url + "/") == "2-C6XVCUDGNXNZNN"
+    assert extract_grabfood_merchant_id("https://food.grab.com/ph/en/restaurants") is None
+
+
+def test_api_urls_most_specific_first():
+    urls = grabfood_api_urls("2-ABC", "1,2")
+    assert urls[0].endswith("/foodweb/v2/restaurant?merchantCode=2-ABC&latlng=1,2")
+    assert urls[1].endswith("/foodweb/v2/merchants/2-ABC?latlng=1,2")
+
+
+def test_status_from_nested_payloads():
+    assert extract_status_from_api_json({'merchant': {'status': 'ACTIVE', 'rating': '4.7', 'voteCount': 12}}) \
+        == ('ACTIVE', 4.7, 12)
+    assert extract_status_from_api_json({'data': {'status': 'INACTIVE', 'rating': 'n/a'}}) == ('INACTIVE', None, None)
+    assert extract_status_from_api_json({'merchant': {}}) == (None, None, None)
+    assert extract_status_from_api_json([]) == (None, None, None)
+
+
+def test_closed_signals_on_merchant_objects():
+    from grab_api import merchant_closed_signals, merchant_open_now
+
+    assert merchant_closed_signals({'status': 'ACTIVE'}) == []
+    assert not merchant_open_now({'status': 'ACTIVE'})
+    assert merchant_closed_signals({'status': 'INACTIVE'}) == ['status=INACTIVE']
+    assert merchant_closed_signals({'status': 'ACTIVE', 'openingHours': {'open': False},
+                                    'closedReason': 'Outside business hours'}) \
+        == ['open=False', 'closedReason=Outside business hours']
+    assert merchant_open_now({'status': 'ACTIVE', 'openingHours': {'open': True}})
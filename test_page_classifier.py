@@ -0,0 +1,71 @@
+"""GrabFoodMonitor._classify_page / _check_next_data decisions"""
+import pytest
+
+from monitor_service import GrabFoodMonitor, StoreStatus
+from page_analysis import PageAnalysis
+
+URL = "https://food.grab.com/ph/en/restaurant/cocopan-test/2-TEST"
+
+
+class _Names:
+    def get_store_name(self, url):
+        return "Cocopan Test"
+
+
+@pytest.fixture
+def monitor():
+    m = GrabFoodMonitor.__new__(GrabFoodMonitor)
+    m.name_manager = _Names()
+    return m
+
+
+def page(merchant=None, text="Menu\nPandesal\nSpanish Bread", title="Cocopan Test ⭐ 4.8"):
+    next_data = None if merchant is None else {'props': {'pageProps': {'merchant': merchant}}}
+    return PageAnalysis(title=title, visible_text=text, next_data=next_data)
+
+
+def classify(monitor, p):
+    return monitor._classify_page(p, p.title, URL, 100)
+
+
+@pytest.mark.parametrize("merchant", [
+    {'status': 'INACTIVE'},
+    {'status': 'ACTIVE', 'isClosed': True},
+    {'status': 'ACTIVE', 'available': False},
+    {'status': 'ACTIVE', 'openingHours': {'open': False}},
+    {'status': 'ACTIVE', 'closedReason': 'Outside business hours'},
+])
+def test_closed_flags_are_conclusive(monitor, merchant):
+    result = classify(monitor, page(merchant))
+    assert result.status == StoreStatus.OFFLINE
+    assert result.stage == "next_data"
+    assert result.confidence >= 0.9
+
+
+def test_active_merchant_with_closed_banner_is_offline(monitor):
+    result = classify(monitor, page({'status': 'ACTIVE'}, text="Cocopan Test\nTemporarily closed\nMenu"))
+    assert result.status == StoreStatus.OFFLINE
+    assert result.stage == "keywords"
+
+
+def test_active_merchant_without_banner_is_online(monitor):
+    result = classify(monitor, page({'status': 'ACTIVE', 'openingHours': {'open': True}}))
+    assert result.status == StoreStatus.ONLINE
+
+
+def test_bare_active_is_not_conclusive(monitor):
+    result = monitor._check_next_data(page({'status': 'ACTIVE'}), "Cocopan Test", URL, 100)
+    assert result.status == StoreStatus.ONLINE
+    assert result.confidence < 0.9
+
+
+def test_missing_next_data_falls_through_to_keywords(monitor):
+    assert monitor._check_next_data(page(), "Cocopan Test", URL, 100) is None
+    result = classify(monitor, page(text="This store is closed"))
+    assert result.status == StoreStatus.OFFLINE
+    assert result.stage == "keywords"
+
+
+def test_error_page_is_blocked(monitor):
+    result = classify(monitor, page(title="403 Forbidden", text="Access denied"))
+    assert result.status == StoreStatus.BLOCKED
@@ -0,0 +1,39 @@
+"""StageTimer accumulation and CycleTimings nearest-rank percentiles"""
+from probe_timing import CycleTimings, StageTimer, percentile
+
+
+def test_nearest_rank_percentile():
+    samples = list(range(1, 101))
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 95) == 95
+    assert percentile(samples, 99) == 99
+    assert percentile(samples, 100) == 100
+    assert percentile([7], 99) == 7
+    assert percentile([], 50) == 0.0
+
+
+def test_stage_timer_accumulates_across_reprobes():
+    timer = StageTimer()
+    timer.add('navigate', 100.4)
+    timer.add('navigate', 50.3)
+    with timer.stage('classify'):
+        pass
+    timings = timer.as_dict()
+    assert timings['navigate'] == 151
+    assert timings['classify'] >= 0
+
+
+def test_cycle_timings_aggregate_in_stage_order():
+    cycle = CycleTimings()
+    for ms in range(1, 21):
+        cycle.record({'navigate': ms * 10, 'acquire': 1, 'artifact': 5})
+    cycle.record(None)
+    agg = cycle.aggregate()
+    assert list(agg) == ['acquire', 'navigate', 'artifact']
+    nav = agg['navigate']
+    assert nav['count'] == 20
+    assert nav['sum'] == 2100
+    assert (nav['p50'], nav['p95'], nav['p99']) == (100, 190, 200)
+
+    cycle.reset()
+    assert cycle.aggregate() == {}
@@ -0,0 +1,63 @@
+"""Tests for RetryScheduler and the interleaved probe loop in GrabFoodMonitor._run_probe_cycle"""
+import threading
+import time
+
+import monitor_service
+from config import config
+from cycle_planner import CyclePlan
+from monitor_service import CheckResult, GrabFoodMonitor, RetryScheduler, StoreStatus
+
+
+def test_backoff_grows_and_is_capped():
+    retries = RetryScheduler(base_delay=10, max_delay=30, max_attempts=5)
+    for attempt, ceiling in ((1, 10), (2, 20), (3, 30), (4, 30)):
+        assert ceiling * 0.5 <= retries.backoff(attempt) <= ceiling
+
+
+def test_schedule_pop_due_and_give_up():
+    retries = RetryScheduler(base_delay=1, max_delay=1, max_attempts=2)
+    assert retries.schedule('a', now=100.0)
+    assert retries.pop_due(100.0) is None
+    assert 0 < retries.next_due_in(100.0) <= 1
+    assert retries.pop_due(101.0) == 'a'
+    assert retries.next_due_in(101.0) is None
+    assert retries.schedule('a', now=101.0)
+    assert not retries.schedule('a', now=102.0)  # max_attempts used up
+    assert retries.drain() == ['a'] and len(retries) == 0
+
+
+def _loop_monitor(probe):
+    monitor = GrabFoodMonitor.__new__(GrabFoodMonitor)
+    monitor.driver_pool = type('Pool', (), {'size': 1})()
+    monitor._stats_lock = threading.Lock()
+    monitor.stats = {'retries': 0, 'retry_successes': 0, 'retries_skipped': 0}
+    monitor._skip_reprobes = False
+    monitor._probe_with_pool = probe
+    return monitor
+
+
+def test_busy_workers_do_not_spin_on_a_due_retry(monkeypatch):
+    """1 worker busy on a slow probe while a retry is already due: wait() must block, not spin"""
+    monkeypatch.setattr(config, 'BLOCKED_RETRY_BASE_DELAY', 0.01)
+    monkeypatch.setattr(config, 'BLOCKED_RETRY_MAX_ATTEMPTS', 1)
+    seen = {}
+
+    def probe(url, index, total, is_retry=False):
+        seen[url] = seen.get(url, 0) + 1
+        time.sleep(0.01 if url == 'blocked' else 0.5)
+        status = StoreStatus.BLOCKED if url == 'blocked' and not is_retry else StoreStatus.ONLINE
+        return {'name': url, 'result': CheckResult(status=status, response_time=1)}
+
+    calls = []
+    real_wait = monitor_service.wait
+    monkeypatch.setattr(monitor_service, 'wait', lambda *a, **kw: calls.append(kw.get('timeout')) or real_wait(*a, **kw))
+
+    work = [(1, 'blocked'), (2, 'slow-a'), (3, 'slow-b')]
+    plan = CyclePlan(order=work, workers=1, budget_s=60, estimated_s=1, host_floor_s=0,
+                     est_ms={}, allow_retries=True)
+    results = _loop_monitor(probe)._run_probe_cycle(plan, work, len(work))
+
+    assert [r['name'] for r in results] == ['blocked', 'slow-a', 'slow-b']
+    assert results[0]['result'].status == StoreStatus.ONLINE  # the retry replaced the BLOCKED result
+    assert seen == {'blocked': 2, 'slow-a': 1, 'slow-b': 1}
+    assert len(calls) < 20, f"scheduler spun: {len(calls)} wait() calls"
@@ -0,0 +1,50 @@
+"""SkuCatalog reloads only when the master_skus version counter moves"""
+import pytest
+
+from database import db
+from sku_catalog import SkuCatalog
+
+PLATFORM = 'grabfood'
+
+
+def sku(code, name, category='Breads'):
+    return {'sku_code': code, 'product_name': name, 'platform': PLATFORM, 'category': category}
+
+
+@pytest.fixture
+def catalog():
+    with db.get_connection() as conn:
+        conn.cursor().execute("DELETE FROM master_skus")
+        conn.commit()
+    assert db.bulk_add_master_skus([sku('GB001', 'Pandesal'), sku('GB002', 'Spanish Bread')])
+    return SkuCatalog(check_interval=0)
+
+
+def test_loads_once_while_version_is_unchanged(catalog):
+    assert catalog.count(PLATFORM) == 2
+    assert catalog.get_by_name(PLATFORM, 'spanish bread')['sku_code'] == 'GB002'
+    version = catalog.version
+    catalog.count(PLATFORM)
+    catalog.refresh()
+    assert catalog.loads == 1
+    assert catalog.version == version
+
+
+def test_every_master_skus_write_bumps_the_version(catalog):
+    catalog.count(PLATFORM)
+    before = db.get_sku_catalog_version()
+
+    assert db.bulk_add_master_skus([sku('GB003', 'Cheese Roll')])
+    after_insert = db.get_sku_catalog_version()
+    assert after_insert > before
+    assert catalog.count(PLATFORM) == 3
+    assert catalog.loads == 2
+
+    with db.get_connection() as conn:
+        conn.cursor().execute("UPDATE master_skus SET is_active = 0 WHERE sku_code = 'GB001'")
+        conn.commit()
+    assert db.get_sku_catalog_version() > after_insert
+    assert catalog.count(PLATFORM) == 2
+    # Inactive SKUs stay resolvable by code for history lookups
+    assert catalog.get(PLATFORM, 'GB001')['product_name'] == 'Pandesal'
+    assert catalog.loads == 3
@@ -16,6 +16,14 @@ from datetime import datetime
 from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
 
+from driver_profile import ResourceMeter, apply_to_driver, apply_to_options, profile_for
+from probe_watchdog import load_page, set_driver_timeouts
+from driver_lifecycle import DriverLifecycle
+from browser_profile import profile_store_for
+from artifact_store import artifact_store
+from name_normalizer import clean_scraped_name
+from selenium_waits import MenuCountStable, next_data_present, scroll_until_stable, wait_until_ready
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -70,6 +78,10 @@ class GrabFoodScraper:
     
     def __init__(self, send_alerts: bool = True):
         self.driver = None
+        self.driver_profile = profile_for('sku')
+        self.profile_store = profile_store_for('sku')
+        self.resource_meter = ResourceMeter('sku')
+        self.lifecycle = DriverLifecycle(self._create_driver, 'sku')
         self.send_alerts = send_alerts
         self.alert_service = None
         
@@ -89,7 +101,11 @@ class GrabFoodScraper:
         self.setup_driver()
     
     def setup_driver(self):
-        """Setup Chrome driver with undetected-chromedriver"""
+        """Setup Chrome driver (through the lifecycle manager, which recycles it by pages / RSS)"""
+        self.driver = self.lifecycle.new_driver()
+
+    def _create_driver(self):
+        """Start one Chrome with undetected-chromedriver"""
         try:
             import undetected_chromedriver as uc
             
@@ -109,15 +125,25 @@ class GrabFoodScraper:
             
             user_agent = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/145.0.0.0 Safari/537.36'
             options.add_argument(f'--user-agent={user_agent}')
+            apply_to_options(options, self.driver_profile)
+            profile_slot = self.profile_store.prepare(options)
             
-            self.driver = uc.Chrome(
-                options=options,
-                browser_executable_path=chrome_binary,
-                version_main=145,
-                use_subprocess=True
-            )
+            try:
+                driver = uc.Chrome(
+                    options=options,
+                    browser_executable_path=chrome_binary,
+                    version_main=145,
+                    use_subprocess=True
+                )
+            except Exception:
+                self.profile_store.failed(profile_slot)
+                raise
+            self.profile_store.bind(profile_slot, driver)
+            set_driver_timeouts(driver)
+            apply_to_driver(driver, self.driver_profile)
             
             logger.info("Chrome WebDriver initialized")
+            return driver
             
         except ImportError:
             logger.error("undetected-chromedriver not installed!")
@@ -154,24 +180,20 @@ class GrabFoodScraper:
         try:
             logger.info("="*80)
             logger.info(f"Loading: {url}")
-            self.driver.get(url)
+            load_page(self.driver, url)
             
             logger.info("Waiting for page to load...")
-            time.sleep(12)
+            ready, waited = wait_until_ready(self.driver, [next_data_present, MenuCountStable()],
+                                             label="menu")
+            logger.info(f"Page {'ready' if ready else 'not ready'} after {waited:.1f}s")
             
             logger.info("Scrolling to load all items...")
-            for i in range(5):
-                scroll_height = self.driver.execute_script("return document.body.scrollHeight")
-                self.driver.execute_script(f"window.scrollTo(0, {scroll_height * (i+1) / 5});")
-                time.sleep(2)
+            scroll_until_stable(self.driver)
             
             html = self.driver.page_source
             soup = BeautifulSoup(html, 'html.parser')
-            
-            debug_file = f"debug_{store_name.replace(' ', '_')}.html"
-            with open(debug_file, 'w', encoding='utf-8') as f:
-                f.write(html)
-            logger.info(f"Debug HTML saved: {debug_file}")
+            self.resource_meter.record_page(self.driver)
+            self.driver = self.lifecycle.after_page(self.driver)
             
             if soup.title and soup.title.string:
                 title = soup.title.string
@@ -189,6 +211,10 @@ class GrabFoodScraper:
                 else:
                     result['unavailable_items'].append(item)
             
+            # Keep the page behind empty / out-of-stock results; clean pages are sampled
+            outcome = 'empty' if not all_items else 'unavailable' if result['unavailable_items'] else 'success'
+            artifact_store.save('sku', url, html, outcome, meta={'store_name': store_name, 'items': len(all_items)})
+            
             total_items = len(all_items)
             unavailable_count = len(result['unavailable_items'])
             compliance_pct = ((total_items - unavailable_count) / total_items * 100) if total_items > 0 else 100.0
@@ -366,29 +392,7 @@ class GrabFoodScraper:
     
     def _clean_product_name(self, name: str) -> str:
         """Clean and extract just the product name"""
-        if not name:
-            return name
-        
-        name = re.sub(r'\s*P?\s*\d+[\d,.]*\s*$', '', name)
-        
-        if '.' in name:
-            parts = name.split('.')
-            name = parts[0].strip()
-        
-        match = re.match(r'^([^.]+?[a-z])([A-Z][a-z].{10,})$', name)
-        if match:
-            name = match.group(1).strip()
-        
-        desc_markers = [
-            'A soft', 'A golden', 'A delicious', 'A crispy', 'A fluffy',
-            'Made with', 'Served with', 'Topped with', 'Filled with',
-            'Perfect for', 'Great for', 'Ideal for'
-        ]
-        for marker in desc_markers:
-            if marker in name:
-                name = name.split(marker)[0].strip()
-        
-        return name.strip()
+        return clean_scraped_name(name)
     
     def _extract_description(self, wrapper, product_name: str) -> str:
         """Extract product description"""
@@ -528,6 +532,7 @@ class GrabFoodScraper:
             'alerts_sent': 0,
             'alerts_failed': 0
         }
+        self.resource_meter.reset()
         
         for i, url in enumerate(urls, 1):
             logger.info("\n")
@@ -547,10 +552,14 @@ class GrabFoodScraper:
                 logger.info(f"\nWaiting {delay:.1f}s...\n")
                 time.sleep(delay)
         
+        self.resource_meter.log_summary()
+        self.lifecycle.log_summary()
         return results
     
     def close(self):
         """Close browser"""
+        self.lifecycle.close()
+        artifact_store.flush()
         if self.driver:
             try:
                 self.driver.quit()